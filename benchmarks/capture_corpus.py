@@ -0,0 +1,141 @@
+"""Save sanitized store pages into the benchmark corpus.
+
+Usage:
+    python -m benchmarks.capture_corpus PLATFORM [URL ...] [--from-cache]
+        [--match SUBSTRING] [--out DIR]
+
+Each URL is fetched over plain HTTP with the scraper's headers; --from-cache
+takes the raw pages held in the HTML cache instead, optionally only those
+whose URL contains --match. Pages are written to benchmarks/corpus/PLATFORM
+(or --out) so benchmarks.html_cleaning and benchmarks.prompt_tokens pick them
+up.
+
+Sanitizing keeps the markup the cleaner and extractors see and drops what
+must not be committed: inline and external scripts except JSON-LD, comments,
+iframes, event handler attributes, hidden form values and session or tracking
+query parameters in links. A comment at the top records the source URL and
+capture date.
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from lxml import etree, html as lxml_html
+
+from benchmarks.html_cleaning import DEFAULT_CORPUS
+from untils.html_cache import html_cache
+from untils.http_fetcher import http_fetcher
+
+PRIVATE_QUERY_PARAMS = re.compile(
+    r"^(snr|sessionid|session|sid|token|csrf.*|utm_.*|gclid|fbclid|mc_.*)$", re.I
+)
+URL_ATTRIBUTES = ("href", "src", "action")
+
+
+def _strip_private_params(url: str) -> str:
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not PRIVATE_QUERY_PARAMS.match(key)
+    ]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def sanitize_html(html: str, source_url: str) -> str:
+    root = lxml_html.document_fromstring(html)
+    for element in root.xpath("//script | //iframe | //noscript | //comment()"):
+        if (
+            element.tag == "script"
+            and (element.get("type") or "").lower() == "application/ld+json"
+        ):
+            continue
+        element.drop_tree()
+    for element in root.iter():
+        if not isinstance(element.tag, str):
+            continue
+        for name in list(element.attrib):
+            if name.lower().startswith("on"):
+                del element.attrib[name]
+        for name in URL_ATTRIBUTES:
+            if element.get(name):
+                element.set(name, _strip_private_params(element.get(name)))
+        if element.tag == "input" and (
+            element.get("type") == "hidden"
+            or PRIVATE_QUERY_PARAMS.match(element.get("name") or "")
+        ):
+            element.set("value", "")
+
+    captured = datetime.now(timezone.utc).date().isoformat()
+    body = lxml_html.tostring(root, encoding="unicode", doctype="<!DOCTYPE html>")
+    return f"<!-- captured from {source_url} on {captured}; sanitized -->\n{body}\n"
+
+
+def file_name(url: str) -> str:
+    parts = urlsplit(url)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", f"{parts.path}_{parts.query}").strip("_")
+    return f"{slug[:80] or 'index'}.html"
+
+
+async def fetch_pages(urls: List[str]) -> List[Tuple[str, str]]:
+    pages = []
+    try:
+        for url in urls:
+            response = await http_fetcher.get(url)
+            if response.status_code != 200:
+                print(f"Skipping {url}: HTTP {response.status_code}")
+                continue
+            pages.append((url, response.text))
+    finally:
+        await http_fetcher.stop()
+    return pages
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("platform", help="corpus subdirectory, e.g. steam")
+    parser.add_argument("urls", nargs="*")
+    parser.add_argument(
+        "--from-cache", action="store_true", help="take pages from the HTML cache"
+    )
+    parser.add_argument("--match", help="only cached URLs containing this")
+    parser.add_argument("--out", help="output directory")
+    args = parser.parse_args()
+
+    pages = await fetch_pages(args.urls) if args.urls else []
+    if args.from_cache:
+        pages.extend(
+            (page.url, page.raw_html)
+            for page in html_cache.iter_pages()
+            if not args.match or args.match in page.url
+        )
+    if not pages:
+        print("No pages to capture.")
+        return 1
+
+    out_dir = Path(args.out) if args.out else DEFAULT_CORPUS / args.platform
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for url, html in pages:
+        try:
+            sanitized = sanitize_html(html, url)
+        except (etree.ParserError, ValueError) as e:
+            print(f"Skipping {url}: {e}")
+            continue
+        path = out_dir / file_name(url)
+        path.write_text(sanitized, encoding="utf-8")
+        print(
+            f"{url} -> {path} ({len(html) // 1024} KB -> {len(sanitized) // 1024} KB)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
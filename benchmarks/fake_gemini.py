@@ -0,0 +1,361 @@
+"""Local stand-in for the Gemini API, for load and regression tests.
+
+Usage:
+    python -m benchmarks.fake_gemini [--port N] [--latency-ms MS]
+        [--latency-sigma S] [--ms-per-1k-tokens MS]
+        [--resource-exhausted-rate R] [--deadline-exceeded-rate R]
+        [--recordings FILE] [--seed N]
+
+Point the app at it with GEMINI_API_BASE_URL=http://127.0.0.1:PORT/. It serves
+the part of the REST API that GeminiApi uses: models/{model}:generateContent
+and create, update and delete on cachedContents.
+
+Answers come from --recordings when the prompt is recorded there: a JSON lines
+file of {"prompt_sha256": ..., "text": ...} objects, where the hash is taken
+over the cached content and the request text joined by newlines. Every answer
+carries that hash in an x-prompt-sha256 header, so recordings can be collected
+from a run. Other prompts get rule-based answers. Game pages yield the name
+from the first heading and the first dollar price, listings yield their links,
+and anything else yields a market analysis summary.
+
+Latency is log-normal around --latency-ms, plus --ms-per-1k-tokens for each
+thousand prompt tokens. Errors are injected as HTTP 429 RESOURCE_EXHAUSTED and
+504 DEADLINE_EXCEEDED. Latency and errors are drawn from the seed, the prompt
+and how often that prompt was seen before, so a run is reproducible whatever
+the interleaving of concurrent calls, and a retried prompt can succeed.
+GET /fake/stats reports requests, injected errors and tokens per model, and
+POST /fake/reset clears them.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from untils.prompts import estimate_tokens
+
+HEADING = re.compile(r"^#+\s*(.+)$", re.M)
+HTML_HEADING = re.compile(r"<(h1|title)[^>]*>(.*?)</\1>", re.I | re.S)
+DOLLAR_PRICE = re.compile(r"(?:\$|USD\s?)(\d+(?:[.,]\d{1,2})?)")
+HREF = re.compile(r"""href=["']([^"']+)["']|\]\((\S+?)\)""")
+TAG = re.compile(r"<[^>]+>")
+
+
+class FakeGeminiConfig:
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        latency_sigma: float = 0.3,
+        ms_per_1k_tokens: float = 0.0,
+        resource_exhausted_rate: float = 0.0,
+        deadline_exceeded_rate: float = 0.0,
+        recordings: Optional[Dict[str, str]] = None,
+        seed: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.ms_per_1k_tokens = ms_per_1k_tokens
+        self.resource_exhausted_rate = resource_exhausted_rate
+        self.deadline_exceeded_rate = deadline_exceeded_rate
+        self.recordings = recordings or {}
+        self.seed = seed
+
+
+class FakeGeminiStats:
+    def __init__(self):
+        self.requests = 0
+        self.recorded_answers = 0
+        self.errors: Dict[str, int] = {}
+        self.models: Dict[str, Dict[str, int]] = {}
+        self.caches_created = 0
+        self.caches_updated = 0
+        self.caches_deleted = 0
+
+    def record_usage(
+        self, model: str, prompt_tokens: int, cached_tokens: int, output_tokens: int
+    ) -> None:
+        usage = self.models.setdefault(
+            model,
+            {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0, "output_tokens": 0},
+        )
+        usage["requests"] += 1
+        usage["prompt_tokens"] += prompt_tokens
+        usage["cached_tokens"] += cached_tokens
+        usage["output_tokens"] += output_tokens
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "recorded_answers": self.recorded_answers,
+            "errors": dict(self.errors),
+            "models": {model: dict(usage) for model, usage in self.models.items()},
+            "caches_created": self.caches_created,
+            "caches_updated": self.caches_updated,
+            "caches_deleted": self.caches_deleted,
+        }
+
+
+def load_recordings(path: str) -> Dict[str, str]:
+    recordings = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            entry = json.loads(line)
+            recordings[entry["prompt_sha256"]] = entry["text"]
+    return recordings
+
+
+def _contents_text(contents: List[dict]) -> str:
+    return "\n".join(
+        part.get("text", "")
+        for content in contents or []
+        for part in content.get("parts", [])
+    )
+
+
+def _line_value(prompt: str, label: str) -> Optional[str]:
+    match = re.search(rf"^{re.escape(label)}:\s*(\S+)", prompt, re.M)
+    return match.group(1) if match else None
+
+
+def _game_data(url: Optional[str], content: str) -> dict:
+    heading = HEADING.search(content)
+    html_heading = HTML_HEADING.search(content)
+    if heading:
+        name = heading.group(1).strip()
+    elif html_heading:
+        name = TAG.sub("", html_heading.group(2)).strip() or None
+    else:
+        name = None
+    price_match = DOLLAR_PRICE.search(content)
+    price = float(price_match.group(1).replace(",", ".")) if price_match else -1.0
+    return {
+        "name": name,
+        "description": None,
+        "price": price,
+        "currency": "USD" if price_match else None,
+        "price_in_usd": price,
+        "availability_status": "available" if price_match else "unknown",
+        "url_on_platform": url,
+        "rating": None,
+        "reviews_count": None,
+        "special_content_json": None,
+        "discount_info_json": None,
+        "metadata_json": None,
+    }
+
+
+def _game_links(prompt: str) -> dict:
+    current_url = _line_value(prompt, "Current page URL") or ""
+    target = int(_line_value(prompt, "Maximum number of game URLs") or 50)
+    html = prompt.split("Cleaned HTML:", 1)[-1]
+    urls: List[str] = []
+    for match in HREF.finditer(html):
+        url = urljoin(current_url, match.group(1) or match.group(2))
+        if url.rstrip("/") != current_url.rstrip("/") and url not in urls:
+            urls.append(url)
+    return {
+        "game_urls": urls[:target],
+        "next_page_selector": 'a[rel="next"]' if 'rel="next"' in html else None,
+    }
+
+
+def rule_based_answer(prompt: str, response_schema: Optional[dict]) -> str:
+    if response_schema and response_schema.get("type") == "array":
+        pages = re.split(r"^=== PAGE \d+ ===$", prompt, flags=re.M)[1:]
+        return json.dumps(
+            [
+                _game_data(_line_value(page, "URL"), page.split("HTML:", 1)[-1])
+                for page in pages
+            ]
+        )
+    if response_schema:
+        content = prompt.split("Page Content:", 1)[-1]
+        return json.dumps(_game_data(_line_value(prompt, "Page URL"), content))
+    if '"game_urls"' in prompt:
+        return json.dumps(_game_links(prompt))
+    return json.dumps(
+        {
+            "summary": "Stand-in summary.",
+            "pricing_analysis": "Stand-in pricing analysis.",
+            "rating_analysis": "Stand-in rating analysis.",
+            "discount_analysis": "Stand-in discount analysis.",
+            "conclusion": "Stand-in conclusion.",
+        }
+    )
+
+
+def _error(code: int, status: str, message: str) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"code": code, "message": message, "status": status}},
+        status_code=code,
+    )
+
+
+def create_app(config: FakeGeminiConfig) -> FastAPI:
+    app = FastAPI(title="Fake Gemini")
+    stats = FakeGeminiStats()
+    cached_contents: Dict[str, str] = {}
+    prompt_counts: Dict[str, int] = {}
+
+    @app.post("/{version}/models/{model}:generateContent")
+    async def generate_content(version: str, model: str, request: Request) -> Any:
+        body = await request.json()
+        cached_text = ""
+        if body.get("cachedContent"):
+            cached_text = cached_contents.get(body["cachedContent"], "")
+            if not cached_text:
+                return _error(404, "NOT_FOUND", "Cached content not found.")
+        request_text = _contents_text(body.get("contents", []))
+        prompt = f"{cached_text}\n{request_text}" if cached_text else request_text
+        prompt_sha256 = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+        stats.requests += 1
+        seen = prompt_counts.get(prompt_sha256, 0)
+        prompt_counts[prompt_sha256] = seen + 1
+        rng = random.Random(f"{config.seed}:{prompt_sha256}:{seen}")
+        prompt_tokens = estimate_tokens(prompt)
+        latency_ms = (
+            config.latency_ms * math.exp(rng.gauss(0, config.latency_sigma))
+            + config.ms_per_1k_tokens * prompt_tokens / 1000
+        )
+        await asyncio.sleep(latency_ms / 1000)
+
+        roll = rng.random()
+        if roll < config.resource_exhausted_rate:
+            stats.errors["RESOURCE_EXHAUSTED"] = (
+                stats.errors.get("RESOURCE_EXHAUSTED", 0) + 1
+            )
+            return _error(429, "RESOURCE_EXHAUSTED", "Injected quota error.")
+        if roll < config.resource_exhausted_rate + config.deadline_exceeded_rate:
+            stats.errors["DEADLINE_EXCEEDED"] = (
+                stats.errors.get("DEADLINE_EXCEEDED", 0) + 1
+            )
+            return _error(504, "DEADLINE_EXCEEDED", "Injected deadline error.")
+
+        if prompt_sha256 in config.recordings:
+            stats.recorded_answers += 1
+            text = config.recordings[prompt_sha256]
+        else:
+            generation_config = body.get("generationConfig") or {}
+            text = rule_based_answer(
+                prompt,
+                generation_config.get("responseJsonSchema")
+                or generation_config.get("responseSchema"),
+            )
+        cached_tokens = estimate_tokens(cached_text) if cached_text else 0
+        output_tokens = estimate_tokens(text)
+        stats.record_usage(model, prompt_tokens, cached_tokens, output_tokens)
+        return JSONResponse(
+            {
+                "candidates": [
+                    {
+                        "content": {"parts": [{"text": text}], "role": "model"},
+                        "finishReason": "STOP",
+                        "index": 0,
+                    }
+                ],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "cachedContentTokenCount": cached_tokens,
+                    "candidatesTokenCount": output_tokens,
+                    "totalTokenCount": prompt_tokens + output_tokens,
+                },
+                "modelVersion": model,
+            },
+            headers={"x-prompt-sha256": prompt_sha256},
+        )
+
+    @app.post("/{version}/cachedContents")
+    async def create_cached_content(version: str, request: Request) -> Any:
+        body = await request.json()
+        name = f"cachedContents/fake-{len(cached_contents) + 1}"
+        cached_contents[name] = _contents_text(body.get("contents", []))
+        stats.caches_created += 1
+        return {
+            "name": name,
+            "model": body.get("model"),
+            "displayName": body.get("displayName"),
+            "usageMetadata": {
+                "totalTokenCount": estimate_tokens(cached_contents[name])
+            },
+        }
+
+    @app.patch("/{version}/cachedContents/{cache_id}")
+    async def update_cached_content(version: str, cache_id: str) -> Any:
+        name = f"cachedContents/{cache_id}"
+        if name not in cached_contents:
+            return _error(404, "NOT_FOUND", "Cached content not found.")
+        stats.caches_updated += 1
+        return {"name": name}
+
+    @app.delete("/{version}/cachedContents/{cache_id}")
+    async def delete_cached_content(version: str, cache_id: str) -> Any:
+        if cached_contents.pop(f"cachedContents/{cache_id}", None) is None:
+            return _error(404, "NOT_FOUND", "Cached content not found.")
+        stats.caches_deleted += 1
+        return {}
+
+    @app.get("/fake/stats")
+    async def get_stats() -> dict:
+        return stats.to_dict()
+
+    @app.post("/fake/reset")
+    async def reset_stats() -> dict:
+        nonlocal stats
+        stats = FakeGeminiStats()
+        prompt_counts.clear()
+        return stats.to_dict()
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="median latency per call"
+    )
+    parser.add_argument(
+        "--latency-sigma",
+        type=float,
+        default=0.3,
+        help="log-normal spread of the latency",
+    )
+    parser.add_argument(
+        "--ms-per-1k-tokens",
+        type=float,
+        default=0.0,
+        help="extra latency per thousand prompt tokens",
+    )
+    parser.add_argument("--resource-exhausted-rate", type=float, default=0.0)
+    parser.add_argument("--deadline-exceeded-rate", type=float, default=0.0)
+    parser.add_argument("--recordings", help="JSON lines file of recorded answers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeGeminiConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        ms_per_1k_tokens=args.ms_per_1k_tokens,
+        resource_exhausted_rate=args.resource_exhausted_rate,
+        deadline_exceeded_rate=args.deadline_exceeded_rate,
+        recordings=load_recordings(args.recordings) if args.recordings else None,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
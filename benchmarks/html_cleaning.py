@@ -0,0 +1,119 @@
+"""Compare the HTML cleaning engines on saved store pages.
+
+Usage:
+    python -m benchmarks.html_cleaning [PATH ...] [--from-cache] [--repeat N]
+
+PATH may be an .html file or a directory of them; --from-cache adds every raw
+page held in the scraper's HTML cache (HTML_CACHE_DIR). The bundled corpus in
+benchmarks/corpus is used when neither is given. Every page is cleaned by each
+engine, checked for equivalence against the bs4 reference output (same visible
+text and the same links, in order) and timed. The exit code is non-zero when an
+engine disagrees with the reference on any page.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from lxml import html as lxml_html
+
+from untils.html_cache import html_cache
+from untils.html_cleaner import CLEANING_ENGINES
+
+REFERENCE_ENGINE = "bs4"
+DEFAULT_CORPUS = Path(__file__).parent / "corpus"
+
+
+def collect_pages(paths: List[str], from_cache: bool = False) -> List[Tuple[str, str]]:
+    files: List[Path] = []
+    for raw_path in paths or ([] if from_cache else [str(DEFAULT_CORPUS)]):
+        path = Path(raw_path)
+        if path.is_dir():
+            files.extend(sorted(path.rglob("*.html")))
+        elif path.exists():
+            files.append(path)
+
+    pages = [
+        (str(path), path.read_text(encoding="utf-8", errors="replace"))
+        for path in files
+    ]
+    if from_cache:
+        pages.extend((page.url, page.raw_html) for page in html_cache.iter_pages())
+    return pages
+
+
+def fingerprint(cleaned_html: str) -> Tuple[str, Tuple[str, ...]]:
+    if not cleaned_html.strip():
+        return "", ()
+    root = lxml_html.fromstring(cleaned_html)
+    text = " ".join(" ".join(root.itertext()).split())
+    links = tuple(link.get("href", "") for link in root.iter("a"))
+    return text, links
+
+
+def time_engine(cleaner: Callable[[str], str], html: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cleaner(html)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="HTML files or directories")
+    parser.add_argument(
+        "--from-cache", action="store_true", help="include pages from the HTML cache"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = collect_pages(args.paths, args.from_cache)
+    if not pages:
+        print("No HTML pages found.")
+        return 1
+
+    engines = list(CLEANING_ENGINES)
+    mismatches = 0
+    totals = {engine: 0.0 for engine in engines}
+
+    header = f"{'page':<40} {'size KB':>8} " + " ".join(
+        f"{engine + ' ms':>10}" for engine in engines
+    )
+    print(header)
+    print("-" * len(header))
+
+    for page, html in pages:
+        reference = fingerprint(CLEANING_ENGINES[REFERENCE_ENGINE](html))
+
+        row = (
+            f"{page.rstrip('/').rsplit('/', 1)[-1][-40:]:<40} {len(html) / 1024:>8.1f} "
+        )
+        for engine in engines:
+            cleaner = CLEANING_ENGINES[engine]
+            if engine != REFERENCE_ENGINE and fingerprint(cleaner(html)) != reference:
+                mismatches += 1
+                print(f"MISMATCH: {engine} differs from {REFERENCE_ENGINE} on {page}")
+            seconds = time_engine(cleaner, html, args.repeat)
+            totals[engine] += seconds
+            row += f"{seconds * 1000:>10.2f} "
+        print(row)
+
+    print("-" * len(header))
+    reference_total = totals[REFERENCE_ENGINE]
+    for engine in engines:
+        speedup = reference_total / totals[engine] if totals[engine] else 0.0
+        print(
+            f"{engine:<8} total {totals[engine] * 1000:>9.2f} ms "
+            f"({speedup:.1f}x vs {REFERENCE_ENGINE})"
+        )
+    print(f"{len(pages)} page(s), {mismatches} mismatch(es).")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Compare prompt sizes of cleaned HTML and the compact text minimizer.
+
+Usage:
+    python -m benchmarks.prompt_tokens [PATH ...] [--from-cache] [--budget N]
+        [--count-with-gemini] [--with-llm]
+
+Pages are collected like in benchmarks.html_cleaning. Every page is cleaned
+with HTML_CLEANER_ENGINE and minimized within --budget tokens (default
+LLM_PAGE_TOKEN_BUDGET). Token counts are estimated locally; --count-with-gemini
+asks the model's token counter instead.
+
+Accuracy is checked against the facts a page publishes as structured data
+(JSON-LD, microdata or OpenGraph): the report shows how many of them are still
+present in each prompt input, and with --with-llm it runs the game details
+prompt on both inputs and counts the fields the model got right. The exit code
+is non-zero when the compact form loses facts the cleaned HTML kept, or writes
+links without text for anchors that have some.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from lxml import etree, html as lxml_html
+
+from benchmarks.html_cleaning import collect_pages
+from common.app_settings import settings
+from untils.html_cleaner import clean_html
+from untils.html_minimizer import minimize_html
+from untils.json_utils import strip_json_markdown
+from untils.prompts import COMPACT_CONTENT_NOTE, GAME_DETAILS_PROMPT, estimate_tokens
+from untils.structured_data import extract_structured_data
+
+# Ratings are rescaled to 5 points, so they are only scored on LLM answers.
+TEXT_FACT_FIELDS = ("name", "price", "reviews_count")
+LLM_FIELDS = ("name", "price", "currency", "availability_status", "rating")
+THOUSANDS_SEPARATOR = re.compile(r"(?<=\d)[,\s.](?=\d{3}\b)")
+EMPTY_LINK = "[]("
+
+
+def page_facts(html: str) -> Dict[str, Any]:
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return {}
+    data = extract_structured_data(root)
+    return {
+        field: data[field]
+        for field in (*TEXT_FACT_FIELDS, *LLM_FIELDS)
+        if data.get(field) is not None
+    }
+
+
+def blank_links(cleaned: str) -> int:
+    """Links that have neither text nor image alt text in the cleaned HTML."""
+    try:
+        root = lxml_html.document_fromstring(cleaned)
+    except (etree.ParserError, ValueError):
+        return 0
+    return sum(
+        1
+        for link in root.iter("a")
+        if not link.text_content().strip() and not link.xpath(".//img[@alt != '']")
+    )
+
+
+def fact_present(text: str, value: Any) -> bool:
+    if isinstance(value, str):
+        return " ".join(value.split()).lower() in " ".join(text.split()).lower()
+    normalized = THOUSANDS_SEPARATOR.sub("", text)
+    number = f"{value:g}" if isinstance(value, float) else str(value)
+    return re.search(rf"(?<![\d.]){re.escape(number)}(?![\d])", normalized) is not None
+
+
+def llm_field_matches(expected: Any, actual: Any) -> bool:
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        return abs(expected - actual) <= max(0.01, abs(expected) * 0.01)
+    return str(expected).strip().lower() == str(actual or "").strip().lower()
+
+
+async def extract_with_llm(gemini_api, url: str, content: str) -> Dict[str, Any]:
+    prompt = GAME_DETAILS_PROMPT.render(
+        game_url=url,
+        current_date=datetime.now(timezone.utc).isoformat(),
+        cleaned_html=content,
+        content_note="" if content.lstrip().startswith("<") else COMPACT_CONTENT_NOTE,
+    )
+    response_text = await gemini_api.generate_response(prompt)
+    try:
+        data = json.loads(strip_json_markdown(response_text or ""))
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def gemini_token_counter() -> Callable[[str], int]:
+    from untils.gemini_api import GeminiApi
+
+    gemini_api = GeminiApi()
+
+    def count(text: str) -> int:
+        response = gemini_api.client.models.count_tokens(
+            model=gemini_api.model, contents=text
+        )
+        return response.total_tokens or 0
+
+    return count
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="HTML files or directories")
+    parser.add_argument(
+        "--from-cache", action="store_true", help="include pages from the HTML cache"
+    )
+    parser.add_argument("--budget", type=int, default=settings.LLM_PAGE_TOKEN_BUDGET)
+    parser.add_argument(
+        "--count-with-gemini",
+        action="store_true",
+        help="count tokens with the Gemini API instead of estimating them",
+    )
+    parser.add_argument(
+        "--with-llm",
+        action="store_true",
+        help="extract every page with both inputs and score the answers",
+    )
+    args = parser.parse_args()
+
+    pages = collect_pages(args.paths, args.from_cache)
+    if not pages:
+        print("No HTML pages found.")
+        return 1
+
+    count_tokens = gemini_token_counter() if args.count_with_gemini else estimate_tokens
+    gemini_api = None
+    if args.with_llm:
+        from untils.gemini_api import GeminiApi
+
+        gemini_api = GeminiApi()
+
+    totals = {"html": 0, "compact": 0}
+    facts = {"total": 0, "html": 0, "compact": 0}
+    llm_scores = {"checked": 0, "html": 0, "compact": 0}
+    regressions: List[str] = []
+
+    header = (
+        f"{'page':<40} {'html tok':>9} {'compact tok':>11} {'saved':>7} "
+        f"{'facts html':>10} {'facts compact':>13}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for page, html in pages:
+        cleaned = clean_html(html, settings.HTML_CLEANER_ENGINE)
+        compact = minimize_html(cleaned, args.budget)
+        html_tokens, compact_tokens = count_tokens(cleaned), count_tokens(compact)
+        totals["html"] += html_tokens
+        totals["compact"] += compact_tokens
+
+        expected = page_facts(html)
+        text_facts = {f: v for f, v in expected.items() if f in TEXT_FACT_FIELDS}
+        kept_html = [f for f, v in text_facts.items() if fact_present(cleaned, v)]
+        kept_compact = [f for f, v in text_facts.items() if fact_present(compact, v)]
+        facts["total"] += len(text_facts)
+        facts["html"] += len(kept_html)
+        facts["compact"] += len(kept_compact)
+        lost = sorted(set(kept_html) - set(kept_compact))
+        if lost:
+            regressions.append(f"{page}: compact text lost {', '.join(lost)}")
+        if compact.count(EMPTY_LINK) > blank_links(cleaned):
+            regressions.append(f"{page}: compact text dropped link text")
+
+        saved = 1 - compact_tokens / html_tokens if html_tokens else 0.0
+        print(
+            f"{page.rstrip('/').rsplit('/', 1)[-1][-40:]:<40} {html_tokens:>9} "
+            f"{compact_tokens:>11} {saved:>7.1%} "
+            f"{len(kept_html):>5}/{len(text_facts):<4} "
+            f"{len(kept_compact):>8}/{len(text_facts):<4}"
+        )
+
+        if gemini_api is not None and expected:
+            reference = {f: v for f, v in expected.items() if f in LLM_FIELDS}
+            for kind, content in (("html", cleaned), ("compact", compact)):
+                answer = await extract_with_llm(gemini_api, page, content)
+                llm_scores[kind] += sum(
+                    llm_field_matches(value, answer.get(field))
+                    for field, value in reference.items()
+                )
+            llm_scores["checked"] += len(reference)
+
+    print("-" * len(header))
+    saved_total = 1 - totals["compact"] / totals["html"] if totals["html"] else 0.0
+    print(
+        f"tokens: html {totals['html']}, compact {totals['compact']} "
+        f"({saved_total:.1%} fewer)"
+    )
+    print(
+        f"structured facts present: html {facts['html']}/{facts['total']}, "
+        f"compact {facts['compact']}/{facts['total']}"
+    )
+    if gemini_api is not None:
+        print(
+            f"LLM fields correct: html {llm_scores['html']}/{llm_scores['checked']}, "
+            f"compact {llm_scores['compact']}/{llm_scores['checked']}"
+        )
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
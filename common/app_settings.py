@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -6,6 +8,120 @@ class AppSettings(BaseSettings):
     DB_CONNECTION_STRING: str = Field(alias="DB_CONNECTION_STRING", min_length=1)
     GEMINI_API_KEY: str = Field(alias="GEMINI_API_KEY", min_length=1)
     GEMINI_API_MODEL: str = Field(alias="GEMINI_API_MODEL", min_length=1)
+    # Set to a local stand-in such as benchmarks.fake_gemini for load tests.
+    GEMINI_API_BASE_URL: Optional[str] = Field(
+        default=None, alias="GEMINI_API_BASE_URL"
+    )
+    # Unset tiers fall back to GEMINI_API_MODEL, which disables routing.
+    GEMINI_FAST_MODEL: Optional[str] = Field(default=None, alias="GEMINI_FAST_MODEL")
+    GEMINI_STRONG_MODEL: Optional[str] = Field(
+        default=None, alias="GEMINI_STRONG_MODEL"
+    )
+    GEMINI_MAX_CONCURRENCY: int = Field(default=8, alias="GEMINI_MAX_CONCURRENCY", ge=1)
+    GEMINI_REQUESTS_PER_MINUTE: int = Field(
+        default=60, alias="GEMINI_REQUESTS_PER_MINUTE", ge=1
+    )
+    GEMINI_TOKENS_PER_MINUTE: int = Field(
+        default=1_000_000, alias="GEMINI_TOKENS_PER_MINUTE", ge=1000
+    )
+    GEMINI_MAX_ATTEMPTS: int = Field(default=5, alias="GEMINI_MAX_ATTEMPTS", ge=1)
+    GEMINI_CONTEXT_CACHE_ENABLED: bool = Field(
+        default=True, alias="GEMINI_CONTEXT_CACHE_ENABLED"
+    )
+    GEMINI_CONTEXT_CACHE_TTL_SECONDS: int = Field(
+        default=3600, alias="GEMINI_CONTEXT_CACHE_TTL_SECONDS", ge=300
+    )
+
+    BROWSER_POOL_SIZE: int = Field(default=2, alias="BROWSER_POOL_SIZE", ge=1)
+    BROWSER_POOL_MAX_PAGES_PER_BROWSER: int = Field(
+        default=50, alias="BROWSER_POOL_MAX_PAGES_PER_BROWSER", ge=1
+    )
+    BROWSER_POOL_CONTEXTS_PER_BROWSER: int = Field(
+        default=4, alias="BROWSER_POOL_CONTEXTS_PER_BROWSER", ge=1
+    )
+    BROWSER_HEADLESS: bool = Field(default=True, alias="BROWSER_HEADLESS")
+    BROWSER_BLOCK_RESOURCES: bool = Field(default=True, alias="BROWSER_BLOCK_RESOURCES")
+
+    HTML_CLEANER_ENGINE: Literal["bs4", "lxml"] = Field(
+        default="lxml", alias="HTML_CLEANER_ENGINE"
+    )
+
+    CPU_EXECUTOR_KIND: Literal["process", "thread", "inline"] = Field(
+        default="process", alias="CPU_EXECUTOR_KIND"
+    )
+    CPU_EXECUTOR_WORKERS: int = Field(default=2, alias="CPU_EXECUTOR_WORKERS", ge=1)
+
+    HTTP_FETCH_ENABLED: bool = Field(default=True, alias="HTTP_FETCH_ENABLED")
+    HTTP_FETCH_TIMEOUT_SECONDS: float = Field(
+        default=20.0, alias="HTTP_FETCH_TIMEOUT_SECONDS", gt=0
+    )
+    HTTP_FETCH_MAX_CONNECTIONS: int = Field(
+        default=20, alias="HTTP_FETCH_MAX_CONNECTIONS", ge=1
+    )
+    FETCH_TIER_ESCALATIONS_TO_PIN: int = Field(
+        default=3, alias="FETCH_TIER_ESCALATIONS_TO_PIN", ge=1
+    )
+    FETCH_TIER_REPROBE_EVERY: int = Field(
+        default=100, alias="FETCH_TIER_REPROBE_EVERY", ge=1
+    )
+
+    FETCH_MAX_CONCURRENCY: int = Field(default=16, alias="FETCH_MAX_CONCURRENCY", ge=1)
+    FETCH_THROTTLE_MAX_ATTEMPTS: int = Field(
+        default=4, alias="FETCH_THROTTLE_MAX_ATTEMPTS", ge=1
+    )
+    ADAPTIVE_INITIAL_CONCURRENCY: int = Field(
+        default=4, alias="ADAPTIVE_INITIAL_CONCURRENCY", ge=1
+    )
+    ADAPTIVE_LATENCY_TOLERANCE: float = Field(
+        default=2.0, alias="ADAPTIVE_LATENCY_TOLERANCE", gt=1
+    )
+    ADAPTIVE_MAX_ERROR_RATE: float = Field(
+        default=0.05, alias="ADAPTIVE_MAX_ERROR_RATE", gt=0, le=1
+    )
+
+    LISTING_PARALLEL_PAGES: int = Field(default=3, alias="LISTING_PARALLEL_PAGES", ge=1)
+    SITEMAP_MAX_FILES: int = Field(default=50, alias="SITEMAP_MAX_FILES", ge=1)
+    SCROLL_WAIT_TIMEOUT_SECONDS: float = Field(
+        default=8.0, alias="SCROLL_WAIT_TIMEOUT_SECONDS", gt=0
+    )
+    SCROLL_WAIT_IDLE_SECONDS: float = Field(
+        default=0.5, alias="SCROLL_WAIT_IDLE_SECONDS", gt=0
+    )
+    SCROLL_WAIT_SETTLE_SECONDS: float = Field(
+        default=0.2, alias="SCROLL_WAIT_SETTLE_SECONDS", ge=0
+    )
+
+    HTML_CACHE_ENABLED: bool = Field(default=True, alias="HTML_CACHE_ENABLED")
+    HTML_CACHE_DIR: str = Field(default=".cache/html", alias="HTML_CACHE_DIR")
+    HTML_CACHE_TTL_SECONDS: int = Field(
+        default=3600, alias="HTML_CACHE_TTL_SECONDS", ge=0
+    )
+    HTML_CACHE_MAX_BYTES: int = Field(
+        default=512 * 1024 * 1024, alias="HTML_CACHE_MAX_BYTES", ge=1
+    )
+
+    LLM_CACHE_ENABLED: bool = Field(default=True, alias="LLM_CACHE_ENABLED")
+    LLM_CACHE_PATH: str = Field(
+        default=".cache/llm_responses.sqlite3", alias="LLM_CACHE_PATH"
+    )
+    LLM_CACHE_TTL_SECONDS: int = Field(
+        default=7 * 24 * 3600, alias="LLM_CACHE_TTL_SECONDS", ge=0
+    )
+
+    LLM_INPUT_FORMAT: Literal["html", "compact"] = Field(
+        default="compact", alias="LLM_INPUT_FORMAT"
+    )
+    LLM_PAGE_TOKEN_BUDGET: int = Field(
+        default=30_000, alias="LLM_PAGE_TOKEN_BUDGET", ge=500
+    )
+    LLM_MAX_CHUNKS: int = Field(default=4, alias="LLM_MAX_CHUNKS", ge=1)
+    LLM_BATCH_MAX_PAGES: int = Field(default=6, alias="LLM_BATCH_MAX_PAGES", ge=1)
+    LLM_BATCH_TOKEN_BUDGET: int = Field(
+        default=120_000, alias="LLM_BATCH_TOKEN_BUDGET", ge=1000
+    )
+    LLM_BATCH_LINGER_SECONDS: float = Field(
+        default=0.5, alias="LLM_BATCH_LINGER_SECONDS", ge=0
+    )
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -3,6 +3,7 @@ from controllers.game_controller import router as game_router
 from controllers.game_scrape_controller import router as game_scrape_router
 from controllers.analysis_controller import router as analysis_router
 from controllers.game_summary_controller import router as game_summary_router
+from controllers.metrics_controller import router as metrics_router
 
 __all__ = [
     "platform_router",
@@ -10,4 +11,5 @@ __all__ = [
     "game_scrape_router",
     "analysis_router",
     "game_summary_router",
+    "metrics_router",
 ]
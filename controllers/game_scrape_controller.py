@@ -1,7 +1,11 @@
-from fastapi import APIRouter, status
+from typing import Any, Dict
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, status
 
 from core import GameScrapeServiceDependency
 from schemas import ScrapeGamesRequest, ScrapeRequestDTO
+from untils.scrape_pipeline import active_pipelines, last_pipeline_stats
 
 router = APIRouter(
     prefix="/scrape",
@@ -19,7 +23,19 @@ async def scrape_games_for_platform_endpoint(
     request: ScrapeGamesRequest,
     service: GameScrapeServiceDependency,
 ) -> ScrapeRequestDTO:
-    scrape_request = await service.scrape_games_for_platform(
-        request.platform_id, request.limit
-    )
+    scrape_request = await service.scrape_games_for_platform(request)
     return scrape_request
+
+
+@router.get("/{request_id}/pipeline", response_model=Dict[str, Any])
+async def get_scrape_pipeline_stats(request_id: UUID) -> Dict[str, Any]:
+    pipeline = active_pipelines.get(str(request_id))
+    if pipeline:
+        return pipeline.stats()
+    for stats in last_pipeline_stats.values():
+        if stats["request_id"] == str(request_id):
+            return stats
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"No pipeline stats kept for request {request_id}.",
+    )
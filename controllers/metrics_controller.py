@@ -0,0 +1,140 @@
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, status
+
+from untils.adaptive_limiter import adaptive_limiters
+from untils.chunking import chunking_stats
+from untils.extraction_batcher import extraction_batch_stats
+from untils.gemini_api import gemini_api
+from untils.html_cache import html_cache
+from untils.http_fetcher import fetch_tiers
+from untils.json_utils import llm_parse_stats
+from untils.link_discovery import link_patterns
+from untils.llm_cache import llm_cache
+from untils.model_router import model_router
+from untils.pagination import pagination_states
+from untils.resource_blocker import resource_block_stats
+from untils.scrape_pipeline import active_pipelines, last_pipeline_stats
+from untils.scroll_waiter import scroll_wait_stats
+from untils.selector_extractor import extraction_stats
+from untils.sitemap import sitemap_stats
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    responses={
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Internal server error"},
+    },
+)
+
+
+@router.get("/resource-blocking", response_model=Dict[str, Dict[str, Any]])
+async def get_resource_blocking_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        platform_name: stats.to_dict()
+        for platform_name, stats in resource_block_stats.items()
+    }
+
+
+@router.get("/fetch-tiers", response_model=Dict[str, Dict[str, Any]])
+async def get_fetch_tier_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        platform_key: state.to_dict() for platform_key, state in fetch_tiers.items()
+    }
+
+
+@router.get("/gemini", response_model=Dict[str, Any])
+async def get_gemini_metrics() -> Dict[str, Any]:
+    return gemini_api.stats()
+
+
+@router.get("/html-cache", response_model=Dict[str, Any])
+async def get_html_cache_metrics() -> Dict[str, Any]:
+    return html_cache.stats()
+
+
+@router.get("/llm-cache", response_model=Dict[str, Any])
+async def get_llm_cache_metrics() -> Dict[str, Any]:
+    return llm_cache.stats()
+
+
+@router.delete("/llm-cache", response_model=Dict[str, int])
+async def invalidate_llm_cache(prompt_name: Optional[str] = None) -> Dict[str, int]:
+    return {"deleted": llm_cache.invalidate(prompt_name)}
+
+
+@router.get("/extraction", response_model=Dict[str, Dict[str, Any]])
+async def get_extraction_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        platform_name: stats.to_dict()
+        for platform_name, stats in extraction_stats.items()
+    }
+
+
+@router.get("/extraction-batches", response_model=Dict[str, Dict[str, Any]])
+async def get_extraction_batch_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        platform_name: stats.to_dict()
+        for platform_name, stats in extraction_batch_stats.items()
+    }
+
+
+@router.get("/chunking", response_model=Dict[str, Any])
+async def get_chunking_metrics() -> Dict[str, Any]:
+    return chunking_stats.to_dict()
+
+
+@router.get("/link-discovery", response_model=Dict[str, Dict[str, Any]])
+async def get_link_discovery_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        platform_key: state.to_dict() for platform_key, state in link_patterns.items()
+    }
+
+
+@router.get("/pagination", response_model=Dict[str, Dict[str, Any]])
+async def get_pagination_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        platform_key: state.to_dict()
+        for platform_key, state in pagination_states.items()
+    }
+
+
+@router.get("/sitemaps", response_model=Dict[str, Dict[str, Any]])
+async def get_sitemap_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        platform_name: stats.to_dict() for platform_name, stats in sitemap_stats.items()
+    }
+
+
+@router.get("/scroll-waits", response_model=Dict[str, Dict[str, Any]])
+async def get_scroll_wait_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        platform_name: stats.to_dict()
+        for platform_name, stats in scroll_wait_stats.items()
+    }
+
+
+@router.get("/concurrency", response_model=Dict[str, Dict[str, Any]])
+async def get_concurrency_metrics() -> Dict[str, Dict[str, Any]]:
+    return {name: limiter.to_dict() for name, limiter in adaptive_limiters.items()}
+
+
+@router.get("/llm-parsing", response_model=Dict[str, Dict[str, int]])
+async def get_llm_parsing_metrics() -> Dict[str, Dict[str, int]]:
+    return llm_parse_stats
+
+
+@router.get("/model-routing", response_model=Dict[str, Any])
+async def get_model_routing_metrics() -> Dict[str, Any]:
+    return model_router.to_dict()
+
+
+@router.get("/pipelines", response_model=Dict[str, Dict[str, Any]])
+async def get_pipeline_metrics() -> Dict[str, Dict[str, Any]]:
+    return {
+        "running": {
+            request_id: pipeline.stats()
+            for request_id, pipeline in active_pipelines.items()
+        },
+        "last_completed": dict(last_pipeline_stats),
+    }
@@ -54,6 +54,11 @@ async def update_platform(
         search_url_template=platform_data.search_url_template,
         base_url=platform_data.base_url,
         game_data_selector=platform_data.game_data_selector,
+        resource_block_rules=platform_data.resource_block_rules,
+        extraction_selectors=platform_data.extraction_selectors,
+        discovery_mode=platform_data.discovery_mode,
+        sitemap_url=platform_data.sitemap_url,
+        scroll_wait_timeout_seconds=platform_data.scroll_wait_timeout_seconds,
     )
     return await service.update_platform(platform_to_update)
 
@@ -22,9 +22,24 @@ from model import (
     ScrapeResult,
     GameScrapeDetail,
 )
-from schemas import ScrapedGameDataDTO, GameScrapeDetailDTO, ScrapeRequestDTO
+from schemas import (
+    ScrapedGameDataDTO,
+    GameScrapeDetailDTO,
+    ScrapeRequestDTO,
+    ScrapeGamesRequest,
+)
 from untils import WebScraperDependency
-from typing import Annotated
+from untils.http_fetcher import get_platform_fetch_tier
+from untils.link_discovery import get_platform_link_pattern
+from untils.pagination import get_platform_pagination
+from untils.scrape_pipeline import (
+    PipelineItem,
+    PipelineStage,
+    ScrapePipeline,
+    active_pipelines,
+    last_pipeline_stats,
+)
+from typing import Annotated, Optional, Tuple
 
 
 class GameScrapeService:
@@ -47,8 +62,9 @@ class GameScrapeService:
         self.web_scraper = web_scraper
 
     async def scrape_games_for_platform(
-        self, platform_id: UUID, limit: int = 10
+        self, scrape_options: ScrapeGamesRequest
     ) -> ScrapeRequestDTO:
+        platform_id = scrape_options.platform_id
         platform: Platform = await self.platform_repo.get_platform_by_id(platform_id)
         if not platform:
             raise HTTPException(
@@ -66,12 +82,14 @@ class GameScrapeService:
 
         request_id = created_request.id
         error_message = None
+        total_games = 0
         processed_games = 0
         successful_scrapes = 0
         failed_scrapes = 0
         scraped_games = []
         scrape_details_list = []
         scrape_result = None
+        pipeline_stats = None
 
         try:
             await self.scrape_request_repo.update_request(
@@ -82,114 +100,97 @@ class GameScrapeService:
                 },
             )
 
-            game_urls = await self.web_scraper.collect_game_urls(
-                platform.search_url_template, limit
+            # Sitemap discovery streams URLs into the pipeline while it runs, so
+            # the total is only known once the feed is exhausted.
+            game_urls = self.web_scraper.iter_game_urls(
+                platform.search_url_template, scrape_options.limit, platform
             )
 
-            await self.scrape_request_repo.update_request(
-                request_id, {"total_games": len(game_urls)}
-            )
+            counters = {"successful": 0, "failed": 0, "not_found": 0}
 
-            not_found = 0
-            for url in game_urls:
-                scraped_data_id = None
-                detail_status = ScrapeStatus.PENDING
-                detail_error = None
-                game_name = "Unknown"
-                raw_data = None
+            async def fetch(item: PipelineItem) -> None:
+                item.html = await self.web_scraper.get_page_html(item.url, platform)
 
-                try:
-                    data = await self.web_scraper.extract_game_data_from_url(url)
-                    raw_data = data
-                    if not data or not data.get("name"):
-                        not_found += 1
-                        detail_status = ScrapeStatus.NOT_FOUND
-                        detail_error = "Game name not found on page."
-                        raise ValueError(detail_error)
+            async def clean(item: PipelineItem) -> None:
+                item.cleaned_html = await self.web_scraper.clean_page_html(
+                    item.html or "", compact=True
+                )
 
-                    game_name = data["name"]
+            async def extract(item: PipelineItem) -> None:
+                # Selector extraction reads the raw page, the LLM the cleaned one.
+                item.data = await self.web_scraper.extract_game_data(
+                    item.url, item.html or "", item.cleaned_html or "", platform
+                )
+                item.html = None
+                item.cleaned_html = None
 
-                    game = await self.game_repo.get_game_by_name(game_name)
-                    if not game:
-                        try:
-                            game_to_create = Game(
-                                id=uuid.uuid4(),
-                                name=game_name,
-                                description=data.get("description"),
-                                metadata_json=self.web_scraper.clean_json(
-                                    data.get("metadata_json", {})
-                                ),
-                            )
-                            game = await self.game_repo.create_game(game_to_create)
-                        except IntegrityError:
-                            game = await self.game_repo.get_game_by_name(game_name)
-
-                    if not game:
-                        raise Exception(f"Failed to create or find game: {game_name}")
-
-                    scraped_game = ScrapedGameData(
-                        id=uuid.uuid4(),
-                        name_on_platform=data["name"],
-                        price=data["price"],
-                        price_in_usd=data["price_in_usd"],
-                        currency=data["currency"],
-                        availability_status=GameStatusEnum(data["availability_status"]),
-                        url_on_platform=data["url_on_platform"],
-                        rating=data.get("rating"),
-                        reviews_count=data.get("reviews_count"),
-                        search_position=data.get("search_position"),
-                        special_content_json=data.get("special_content_json"),
-                        discount_info_json=self.web_scraper.clean_json(
-                            data.get("discount_info_json")
-                        ),
-                        game_id=game.id,
-                        platform_id=platform.id,
-                    )
-
-                    result = await self.scraped_data_repo.create_scraped_data(
-                        scraped_game
-                    )
-                    if not result:
-                        raise Exception("Failed to save scraped data to the database.")
-                    scraped_games.append(ScrapedGameDataDTO.model_validate(result))
+            async def persist(item: PipelineItem) -> None:
+                detail_status, scraped_game, detail_dto = await self._persist_game_data(
+                    item.data, item.error, platform, request_id
+                )
+                if detail_status == ScrapeStatus.SUCCESS:
+                    counters["successful"] += 1
+                else:
+                    counters["failed"] += 1
+                if detail_status == ScrapeStatus.NOT_FOUND:
+                    counters["not_found"] += 1
+                if scraped_game:
+                    scraped_games.append(scraped_game)
+                if detail_dto:
+                    scrape_details_list.append(detail_dto)
 
-                    scraped_data_id = result.id
-                    successful_scrapes += 1
-                    detail_status = ScrapeStatus.SUCCESS
-
-                except Exception as e:
-                    failed_scrapes += 1
-                    detail_status = ScrapeStatus.FAILURE
-                    detail_error = str(e)
+            workers = scrape_options.concurrency
+            queue_size = scrape_options.queue_size
+            pipeline = ScrapePipeline(
+                [
+                    PipelineStage(
+                        "fetch",
+                        fetch,
+                        scrape_options.fetch_workers or workers,
+                        queue_size,
+                    ),
+                    PipelineStage(
+                        "clean", clean, scrape_options.clean_workers or 1, queue_size
+                    ),
+                    PipelineStage(
+                        "extract",
+                        extract,
+                        scrape_options.extract_workers or workers,
+                        queue_size,
+                    ),
+                    # All repositories share one AsyncSession, so writes stay serial.
+                    PipelineStage("persist", persist, 1, queue_size, always_run=True),
+                ]
+            )
+            active_pipelines[str(request_id)] = pipeline
+            try:
+                await pipeline.run(game_urls)
+            finally:
+                active_pipelines.pop(str(request_id), None)
+                pipeline_stats = pipeline.stats()
+                last_pipeline_stats[platform.name] = {
+                    "request_id": str(request_id),
+                    **pipeline_stats,
+                }
+                total_games = pipeline.items_in
+                processed_games = counters["successful"] + counters["failed"]
+                successful_scrapes = counters["successful"]
+                failed_scrapes = counters["failed"]
+            not_found = counters["not_found"]
 
-                finally:
-                    detail = GameScrapeDetail(
-                        id=uuid.uuid4(),
-                        scrape_request_id=request_id,
-                        scraped_game_data_id=scraped_data_id,
-                        status=detail_status,
-                        error_message=detail_error,
-                        raw_data=raw_data,
-                    )
-                    created_detail = await self.game_scrape_detail_repo.create_detail(
-                        detail
-                    )
-                    if created_detail:
-                        scrape_details_list.append(
-                            GameScrapeDetailDTO.model_validate(created_detail)
-                        )
-                    processed_games += 1
+            await self._save_learned_platform_state(platform)
 
             scrape_result = ScrapeResult(
                 id=uuid.uuid4(),
                 scrape_request_id=request_id,
                 platform_id=platform_id,
-                total_games=len(game_urls),
+                total_games=total_games,
                 successful_scrapes=successful_scrapes,
                 failed_scrapes=failed_scrapes,
                 not_found=not_found,
                 started_at=created_request.created_at,
                 completed_at=datetime.now(timezone.utc),
+                scrape_metadata={"pipeline": pipeline_stats},
             )
             await self.scrape_result_repo.create_result(scrape_result)
 
@@ -206,6 +207,7 @@ class GameScrapeService:
             final_update = {
                 "status": final_status,
                 "completed_at": datetime.now(timezone.utc),
+                "total_games": total_games,
                 "processed_games": processed_games,
                 "successful_scrapes": successful_scrapes,
                 "failed_scrapes": failed_scrapes,
@@ -217,7 +219,123 @@ class GameScrapeService:
             response_dto = ScrapeRequestDTO.model_validate(updated_request)
             response_dto.results = scraped_games
             response_dto.scrape_details = scrape_details_list
+            response_dto.pipeline_stats = pipeline_stats
             return response_dto
 
+    async def _save_learned_platform_state(self, platform: Platform) -> None:
+        # Learned state that was forgotten at runtime is written as None, so a
+        # restart does not load it back.
+        update_data = {}
+        learned_tier = get_platform_fetch_tier(platform.name, platform.fetch_tier).tier
+        if learned_tier != platform.fetch_tier:
+            update_data["fetch_tier"] = learned_tier
+        learned_pattern = get_platform_link_pattern(
+            platform.name, platform.game_url_pattern
+        ).pattern
+        if learned_pattern != platform.game_url_pattern:
+            update_data["game_url_pattern"] = learned_pattern
+        learned_strategy = get_platform_pagination(
+            platform.name, platform.pagination_strategy
+        ).strategy
+        strategy_json = (
+            learned_strategy.model_dump(exclude_none=True) if learned_strategy else None
+        )
+        if strategy_json != platform.pagination_strategy:
+            update_data["pagination_strategy"] = strategy_json
+        if update_data:
+            await self.platform_repo.update_platform_fields(platform.id, update_data)
+
+    async def _persist_game_data(
+        self,
+        data: Optional[dict],
+        extraction_error: Optional[Exception],
+        platform: Platform,
+        request_id: UUID,
+    ) -> Tuple[
+        ScrapeStatus, Optional[ScrapedGameDataDTO], Optional[GameScrapeDetailDTO]
+    ]:
+        scraped_data_id = None
+        scraped_game_dto = None
+        detail_status = ScrapeStatus.PENDING
+        detail_error = None
+        raw_data = data
+
+        try:
+            if extraction_error:
+                raise extraction_error
+
+            if not data or not data.get("name"):
+                detail_status = ScrapeStatus.NOT_FOUND
+                detail_error = "Game name not found on page."
+                raise ValueError(detail_error)
+
+            game_name = data["name"]
+
+            game = await self.game_repo.get_game_by_name(game_name)
+            if not game:
+                try:
+                    game_to_create = Game(
+                        id=uuid.uuid4(),
+                        name=game_name,
+                        description=data.get("description"),
+                        metadata_json=self.web_scraper.clean_json(
+                            data.get("metadata_json", {})
+                        ),
+                    )
+                    game = await self.game_repo.create_game(game_to_create)
+                except IntegrityError:
+                    game = await self.game_repo.get_game_by_name(game_name)
+
+            if not game:
+                raise Exception(f"Failed to create or find game: {game_name}")
+
+            scraped_game = ScrapedGameData(
+                id=uuid.uuid4(),
+                name_on_platform=data["name"],
+                price=data["price"],
+                price_in_usd=data["price_in_usd"],
+                currency=data["currency"],
+                availability_status=GameStatusEnum(data["availability_status"]),
+                url_on_platform=data["url_on_platform"],
+                rating=data.get("rating"),
+                reviews_count=data.get("reviews_count"),
+                search_position=data.get("search_position"),
+                special_content_json=data.get("special_content_json"),
+                discount_info_json=self.web_scraper.clean_json(
+                    data.get("discount_info_json")
+                ),
+                game_id=game.id,
+                platform_id=platform.id,
+            )
+
+            result = await self.scraped_data_repo.create_scraped_data(scraped_game)
+            if not result:
+                raise Exception("Failed to save scraped data to the database.")
+            scraped_game_dto = ScrapedGameDataDTO.model_validate(result)
+
+            scraped_data_id = result.id
+            detail_status = ScrapeStatus.SUCCESS
+
+        except Exception as e:
+            if detail_status != ScrapeStatus.NOT_FOUND:
+                detail_status = ScrapeStatus.FAILURE
+            detail_error = str(e)
+
+        detail = GameScrapeDetail(
+            id=uuid.uuid4(),
+            scrape_request_id=request_id,
+            scraped_game_data_id=scraped_data_id,
+            status=detail_status,
+            error_message=detail_error,
+            raw_data=raw_data,
+        )
+        created_detail = await self.game_scrape_detail_repo.create_detail(detail)
+        detail_dto = (
+            GameScrapeDetailDTO.model_validate(created_detail)
+            if created_detail
+            else None
+        )
+        return detail_status, scraped_game_dto, detail_dto
+
 
 GameScrapeServiceDependency = Annotated[GameScrapeService, Depends(GameScrapeService)]
@@ -42,6 +42,21 @@ class PlatformService:
             search_url_template=str(platform_data.search_url_template),
             base_url=str(platform_data.base_url),
             game_data_selector=str(platform_data.game_data_selector),
+            resource_block_rules=(
+                platform_data.resource_block_rules.model_dump(exclude_unset=True)
+                if platform_data.resource_block_rules
+                else None
+            ),
+            extraction_selectors=(
+                platform_data.extraction_selectors.model_dump(exclude_none=True)
+                if platform_data.extraction_selectors
+                else None
+            ),
+            discovery_mode=platform_data.discovery_mode,
+            sitemap_url=(
+                str(platform_data.sitemap_url) if platform_data.sitemap_url else None
+            ),
+            scroll_wait_timeout_seconds=platform_data.scroll_wait_timeout_seconds,
         )
         try:
             created_platform = await self.platform_repo.create_platform(
@@ -87,6 +102,21 @@ class PlatformService:
             search_url_template=str(platform_dto.search_url_template),
             base_url=str(platform_dto.base_url),
             game_data_selector=str(platform_dto.game_data_selector),
+            resource_block_rules=(
+                platform_dto.resource_block_rules.model_dump(exclude_unset=True)
+                if platform_dto.resource_block_rules
+                else None
+            ),
+            extraction_selectors=(
+                platform_dto.extraction_selectors.model_dump(exclude_none=True)
+                if platform_dto.extraction_selectors
+                else None
+            ),
+            discovery_mode=platform_dto.discovery_mode,
+            sitemap_url=(
+                str(platform_dto.sitemap_url) if platform_dto.sitemap_url else None
+            ),
+            scroll_wait_timeout_seconds=platform_dto.scroll_wait_timeout_seconds,
         )
         try:
             updated_platform_result = await self.platform_repo.update_platform(
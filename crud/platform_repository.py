@@ -36,6 +36,11 @@ class PlatformRepository:
                 search_url_template=platform.search_url_template,
                 base_url=platform.base_url,
                 game_data_selector=platform.game_data_selector,
+                resource_block_rules=platform.resource_block_rules,
+                extraction_selectors=platform.extraction_selectors,
+                discovery_mode=platform.discovery_mode,
+                sitemap_url=platform.sitemap_url,
+                scroll_wait_timeout_seconds=platform.scroll_wait_timeout_seconds,
             )
             .returning(Platform)
         )
@@ -47,7 +52,28 @@ class PlatformRepository:
         query = (
             update(Platform)
             .where(Platform.id == platform.id)
-            .values(**platform.dict())
+            .values(
+                name=platform.name,
+                search_url_template=platform.search_url_template,
+                base_url=platform.base_url,
+                game_data_selector=platform.game_data_selector,
+                resource_block_rules=platform.resource_block_rules,
+                extraction_selectors=platform.extraction_selectors,
+                discovery_mode=platform.discovery_mode,
+                sitemap_url=platform.sitemap_url,
+                scroll_wait_timeout_seconds=platform.scroll_wait_timeout_seconds,
+            )
+            .returning(Platform)
+        )
+        result = await self.session.execute(query)
+
+        return result.scalar_one_or_none()
+
+    async def update_platform_fields(self, platform_id: UUID, update_data: dict):
+        query = (
+            update(Platform)
+            .where(Platform.id == platform_id)
+            .values(**update_data)
             .returning(Platform)
         )
         result = await self.session.execute(query)
@@ -1,4 +1,14 @@
 from enums.game_status import GameStatusEnum
 from enums.scrape_requests import ScrapeRequestStatus, ScrapeStatus
+from enums.fetch_tier import FetchTier
+from enums.discovery_mode import DiscoveryMode
+from enums.model_tier import ModelTier
 
-__all__ = ["GameStatusEnum", "ScrapeRequestStatus", "ScrapeStatus"]
+__all__ = [
+    "GameStatusEnum",
+    "ScrapeRequestStatus",
+    "ScrapeStatus",
+    "FetchTier",
+    "DiscoveryMode",
+    "ModelTier",
+]
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class DiscoveryMode(str, Enum):
+    LISTING = "listing"
+    SITEMAP = "sitemap"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class FetchTier(str, Enum):
+    HTTP = "http"
+    BROWSER = "browser"
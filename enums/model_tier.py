@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ModelTier(str, Enum):
+    FAST = "fast"
+    STRONG = "strong"
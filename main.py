@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from controllers import (
@@ -6,9 +8,32 @@ from controllers import (
     game_scrape_controller,
     analysis_controller,
     game_summary_controller,
+    metrics_controller,
 )
+from untils.browser_pool import browser_pool
+from untils.cpu_executor import cpu_executor
+from untils.gemini_api import gemini_api
+from untils.http_fetcher import http_fetcher
+from untils.llm_cache import llm_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    cpu_executor.start()
+    http_fetcher.start()
+    llm_cache.start()
+    await browser_pool.start()
+    try:
+        yield
+    finally:
+        await browser_pool.stop()
+        await http_fetcher.stop()
+        await gemini_api.close()
+        llm_cache.close()
+        cpu_executor.shutdown()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,3 +48,4 @@ app.include_router(game_controller.router)
 app.include_router(game_scrape_controller.router)
 app.include_router(analysis_controller.router)
 app.include_router(game_summary_controller.router)
+app.include_router(metrics_controller.router)
@@ -1,7 +1,9 @@
+from typing import Any, Dict, Optional
 from uuid import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Uuid
+from sqlalchemy import JSON, Float, String, Uuid, Enum as SQLEnum
 from model import Base
+from enums import DiscoveryMode, FetchTier
 
 
 class Platform(Base):
@@ -12,6 +14,38 @@ class Platform(Base):
     base_url: Mapped[str] = mapped_column(String(150), nullable=False)
     search_url_template: Mapped[str] = mapped_column(String(150), nullable=False)
     game_data_selector: Mapped[str] = mapped_column(String(150), nullable=False)
+    resource_block_rules: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON, nullable=True
+    )
+    extraction_selectors: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON, nullable=True
+    )
+    game_url_pattern: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True
+    )
+    pagination_strategy: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON, nullable=True
+    )
+    fetch_tier: Mapped[Optional[FetchTier]] = mapped_column(
+        SQLEnum(
+            FetchTier,
+            name="fetch_tier_enum",
+            values_callable=lambda obj: [e.value for e in obj],
+        ),
+        nullable=True,
+    )
+    discovery_mode: Mapped[Optional[DiscoveryMode]] = mapped_column(
+        SQLEnum(
+            DiscoveryMode,
+            name="discovery_mode_enum",
+            values_callable=lambda obj: [e.value for e in obj],
+        ),
+        nullable=True,
+    )
+    sitemap_url: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    scroll_wait_timeout_seconds: Mapped[Optional[float]] = mapped_column(
+        Float, nullable=True
+    )
 
     scraped_data = relationship(
         "ScrapedGameData", back_populates="platform", cascade="all, delete-orphan"
@@ -1,8 +1,16 @@
 from .game_schemas import GameDTO, CreateGameDTO
-from .platform_schemas import PlatformDTO, CreatePlatformDTO
+from .platform_schemas import (
+    PlatformDTO,
+    CreatePlatformDTO,
+    ResourceBlockRules,
+    FieldSelector,
+    ExtractionSelectors,
+    PaginationStrategy,
+)
 from .scraped_game_data_schemas import (
     ScrapedGameDataDTO,
     CreateScrapedGameDataDTO,
+    ExtractedGameDataDTO,
     ScrapeGamesRequest,
 )
 from .scrape_schemas import (
@@ -20,8 +28,13 @@ __all__ = [
     "CreateGameDTO",
     "PlatformDTO",
     "CreatePlatformDTO",
+    "ResourceBlockRules",
+    "FieldSelector",
+    "ExtractionSelectors",
+    "PaginationStrategy",
     "ScrapedGameDataDTO",
     "CreateScrapedGameDataDTO",
+    "ExtractedGameDataDTO",
     "ScrapeGamesRequest",
     "GameScrapeDetailDTO",
     "ScrapeResultDTO",
@@ -1,13 +1,138 @@
+import re
+from typing import Dict, List, Literal, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field
+from cssselect import SelectorError
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from pydantic import BaseModel, Field, field_validator, model_validator
 from pydantic.networks import HttpUrl
 
+from enums import DiscoveryMode, FetchTier
+
+
+class ResourceBlockRules(BaseModel):
+    enabled: bool = Field(True, description="Whether resource blocking is enabled")
+    block_resource_types: List[str] = Field(
+        default_factory=list,
+        description="Playwright resource types to block, e.g. image, media, font",
+    )
+    allow_url_patterns: List[str] = Field(
+        default_factory=list,
+        description="Regexes for URLs that are never blocked; they win over block rules",
+    )
+    block_url_patterns: List[str] = Field(
+        default_factory=list, description="Regexes for URLs that are always blocked"
+    )
+
+    @field_validator("allow_url_patterns", "block_url_patterns")
+    @classmethod
+    def validate_patterns(cls, patterns: List[str]) -> List[str]:
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid URL pattern '{pattern}': {e}")
+        return patterns
+
+
+class FieldSelector(BaseModel):
+    css: Optional[str] = Field(None, description="CSS selector of the element")
+    xpath: Optional[str] = Field(None, description="XPath expression of the element")
+    attribute: Optional[str] = Field(
+        None, description="Attribute to read instead of the element text, e.g. content"
+    )
+
+    @model_validator(mode="after")
+    def validate_selector(self) -> "FieldSelector":
+        if (self.css is None) == (self.xpath is None):
+            raise ValueError("Exactly one of 'css' or 'xpath' must be set.")
+        try:
+            if self.css is not None:
+                CSSSelector(self.css)
+            else:
+                etree.XPath(self.xpath)
+        except (SelectorError, etree.XPathSyntaxError) as e:
+            raise ValueError(f"Invalid selector '{self.css or self.xpath}': {e}")
+        return self
+
+
+class ExtractionSelectors(BaseModel):
+    name: Optional[FieldSelector] = None
+    price: Optional[FieldSelector] = None
+    currency: Optional[FieldSelector] = None
+    rating: Optional[FieldSelector] = None
+    reviews_count: Optional[FieldSelector] = None
+    availability_status: Optional[FieldSelector] = None
+    description: Optional[FieldSelector] = None
+    metadata: Dict[str, FieldSelector] = Field(
+        default_factory=dict,
+        description="Selectors for metadata_json entries such as genre or publisher",
+    )
+    rating_scale: float = Field(
+        5.0, gt=0, description="Maximum score of the platform's rating scale"
+    )
+    default_currency: Optional[str] = Field(
+        None,
+        min_length=3,
+        max_length=3,
+        description="Currency code to use when the page does not show one",
+    )
+
+
+class PaginationStrategy(BaseModel):
+    kind: Literal["url_param", "next_link", "click"] = Field(
+        description="url_param rewrites a query parameter, next_link follows the "
+        "next element's href and click clicks it"
+    )
+    selector: Optional[str] = Field(None, description="CSS selector of the next element")
+    param: Optional[str] = Field(None, description="Query parameter holding the page")
+    start: int = Field(1, description="Parameter value of the first page")
+    step: int = Field(1, ge=1, description="Parameter increment between pages")
+
+    @model_validator(mode="after")
+    def validate_strategy(self) -> "PaginationStrategy":
+        if self.kind == "url_param" and not self.param:
+            raise ValueError("url_param pagination needs 'param'.")
+        if self.kind != "url_param" and not self.selector:
+            raise ValueError(f"{self.kind} pagination needs 'selector'.")
+        return self
+
+
 class PlatformDTO(BaseModel):
     id: UUID
     name: str = Field(description="Name of the platform")
     base_url: HttpUrl = Field(description="Base URL of the platform")
     search_url_template: HttpUrl = Field(description="Search URL template of the platform")
     game_data_selector: str = Field(description="Game data selector of the platform")
+    resource_block_rules: Optional[ResourceBlockRules] = Field(
+        None, description="Overrides for the default browser resource blocking rules"
+    )
+    fetch_tier: Optional[FetchTier] = Field(
+        None, description="Cheapest fetch tier known to work for this platform"
+    )
+    extraction_selectors: Optional[ExtractionSelectors] = Field(
+        None,
+        description="Selectors for deterministic extraction; fields they miss fall back to the LLM",
+    )
+    game_url_pattern: Optional[str] = Field(
+        None, description="Learned regex matching the platform's game page URLs"
+    )
+    pagination_strategy: Optional[PaginationStrategy] = Field(
+        None, description="Learned way of reaching the next listing page"
+    )
+    discovery_mode: Optional[DiscoveryMode] = Field(
+        None,
+        description="Where game URLs come from; sitemap falls back to listing pages",
+    )
+    sitemap_url: Optional[HttpUrl] = Field(
+        None, description="Sitemap or sitemap index; robots.txt is read when unset"
+    )
+    scroll_wait_timeout_seconds: Optional[float] = Field(
+        None,
+        gt=0,
+        le=60,
+        description="Longest wait for a listing page to load more games after a scroll",
+    )
 
     class Config:
         from_attributes = True
@@ -19,3 +144,8 @@ class CreatePlatformDTO(BaseModel):
     base_url: HttpUrl = Field(max_length=255)
     search_url_template: HttpUrl = Field(max_length=255)
     game_data_selector: str = Field(max_length=255)
+    resource_block_rules: Optional[ResourceBlockRules] = None
+    extraction_selectors: Optional[ExtractionSelectors] = None
+    discovery_mode: Optional[DiscoveryMode] = None
+    sitemap_url: Optional[HttpUrl] = Field(None, max_length=255)
+    scroll_wait_timeout_seconds: Optional[float] = Field(None, gt=0, le=60)
@@ -56,3 +56,4 @@ class ScrapeRequestDTO(BaseModel):
     updated_at: datetime = Field(..., description="Update timestamp")
     results: List[ScrapedGameDataDTO] = Field([], description="List of scrape results")
     scrape_details: List[GameScrapeDetailDTO] = Field([], description="List of scrape details")
+    pipeline_stats: Optional[Dict[str, Any]] = Field(None, description="Per-stage pipeline statistics")
@@ -1,7 +1,7 @@
 from uuid import UUID
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from enums import GameStatusEnum
 
@@ -44,6 +44,50 @@ class CreateScrapedGameDataDTO(BaseModel):
     platform_id: UUID
 
 
+def _require_all_fields(schema: Dict[str, Any]) -> None:
+    # Defaults keep validation lenient, but the model should still answer
+    # every field, with null where the page has nothing.
+    schema["required"] = list(schema["properties"])
+
+
+# The fields follow CreateScrapedGameDataDTO, minus the ids the service
+# assigns, with the game's name, description and metadata on top. Defaults are
+# what the prompts ask for when a value is unknown. The docstring is sent to
+# Gemini as part of the response schema.
+class ExtractedGameDataDTO(BaseModel):
+    """Data extracted from one game detail page."""
+
+    model_config = ConfigDict(json_schema_extra=_require_all_fields)
+
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: float = -1.0
+    currency: Optional[str] = None
+    price_in_usd: float = -1.0
+    availability_status: GameStatusEnum = GameStatusEnum.UNKNOWN
+    url_on_platform: Optional[str] = None
+    rating: Optional[float] = None
+    reviews_count: Optional[int] = None
+    special_content_json: Optional[dict] = None
+    discount_info_json: Optional[dict] = None
+    metadata_json: Optional[dict] = None
+
+
 class ScrapeGamesRequest(BaseModel):
     platform_id: UUID
     limit: int = Field(10, ge=1, le=100, description="Number of games to scrape")
+    concurrency: int = Field(
+        1, ge=1, le=20, description="Number of game pages to extract at once"
+    )
+    fetch_workers: Optional[int] = Field(
+        None, ge=1, le=20, description="Page fetch workers (defaults to concurrency)"
+    )
+    clean_workers: Optional[int] = Field(
+        None, ge=1, le=20, description="HTML cleaning workers (defaults to 1)"
+    )
+    extract_workers: Optional[int] = Field(
+        None, ge=1, le=20, description="LLM extraction workers (defaults to concurrency)"
+    )
+    queue_size: int = Field(
+        10, ge=1, le=100, description="Capacity of the queue in front of each stage"
+    )
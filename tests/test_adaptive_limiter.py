@@ -0,0 +1,56 @@
+import unittest
+
+from untils.adaptive_limiter import AdaptiveLimiter
+
+
+class Flaky(Exception):
+    pass
+
+
+def never_overloaded(error):
+    return None
+
+
+class AdaptiveLimiterTest(unittest.IsolatedAsyncioTestCase):
+    def make_limiter(self):
+        return AdaptiveLimiter(
+            "test",
+            max_limit=16,
+            is_overload=never_overloaded,
+            initial_limit=2,
+            latency_tolerance=2.0,
+            max_error_rate=0.05,
+        )
+
+    async def succeed(self, limiter, times):
+        for _ in range(times):
+            async with limiter.acquire():
+                pass
+
+    async def fail(self, limiter):
+        with self.assertRaises(Flaky):
+            async with limiter.acquire():
+                raise Flaky()
+
+    async def test_fast_successes_raise_the_limit(self):
+        limiter = self.make_limiter()
+        await self.succeed(limiter, 20)
+        self.assertGreater(int(limiter.limit), 2)
+
+    async def test_recent_errors_hold_the_limit(self):
+        limiter = self.make_limiter()
+        await self.fail(limiter)
+        await self.succeed(limiter, 3)
+        self.assertEqual(limiter.limit, 2.0)
+        self.assertEqual(limiter.errors, 1)
+
+    async def test_limit_grows_again_once_errors_fade(self):
+        limiter = self.make_limiter()
+        await self.fail(limiter)
+        await self.succeed(limiter, 30)
+        self.assertLess(limiter.error_rate, 0.05)
+        self.assertGreater(int(limiter.limit), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
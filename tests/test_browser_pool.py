@@ -0,0 +1,123 @@
+import asyncio
+import sys
+import unittest
+from unittest import mock
+
+from untils.browser_pool import BrowserPool
+
+browser_pool_module = sys.modules["untils.browser_pool"]
+
+
+class FakeContext:
+    async def new_page(self):
+        return self
+
+    async def goto(self, url):
+        pass
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self):
+        return FakeContext()
+
+    async def close(self):
+        self.connected = False
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.launches = 0
+        self.chromium = self
+
+    async def launch(self, headless):
+        self.launches += 1
+        return FakeBrowser()
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+class BrowserPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.playwright = FakePlaywright()
+        patcher = mock.patch.object(
+            browser_pool_module, "async_playwright", lambda: self.playwright
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_browsers_serve_several_contexts(self):
+        pool = BrowserPool(
+            size=2, max_pages_per_browser=50, headless=True, contexts_per_browser=3
+        )
+        await pool.start()
+        open_leases = 0
+        peak = 0
+        release = asyncio.Event()
+
+        async def use():
+            nonlocal open_leases, peak
+            async with pool.lease():
+                open_leases += 1
+                peak = max(peak, open_leases)
+                await release.wait()
+                open_leases -= 1
+
+        tasks = [asyncio.create_task(use()) for _ in range(8)]
+        await asyncio.sleep(0.05)
+        self.assertEqual(peak, 6)
+        self.assertEqual(pool.stats()["free_contexts"], 0)
+        release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(pool.stats()["active_contexts"], 0)
+        await pool.stop()
+
+    async def test_browser_is_recycled_once_its_contexts_are_back(self):
+        pool = BrowserPool(
+            size=1, max_pages_per_browser=1, headless=True, contexts_per_browser=2
+        )
+        await pool.start()
+        async with pool.lease():
+            async with pool.lease():
+                pass
+            # Retiring: no new lease may start on this browser until it is back.
+            self.assertIsNone(pool._free_slot())
+        self.assertEqual(pool.recycled_total, 1)
+        self.assertEqual(self.playwright.launches, 2)
+        async with pool.lease():
+            pass
+        await pool.stop()
+
+    async def test_stop_waits_for_leased_contexts(self):
+        pool = BrowserPool(
+            size=1, max_pages_per_browser=50, headless=True, contexts_per_browser=2
+        )
+        await pool.start()
+        browser = pool._slots[0].browser
+
+        async def use():
+            async with pool.lease():
+                await asyncio.sleep(0.05)
+
+        task = asyncio.create_task(use())
+        await asyncio.sleep(0)
+        await pool.stop()
+        await task
+        self.assertFalse(browser.is_connected())
+        self.assertFalse(pool.started)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+
+from untils.chunking import split_html
+
+
+class SplitHtmlTest(unittest.TestCase):
+    def test_capped_listing_keeps_the_pager(self):
+        items = "".join(
+            f'<li><a href="/app/{index}">Game {index} {"x" * 400}</a></li>'
+            for index in range(300)
+        )
+        listing = (
+            f'<html><body><div id="main"><ul class="results">{items}</ul>'
+            '<a class="next" href="?p=2">Next</a></div></body></html>'
+        )
+        chunks = split_html(listing, token_budget=5000, max_chunks=3)
+        self.assertEqual(len(chunks), 3)
+        self.assertIn('href="/app/0"', chunks[0])
+        self.assertIn('class="next"', chunks[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
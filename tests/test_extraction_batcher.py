@@ -0,0 +1,74 @@
+import asyncio
+import time
+import unittest
+
+from untils.extraction_batcher import ExtractionBatcher
+
+LINGER_SECONDS = 5.0
+
+
+class ExtractionBatcherTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.batches = []
+        self.singles = []
+
+    async def run_batch(self, pages):
+        self.batches.append([page.url for page in pages])
+        return {page.url: {"name": page.url} for page in pages}
+
+    async def run_single(self, url, cleaned_html):
+        self.singles.append(url)
+        return {"name": url}
+
+    def make_batcher(self, key):
+        return ExtractionBatcher(
+            self.run_batch,
+            self.run_single,
+            key,
+            max_pages=4,
+            token_budget=100_000,
+            linger_seconds=LINGER_SECONDS,
+        )
+
+    async def test_single_worker_does_not_linger(self):
+        batcher = self.make_batcher("test-single")
+        started = time.monotonic()
+        with batcher.caller():
+            data = await batcher.submit("http://x/1", "<p>1</p>")
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(data, {"name": "http://x/1"})
+        self.assertEqual(self.singles, ["http://x/1"])
+        self.assertEqual(self.batches, [])
+
+    async def test_batch_is_sent_once_every_caller_waits(self):
+        batcher = self.make_batcher("test-callers")
+
+        async def extract(index):
+            with batcher.caller():
+                await asyncio.sleep(0.01 * index)
+                return await batcher.submit(f"http://x/{index}", f"<p>{index}</p>")
+
+        started = time.monotonic()
+        await asyncio.gather(*(extract(index) for index in range(3)))
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(self.batches, [["http://x/0", "http://x/1", "http://x/2"]])
+
+    async def test_caller_without_page_releases_the_batch(self):
+        batcher = self.make_batcher("test-no-page")
+
+        async def no_page():
+            with batcher.caller():
+                await asyncio.sleep(0.05)
+
+        async def page():
+            with batcher.caller():
+                return await batcher.submit("http://x/1", "<p>1</p>")
+
+        started = time.monotonic()
+        await asyncio.gather(page(), no_page())
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(self.singles, ["http://x/1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import json
+import unittest
+from unittest import mock
+
+import httpx
+import tenacity
+from google import genai
+from google.genai import types as genai_types
+
+from benchmarks.fake_gemini import FakeGeminiConfig, create_app
+from untils.context_cache import ContextCache
+from untils.gemini_api import GeminiApi
+from untils.llm_cache import llm_cache
+from untils.web_scraper import WebScraper
+
+BASE_URL = "http://fake-gemini"
+INSTRUCTIONS = "Answer in JSON.\n" + "Static extraction rules. " * 40
+
+
+class FakeGeminiTest(unittest.IsolatedAsyncioTestCase):
+    """GeminiApi against benchmarks.fake_gemini, served in-process over ASGI."""
+
+    def start_fake_gemini(self, **config) -> GeminiApi:
+        self.fake = httpx.AsyncClient(
+            transport=httpx.ASGITransport(create_app(FakeGeminiConfig(**config))),
+            base_url=BASE_URL,
+        )
+        gemini_api = GeminiApi()
+        gemini_api._client = genai.Client(
+            api_key="test",
+            http_options=genai_types.HttpOptions(
+                base_url=BASE_URL, httpx_async_client=self.fake
+            ),
+        )
+        self.addAsyncCleanup(gemini_api.close)
+        return gemini_api
+
+    async def fake_stats(self) -> dict:
+        return (await self.fake.get("/fake/stats")).json()
+
+    def setUp(self):
+        self.context_cache = ContextCache(enabled=True, ttl_seconds=3600)
+        for patcher in (
+            mock.patch("untils.gemini_api.context_cache", self.context_cache),
+            mock.patch.object(llm_cache, "enabled", False),
+            mock.patch.object(
+                GeminiApi._generate_with_retries.retry,
+                "wait",
+                tenacity.wait_none(),
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_game_details_are_parsed_from_the_schema_answer(self):
+        scraper = WebScraper(self.start_fake_gemini())
+        data = await scraper._extract_game_data_once(
+            "http://store.test/app/1", "# Hollow Knight\nBuy now for $14.99\n"
+        )
+        self.assertEqual(data["name"], "Hollow Knight")
+        self.assertEqual(data["price"], 14.99)
+        self.assertEqual(data["currency"], "USD")
+        self.assertEqual(data["url_on_platform"], "http://store.test/app/1")
+
+    async def test_response_schema_is_sent_to_the_api(self):
+        gemini_api = self.start_fake_gemini()
+        schema = {"type": "object", "properties": {"name": {"type": "string"}}}
+        prompt = "Page URL: http://store.test/app/2\nPage Content:\n# Celeste\n$19.99"
+        text = await gemini_api.generate_response(prompt, response_schema=schema)
+        self.assertEqual(json.loads(text)["name"], "Celeste")
+        # Without a schema the stand-in answers free-form.
+        text = await gemini_api.generate_response(prompt)
+        self.assertNotIn("name", json.loads(text))
+
+    async def test_quota_and_deadline_errors_are_retried(self):
+        gemini_api = self.start_fake_gemini(
+            resource_exhausted_rate=0.25, deadline_exceeded_rate=0.15, seed=7
+        )
+        for i in range(12):
+            text = await gemini_api.generate_response(f"Summarize sale {i}.")
+            self.assertIn("summary", json.loads(text))
+
+        stats = await self.fake_stats()
+        self.assertGreater(stats["errors"]["RESOURCE_EXHAUSTED"], 0)
+        self.assertGreater(stats["errors"]["DEADLINE_EXCEEDED"], 0)
+        retry_reasons = gemini_api.stats()["retry_reasons"]
+        self.assertEqual(
+            retry_reasons.get("HTTP 429", 0) + retry_reasons.get("HTTP 504", 0),
+            sum(stats["errors"].values()),
+        )
+        self.assertEqual(gemini_api.stats()["failures"], 0)
+
+    async def test_instructions_are_served_from_the_context_cache(self):
+        gemini_api = self.start_fake_gemini()
+        for i in range(3):
+            await gemini_api.generate_response(
+                f"Summarize sale {i}.", instructions=INSTRUCTIONS
+            )
+
+        stats = await self.fake_stats()
+        self.assertEqual(stats["caches_created"], 1)
+        self.assertEqual(self.context_cache.stats.hits, 2)
+        usage = next(iter(stats["models"].values()))
+        self.assertGreater(usage["cached_tokens"], 0)
+
+    async def test_expired_cache_falls_back_to_inline_instructions(self):
+        gemini_api = self.start_fake_gemini()
+        await gemini_api.generate_response(
+            "Summarize sale 1.", instructions=INSTRUCTIONS
+        )
+        [entry] = self.context_cache._entries.values()
+        # The cached content disappears on the server, e.g. because it expired.
+        await gemini_api.client.aio.caches.delete(name=entry.name)
+
+        text = await gemini_api.generate_response(
+            "Summarize sale 2.", instructions=INSTRUCTIONS
+        )
+        self.assertIn("summary", json.loads(text))
+        self.assertEqual(self.context_cache.stats.invalidated, 1)
+        self.assertEqual(self.context_cache._entries, {})
+
+        await gemini_api.generate_response(
+            "Summarize sale 3.", instructions=INSTRUCTIONS
+        )
+        self.assertEqual((await self.fake_stats())["caches_created"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
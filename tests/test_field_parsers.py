@@ -0,0 +1,62 @@
+import unittest
+
+from untils.field_parsers import parse_count, parse_currency, parse_price
+
+
+class ParseCurrencyTest(unittest.TestCase):
+    def test_prefixed_dollars(self):
+        cases = {
+            "Mex$ 1,399.00": "MXN",
+            "A$ 29.95": "AUD",
+            "HK$ 78": "HKD",
+            "CDN$ 19.99": "CAD",
+            "CA$ 4.50": "CAD",
+            "C$ 10": "CAD",
+            "NZ$ 30": "NZD",
+            "S$ 8.00": "SGD",
+            "R$ 20,00": "BRL",
+            "US$ 5": "USD",
+        }
+        for text, currency in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_currency(text), currency)
+
+    def test_bare_dollar_is_ambiguous(self):
+        self.assertIsNone(parse_currency("$19.99"))
+
+    def test_codes_must_be_iso_4217(self):
+        self.assertEqual(parse_currency("USD 5.00"), "USD")
+        self.assertEqual(parse_currency("19,99 EUR"), "EUR")
+        self.assertIsNone(parse_currency("NOW $5"))
+        self.assertIsNone(parse_currency("ALL $5"))
+
+    def test_symbols(self):
+        self.assertEqual(parse_currency("19,99€"), "EUR")
+        self.assertEqual(parse_currency("99 zł"), "PLN")
+
+    def test_prefixed_prices_parse(self):
+        self.assertEqual(parse_price("Mex$ 1,399.00"), 1399.0)
+        self.assertEqual(parse_price("CDN$ 19.99"), 19.99)
+
+
+class ParseCountTest(unittest.TestCase):
+    def test_thousands_separators(self):
+        cases = {
+            "12.345 reviews": 12345,
+            "12 345": 12345,
+            "12 345": 12345,
+            "12,345": 12345,
+            "(1,234,567)": 1234567,
+            "987": 987,
+        }
+        for text, count in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_count(text), count)
+
+    def test_suffixes(self):
+        self.assertEqual(parse_count("1.5K"), 1500)
+        self.assertEqual(parse_count("2.3M reviews"), 2_300_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import httpx
+
+from untils.http_fetcher import http_fetcher
+from untils.sitemap import iter_sitemap_entries
+
+IMAGE_SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url>
+    <loc>https://shop.example/p/game-1</loc>
+    <image:image><image:loc>https://cdn.example/img/1.jpg</image:loc></image:image>
+  </url>
+  <url>
+    <image:image><image:loc>https://cdn.example/img/2.jpg</image:loc></image:image>
+    <loc>https://shop.example/p/game-2</loc>
+  </url>
+</urlset>
+"""
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://shop.example/sitemap-games.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+
+class IterSitemapEntriesTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        documents = {
+            "/sitemap-images.xml": IMAGE_SITEMAP,
+            "/sitemap.xml": SITEMAP_INDEX,
+        }
+        http_fetcher._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, content=documents[request.url.path])
+            )
+        )
+        self.addAsyncCleanup(http_fetcher.stop)
+
+    async def entries(self, url):
+        return [entry async for entry in iter_sitemap_entries(url)]
+
+    async def test_image_loc_does_not_replace_the_page(self):
+        entries = await self.entries("https://shop.example/sitemap-images.xml")
+        self.assertEqual(
+            entries,
+            [
+                ("url", "https://shop.example/p/game-1"),
+                ("url", "https://shop.example/p/game-2"),
+            ],
+        )
+
+    async def test_sitemap_index(self):
+        entries = await self.entries("https://shop.example/sitemap.xml")
+        self.assertEqual(
+            entries, [("sitemap", "https://shop.example/sitemap-games.xml")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
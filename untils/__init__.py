@@ -1,6 +1,31 @@
-from untils.web_scraper import WebScraperDependency
-from untils.gemini_api import GeminiApiDependency
-from untils.regression import RegressionModel
-from untils.pdf_report_maker import PdfReportServiceDependency
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["WebScraperDependency", "GeminiApiDependency", "RegressionModel", "PdfReportServiceDependency"]
+if TYPE_CHECKING:
+    from untils.gemini_api import GeminiApiDependency
+    from untils.pdf_report_maker import PdfReportServiceDependency
+    from untils.regression import RegressionModel
+    from untils.web_scraper import WebScraperDependency
+
+# Exports are imported on first use. CPU pool workers unpickle job functions
+# from untils.* submodules, and importing this package must not load
+# Playwright, Gemini, the database or the app settings into them.
+_EXPORTS = {
+    "WebScraperDependency": "untils.web_scraper",
+    "GeminiApiDependency": "untils.gemini_api",
+    "RegressionModel": "untils.regression",
+    "PdfReportServiceDependency": "untils.pdf_report_maker",
+}
+
+__all__ = [
+    "WebScraperDependency",
+    "GeminiApiDependency",
+    "RegressionModel",
+    "PdfReportServiceDependency",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'untils' has no attribute '{name}'")
+    return getattr(import_module(_EXPORTS[name]), name)
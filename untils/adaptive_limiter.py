@@ -0,0 +1,195 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Optional
+
+from common.app_settings import settings
+
+OverloadClassifier = Callable[[BaseException], Optional[str]]
+EWMA_WEIGHT = 0.2
+# Smoothed over roughly the last ten calls.
+ERROR_RATE_WEIGHT = 0.1
+
+
+class AdaptiveCall:
+    def __init__(self):
+        self.overload_reason: Optional[str] = None
+        self.started = time.monotonic()
+        self.stopped: Optional[float] = None
+
+    def restart_clock(self) -> None:
+        """Exclude waits that are not the service's latency, e.g. rate limits."""
+        self.started = time.monotonic()
+
+    def stop_clock(self) -> None:
+        """Exclude work done after the service answered, e.g. page scripts."""
+        self.stopped = time.monotonic()
+
+    def overloaded(self, reason: str) -> None:
+        """Flag a call that succeeded only after hitting a limit, e.g. a 429."""
+        self.overload_reason = reason
+
+
+class AdaptiveLimiter:
+    """Concurrency limit tuned by additive increase, multiplicative decrease.
+
+    Every successful call within latency_tolerance times the baseline latency
+    adds 1/limit, so the limit grows by one per round of calls, but only while
+    the smoothed share of recent calls that failed stays below max_error_rate.
+    An overload signal (a 429, quota exhaustion, a timeout) multiplies the
+    limit by decrease_factor. Calls that were already in flight when the limit was cut
+    report the same congestion, so only one cut is made per cooldown, which is
+    one smoothed call latency.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        is_overload: OverloadClassifier,
+        initial_limit: Optional[int] = None,
+        min_limit: int = 1,
+        latency_tolerance: Optional[float] = None,
+        max_error_rate: Optional[float] = None,
+        decrease_factor: float = 0.5,
+    ):
+        self.name = name
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.limit = float(
+            min(initial_limit or settings.ADAPTIVE_INITIAL_CONCURRENCY, max_limit)
+        )
+        self.is_overload = is_overload
+        self.latency_tolerance = (
+            latency_tolerance or settings.ADAPTIVE_LATENCY_TOLERANCE
+        )
+        self.max_error_rate = (
+            settings.ADAPTIVE_MAX_ERROR_RATE
+            if max_error_rate is None
+            else max_error_rate
+        )
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.error_rate = 0.0
+        self.latency_ewma: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self.last_decrease = 0.0
+        self.successes = 0
+        self.errors = 0
+        self.increases = 0
+        self.decreases = 0
+        self.overload_reasons: Dict[str, int] = {}
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[AdaptiveCall]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        call = AdaptiveCall()
+        try:
+            yield call
+        except BaseException as e:
+            reason = call.overload_reason or self.is_overload(e)
+            if reason:
+                self._record_error()
+                self._decrease(reason)
+            elif not isinstance(e, asyncio.CancelledError):
+                self.errors += 1
+                self._record_error()
+            raise
+        else:
+            if call.overload_reason:
+                self._record_error()
+                self._decrease(call.overload_reason)
+            else:
+                self._record_success((call.stopped or time.monotonic()) - call.started)
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def _record_error(self) -> None:
+        self.error_rate += ERROR_RATE_WEIGHT * (1.0 - self.error_rate)
+
+    def _record_success(self, latency: float) -> None:
+        self.successes += 1
+        self.error_rate -= ERROR_RATE_WEIGHT * self.error_rate
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += EWMA_WEIGHT * (latency - self.latency_ewma)
+        if self.baseline_latency is None or self.latency_ewma < self.baseline_latency:
+            self.baseline_latency = self.latency_ewma
+        else:
+            # Let the baseline follow a slower service instead of pinning the
+            # limit forever to the fastest latency ever seen.
+            self.baseline_latency += 0.01 * (self.latency_ewma - self.baseline_latency)
+
+        healthy = (
+            self.latency_ewma <= self.baseline_latency * self.latency_tolerance
+            and self.error_rate < self.max_error_rate
+        )
+        if healthy and self.limit < self.max_limit:
+            previous = int(self.limit)
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            if int(self.limit) > previous:
+                self.increases += 1
+                self._wake_waiters()
+
+    def _decrease(self, reason: str) -> None:
+        self.overload_reasons[reason] = self.overload_reasons.get(reason, 0) + 1
+        now = time.monotonic()
+        cooldown = max(self.latency_ewma or 0.0, 1.0)
+        if now - self.last_decrease < cooldown:
+            return
+        self.last_decrease = now
+        new_limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        if int(new_limit) < int(self.limit):
+            self.decreases += 1
+            print(
+                f"Concurrency for {self.name} cut from {int(self.limit)} to "
+                f"{int(new_limit)} after {reason}."
+            )
+        self.limit = new_limit
+
+    def _wake_waiters(self) -> None:
+        async def notify() -> None:
+            async with self._condition:
+                self._condition.notify_all()
+
+        asyncio.get_running_loop().create_task(notify())
+
+    def to_dict(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "latency_ewma_ms": (
+                round(self.latency_ewma * 1000, 1) if self.latency_ewma else None
+            ),
+            "baseline_latency_ms": (
+                round(self.baseline_latency * 1000, 1)
+                if self.baseline_latency
+                else None
+            ),
+            "successes": self.successes,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 3),
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "overload_reasons": dict(self.overload_reasons),
+        }
+
+
+adaptive_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def get_adaptive_limiter(
+    name: str, max_limit: int, is_overload: OverloadClassifier
+) -> AdaptiveLimiter:
+    limiter = adaptive_limiters.get(name)
+    if limiter is None:
+        limiter = AdaptiveLimiter(name, max_limit, is_overload)
+        adaptive_limiters[name] = limiter
+    return limiter
@@ -0,0 +1,244 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, List, Optional
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+from common.app_settings import settings
+
+# How long stop() waits for leased contexts to come back before closing browsers.
+STOP_DRAIN_TIMEOUT_SECONDS = 10.0
+
+
+class PooledBrowser:
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.browser: Optional[Browser] = None
+        self.pages_served = 0
+        self.generation = 0
+        self.active_contexts = 0
+        # Set once the browser has served its pages; it takes no new leases
+        # and is relaunched when its last context comes back.
+        self.retiring = False
+        self.launch_lock = asyncio.Lock()
+
+
+class BrowserPool:
+    """A fixed set of Chromium browsers, each shared by several contexts.
+
+    A lease opens a fresh context on the least busy browser that has fewer
+    than contexts_per_browser open, and waits when every browser is full.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_pages_per_browser: int,
+        headless: bool,
+        contexts_per_browser: int = 1,
+    ):
+        self.size = size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.headless = headless
+        self.contexts_per_browser = contexts_per_browser
+
+        self._playwright: Optional[Playwright] = None
+        self._slots: List[PooledBrowser] = []
+        self._condition = asyncio.Condition()
+        self._start_lock = asyncio.Lock()
+        self._started = False
+        # Bumped by stop(), so leases still out can tell their slot is gone.
+        self._run = 0
+
+        self.leases_total = 0
+        self.recycled_total = 0
+        self.launch_failures = 0
+        self.wait_seconds_total = 0.0
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._started:
+                return
+            self._playwright = await async_playwright().start()
+            slots = [PooledBrowser(slot) for slot in range(self.size)]
+            await asyncio.gather(*(self._warm_up(pooled) for pooled in slots))
+            self._slots = slots
+            self._started = True
+            async with self._condition:
+                self._condition.notify_all()
+            print(
+                f"Browser pool started with {self.size} browser(s) of "
+                f"{self.contexts_per_browser} context(s), recycling every "
+                f"{self.max_pages_per_browser} page(s)."
+            )
+
+    async def stop(self) -> None:
+        async with self._start_lock:
+            if not self._started:
+                return
+            self._started = False
+            self._run += 1
+            try:
+                async with self._condition:
+                    # Wake waiting leases, which restart the pool afterwards.
+                    self._condition.notify_all()
+                    await asyncio.wait_for(
+                        self._condition.wait_for(
+                            lambda: not any(p.active_contexts for p in self._slots)
+                        ),
+                        STOP_DRAIN_TIMEOUT_SECONDS,
+                    )
+            except asyncio.TimeoutError:
+                print("Browser pool stopping with contexts still leased.")
+            for pooled in self._slots:
+                await self._close_browser(pooled)
+            self._slots = []
+            if self._playwright:
+                await self._playwright.stop()
+            self._playwright = None
+            async with self._condition:
+                self._condition.notify_all()
+            print("Browser pool stopped.")
+
+    def _free_slot(self) -> Optional[PooledBrowser]:
+        free = [
+            pooled
+            for pooled in self._slots
+            if not pooled.retiring
+            and pooled.active_contexts < self.contexts_per_browser
+        ]
+        return min(free, key=lambda pooled: pooled.active_contexts, default=None)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserContext]:
+        loop = asyncio.get_running_loop()
+        wait_started = loop.time()
+        pooled: Optional[PooledBrowser] = None
+        while pooled is None:
+            if not self._started:
+                await self.start()
+            async with self._condition:
+                await self._condition.wait_for(
+                    lambda: not self._started or self._free_slot() is not None
+                )
+                pooled = self._free_slot() if self._started else None
+                if pooled is not None:
+                    pooled.active_contexts += 1
+        run = self._run
+        self.wait_seconds_total += loop.time() - wait_started
+        self.leases_total += 1
+
+        context: Optional[BrowserContext] = None
+        try:
+            browser = await self._ensure_browser(pooled)
+            context = await browser.new_context()
+            yield context
+        finally:
+            if context is not None:
+                with suppress(Exception):
+                    await context.close()
+            await self._release(pooled, run)
+
+    async def _release(self, pooled: PooledBrowser, run: int) -> None:
+        pooled.pages_served += 1
+        if pooled.pages_served >= self.max_pages_per_browser:
+            pooled.retiring = True
+        async with self._condition:
+            pooled.active_contexts -= 1
+            idle = pooled.active_contexts == 0
+            self._condition.notify_all()
+        # A stopped pool closes its browsers itself, and a crashed browser is
+        # relaunched by the next lease.
+        if run == self._run and idle and pooled.retiring:
+            await self._recycle(pooled)
+            async with self._condition:
+                pooled.retiring = False
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        async with self.lease() as context:
+            page = await context.new_page()
+            yield page
+
+    def stats(self) -> dict:
+        active = sum(pooled.active_contexts for pooled in self._slots)
+        return {
+            "size": self.size,
+            "started": self._started,
+            "contexts_per_browser": self.contexts_per_browser,
+            "active_contexts": active,
+            "free_contexts": (
+                self.size * self.contexts_per_browser - active if self._started else 0
+            ),
+            "max_pages_per_browser": self.max_pages_per_browser,
+            "leases_total": self.leases_total,
+            "recycled_total": self.recycled_total,
+            "launch_failures": self.launch_failures,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+        }
+
+    async def _ensure_browser(self, pooled: PooledBrowser) -> Browser:
+        # Contexts leased together on a crashed browser must not each relaunch it.
+        async with pooled.launch_lock:
+            if pooled.browser is None or not pooled.browser.is_connected():
+                await self._launch(pooled)
+        assert pooled.browser is not None
+        return pooled.browser
+
+    async def _launch(self, pooled: PooledBrowser) -> None:
+        assert self._playwright is not None
+        try:
+            pooled.browser = await self._playwright.chromium.launch(
+                headless=self.headless
+            )
+            pooled.pages_served = 0
+            pooled.generation += 1
+        except Exception:
+            pooled.browser = None
+            self.launch_failures += 1
+            raise
+
+    async def _warm_up(self, pooled: PooledBrowser) -> None:
+        try:
+            await self._launch(pooled)
+            assert pooled.browser is not None
+            context = await pooled.browser.new_context()
+            page = await context.new_page()
+            await page.goto("about:blank")
+            await context.close()
+        except Exception as e:
+            print(f"Browser pool warm-up failed for slot {pooled.slot}: {e}")
+
+    async def _recycle(self, pooled: PooledBrowser) -> None:
+        async with pooled.launch_lock:
+            await self._close_browser(pooled)
+            self.recycled_total += 1
+            try:
+                await self._launch(pooled)
+            except Exception as e:
+                print(f"Failed to relaunch browser in slot {pooled.slot}: {e}")
+
+    async def _close_browser(self, pooled: PooledBrowser) -> None:
+        if pooled.browser is not None:
+            with suppress(Exception):
+                await pooled.browser.close()
+        pooled.browser = None
+
+
+browser_pool = BrowserPool(
+    size=settings.BROWSER_POOL_SIZE,
+    max_pages_per_browser=settings.BROWSER_POOL_MAX_PAGES_PER_BROWSER,
+    headless=settings.BROWSER_HEADLESS,
+    contexts_per_browser=settings.BROWSER_POOL_CONTEXTS_PER_BROWSER,
+)
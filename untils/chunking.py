@@ -0,0 +1,231 @@
+from typing import Any, Dict, List, Optional
+
+from lxml import etree, html as lxml_html
+
+from schemas import ExtractedGameDataDTO
+from untils.html_minimizer import fit_lines_to_budget
+from untils.prompts import CHARS_PER_TOKEN, estimate_tokens
+
+
+class ChunkingStats:
+    def __init__(self):
+        self.pages = {"links": 0, "details": 0}
+        self.chunks = {"links": 0, "details": 0}
+        self.max_chunks_per_page = 0
+
+    def record(self, kind: str, chunk_count: int) -> None:
+        self.pages[kind] += 1
+        self.chunks[kind] += chunk_count
+        self.max_chunks_per_page = max(self.max_chunks_per_page, chunk_count)
+
+    def to_dict(self) -> dict:
+        return {
+            "chunked_pages": dict(self.pages),
+            "chunks": dict(self.chunks),
+            "max_chunks_per_page": self.max_chunks_per_page,
+        }
+
+
+chunking_stats = ChunkingStats()
+
+UNKNOWN_VALUES = (None, -1, -1.0, "", "unknown")
+SCALAR_GAME_FIELDS = (
+    "name",
+    "availability_status",
+    "rating",
+    "reviews_count",
+)
+OBJECT_GAME_FIELDS = ("special_content_json", "discount_info_json", "metadata_json")
+
+
+def split_html(html: str, token_budget: int, max_chunks: int) -> List[str]:
+    """Split cleaned HTML into chunks of at most token_budget tokens.
+
+    Chunks end at element boundaries: consecutive siblings are packed together
+    and only elements larger than the budget are opened up. Each chunk starts
+    with a comment naming the ancestors it was cut from, so CSS selectors the
+    model returns for it still make sense. Past max_chunks, the chunks before
+    the page's last one are dropped, since the pager usually sits at the end.
+    """
+    if estimate_tokens(html) <= token_budget:
+        return [html]
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return _cap_chunks(_split_text(html, token_budget), max_chunks)
+
+    body = root.find("body")
+    chunks: List[str] = []
+    _pack_children(body if body is not None else root, token_budget, chunks, [])
+    return _cap_chunks(chunks, max_chunks)
+
+
+def _cap_chunks(chunks: List[str], max_chunks: int) -> List[str]:
+    if len(chunks) <= max_chunks:
+        return chunks
+    if max_chunks == 1:
+        kept = chunks[:1]
+    else:
+        kept = chunks[: max_chunks - 1] + chunks[-1:]
+    print(f"Page split into {len(chunks)} chunks; dropping {len(chunks) - len(kept)}.")
+    return kept
+
+
+def _describe(element) -> str:
+    description = element.tag
+    if element.get("id"):
+        description += f"#{element.get('id')}"
+    for css_class in (element.get("class") or "").split()[:2]:
+        description += f".{css_class}"
+    return description
+
+
+def _pack_children(element, token_budget: int, chunks: List[str], path: List[str]):
+    path = [*path, _describe(element)]
+    header = f"<!-- section: {' > '.join(path)} -->\n"
+    group: List[str] = [element.text] if element.text and element.text.strip() else []
+    group_tokens = sum(estimate_tokens(piece) for piece in group)
+
+    def flush() -> None:
+        nonlocal group, group_tokens
+        if "".join(group).strip():
+            chunks.append(header + "".join(group))
+        group, group_tokens = [], 0
+
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        piece = lxml_html.tostring(child, encoding="unicode", with_tail=True)
+        tokens = estimate_tokens(piece)
+        if tokens > token_budget:
+            flush()
+            if len(child):
+                _pack_children(child, token_budget, chunks, path)
+            else:
+                chunks.extend(
+                    header + text for text in _split_text(piece, token_budget)
+                )
+            continue
+        if group_tokens + tokens > token_budget:
+            flush()
+        group.append(piece)
+        group_tokens += tokens
+    flush()
+
+
+def _split_text(text: str, token_budget: int) -> List[str]:
+    size = token_budget * CHARS_PER_TOKEN
+    return [text[start : start + size] for start in range(0, len(text), size)]
+
+
+def split_compact_text(text: str, token_budget: int, max_chunks: int) -> List[str]:
+    """Split minimized page text into chunks at its '#' section headings.
+
+    Every chunk after the first repeats the page's first heading so the model
+    knows which game the section belongs to. Text that would need more than
+    max_chunks chunks is first reduced with the minimizer's budget rules.
+    """
+    if estimate_tokens(text) <= token_budget:
+        return [text]
+    lines = text.split("\n")
+    if estimate_tokens(text) > token_budget * max_chunks:
+        lines = fit_lines_to_budget(lines, token_budget * max_chunks)
+
+    title = next((line for line in lines if line.startswith("#")), None)
+    sections: List[List[str]] = []
+    for line in lines:
+        if line.startswith("#") or not sections:
+            sections.append([])
+        sections[-1].append(line)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for section in sections:
+        for line in _fit_section(section, token_budget):
+            tokens = estimate_tokens(line)
+            if current and current_tokens + tokens > token_budget:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(line)
+            current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+
+    if title:
+        chunks = [chunks[0]] + [
+            chunk if chunk.startswith(title) else f"(continued from: {title})\n{chunk}"
+            for chunk in chunks[1:]
+        ]
+    return chunks[:max_chunks]
+
+
+def _fit_section(lines: List[str], token_budget: int) -> List[str]:
+    fitted = []
+    for line in lines:
+        if estimate_tokens(line) > token_budget:
+            fitted.extend(_split_text(line, token_budget))
+        else:
+            fitted.append(line)
+    return fitted
+
+
+def merge_link_results(results: List[dict], target_count: int) -> dict:
+    game_urls: List[str] = []
+    seen = set()
+    next_page_selector: Optional[str] = None
+    for result in results:
+        for url in result.get("game_urls") or []:
+            if url not in seen and len(game_urls) < target_count:
+                seen.add(url)
+                game_urls.append(url)
+        # Pagination sits at the end of a listing, so the last answer wins.
+        next_page_selector = result.get("next_page_selector") or next_page_selector
+    return {"game_urls": game_urls, "next_page_selector": next_page_selector}
+
+
+def merge_game_data(results: List[dict], game_url: str) -> dict:
+    """Reconcile the answers for the chunks of one game page.
+
+    Chunks are in page order and the game's own title and buy box come before
+    DLCs and recommendations, so for single values the first known answer
+    wins. Price, currency and price_in_usd are taken together from one chunk.
+    The longest description is kept and JSON objects are merged key by key.
+    """
+    merged = ExtractedGameDataDTO(url_on_platform=game_url).model_dump(mode="json")
+    price_source = next((r for r in results if _known(r.get("price"))), None)
+    if price_source is not None:
+        for field in ("price", "currency", "price_in_usd"):
+            merged[field] = price_source.get(field, merged[field])
+
+    for field in SCALAR_GAME_FIELDS:
+        merged[field] = next(
+            (r[field] for r in results if _known(r.get(field))), merged[field]
+        )
+
+    descriptions = [r["description"] for r in results if _known(r.get("description"))]
+    if descriptions:
+        merged["description"] = max(descriptions, key=len)
+
+    for field in OBJECT_GAME_FIELDS:
+        merged[field] = _merge_objects(
+            [r.get(field) for r in results if isinstance(r.get(field), dict)]
+        )
+    return merged
+
+
+def _known(value: Any) -> bool:
+    return value not in UNKNOWN_VALUES
+
+
+def _merge_objects(objects: List[dict]) -> Optional[dict]:
+    if not objects:
+        return None
+    merged: Dict[str, Any] = {}
+    for obj in objects:
+        for key, value in obj.items():
+            if key not in merged or merged[key] in (None, "", [], {}):
+                merged[key] = value
+            elif isinstance(merged[key], list) and isinstance(value, list):
+                merged[key] = merged[key] + [v for v in value if v not in merged[key]]
+    return merged
@@ -0,0 +1,167 @@
+import asyncio
+import hashlib
+import time
+from typing import Dict, Optional, Set
+
+from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types as genai_types
+
+from common.app_settings import settings
+
+# Refresh an entry this long before it expires so no call races the expiry.
+REFRESH_MARGIN_SECONDS = 60
+
+
+class CachedPrefix:
+    def __init__(self, name: str, expires_at: float):
+        self.name = name
+        self.expires_at = expires_at
+
+
+class ContextCacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.created = 0
+        self.refreshed = 0
+        self.fallbacks = 0
+        self.errors = 0
+        self.invalidated = 0
+        self.cached_tokens = 0
+        self.prompt_tokens = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "created": self.created,
+            "refreshed": self.refreshed,
+            "fallbacks": self.fallbacks,
+            "errors": self.errors,
+            "invalidated": self.invalidated,
+            "cached_tokens": self.cached_tokens,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_token_share": (
+                round(self.cached_tokens / self.prompt_tokens, 3)
+                if self.prompt_tokens
+                else 0.0
+            ),
+        }
+
+
+class ContextCache:
+    """Gemini cached contents for the static instructions of our prompts.
+
+    Each distinct (model, instructions) pair is created once as cached content
+    with a TTL and refreshed shortly before it expires, so calls only send the
+    page-specific part of the prompt. Prefixes the API refuses to cache, e.g.
+    because they are below the model's minimum size, are remembered and sent
+    inline from then on.
+    """
+
+    def __init__(self, enabled: bool, ttl_seconds: int):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.stats = ContextCacheStats()
+        self._entries: Dict[str, CachedPrefix] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._uncacheable: Set[str] = set()
+
+    @staticmethod
+    def _key(model: str, instructions: str) -> str:
+        return hashlib.sha256(f"{model}\0{instructions}".encode("utf-8")).hexdigest()
+
+    async def get_name(
+        self, client: genai.Client, model: str, instructions: str
+    ) -> Optional[str]:
+        """Cached content name for the instructions, or None to send them inline."""
+        if not self.enabled:
+            return None
+        key = self._key(model, instructions)
+        if key in self._uncacheable:
+            self.stats.fallbacks += 1
+            return None
+        entry = self._entries.get(key)
+        if entry and entry.expires_at - time.time() > REFRESH_MARGIN_SECONDS:
+            self.stats.hits += 1
+            return entry.name
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            entry = self._entries.get(key)
+            if entry and entry.expires_at - time.time() > REFRESH_MARGIN_SECONDS:
+                self.stats.hits += 1
+                return entry.name
+            ttl = f"{self.ttl_seconds}s"
+            try:
+                if entry and entry.expires_at > time.time():
+                    await client.aio.caches.update(
+                        name=entry.name,
+                        config=genai_types.UpdateCachedContentConfig(ttl=ttl),
+                    )
+                    self.stats.refreshed += 1
+                else:
+                    cached = await client.aio.caches.create(
+                        model=model,
+                        config=genai_types.CreateCachedContentConfig(
+                            contents=[
+                                genai_types.Content(
+                                    role="user",
+                                    parts=[genai_types.Part(text=instructions)],
+                                )
+                            ],
+                            ttl=ttl,
+                            display_name=f"instructions-{key[:12]}",
+                        ),
+                    )
+                    entry = CachedPrefix(cached.name, 0.0)
+                    self.stats.created += 1
+            except genai_errors.APIError as e:
+                self.stats.errors += 1
+                self.stats.fallbacks += 1
+                self._entries.pop(key, None)
+                if e.code is not None and 400 <= e.code < 500 and e.code != 429:
+                    print(
+                        f"Gemini refused to cache a prompt prefix; sending it inline: {e}"
+                    )
+                    self._uncacheable.add(key)
+                return None
+            entry.expires_at = time.time() + self.ttl_seconds
+            self._entries[key] = entry
+            return entry.name
+
+    def invalidate(self, name: str) -> None:
+        """Forget a cached content the API no longer knows, e.g. after expiry."""
+        for key, entry in list(self._entries.items()):
+            if entry.name == name:
+                del self._entries[key]
+                self.stats.invalidated += 1
+
+    def record_usage(
+        self, usage: Optional[genai_types.GenerateContentResponseUsageMetadata]
+    ) -> None:
+        if usage is None:
+            return
+        self.stats.prompt_tokens += usage.prompt_token_count or 0
+        self.stats.cached_tokens += usage.cached_content_token_count or 0
+
+    async def close(self, client: genai.Client) -> None:
+        for entry in self._entries.values():
+            try:
+                await client.aio.caches.delete(name=entry.name)
+            except genai_errors.APIError:
+                pass
+        self._entries.clear()
+
+    def to_dict(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "entries": len(self._entries),
+            "uncacheable_prefixes": len(self._uncacheable),
+            **self.stats.to_dict(),
+        }
+
+
+context_cache = ContextCache(
+    enabled=settings.GEMINI_CONTEXT_CACHE_ENABLED,
+    ttl_seconds=settings.GEMINI_CONTEXT_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,100 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from common.app_settings import settings
+
+T = TypeVar("T")
+
+
+class CpuExecutor:
+    """Runs CPU-bound work off the event loop.
+
+    run() is for whole-page lxml work, HTML cleaning and minimizing, and uses
+    the pool picked by CPU_EXECUTOR_KIND. Jobs sent to a process pool must be
+    importable without the app: untils.html_cleaner and untils.html_minimizer
+    import neither settings, Playwright nor Gemini. run_in_thread() is for
+    shorter parses where pickling a page to a process would cost more than the
+    work. Sub-millisecond JSON parsing is simply called inline.
+    """
+
+    def __init__(self, kind: str, workers: int):
+        if kind not in ("process", "thread", "inline"):
+            raise ValueError(f"Unknown CPU executor kind '{kind}'.")
+        self.kind = kind
+        self.workers = workers
+        self._executor: Optional[Executor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self.tasks_submitted = 0
+        self.thread_tasks_submitted = 0
+        self.tasks_running = 0
+
+    def start(self) -> None:
+        if self.kind == "inline":
+            return
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="cpu-bound"
+            )
+        if self._executor is not None:
+            return
+        if self.kind == "process":
+            # Forking a process that already runs an event loop and Playwright's
+            # driver threads is unsafe, so workers are spawned fresh.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            self._executor = self._threads
+
+    def shutdown(self) -> None:
+        if self._executor is not None and self._executor is not self._threads:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._threads is not None:
+            self._threads.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+        self._threads = None
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        self.tasks_submitted += 1
+        if self.kind == "inline":
+            return func(*args)
+        if self._executor is None:
+            self.start()
+        return await self._run_in(self._executor, func, *args)
+
+    async def run_in_thread(self, func: Callable[..., T], *args: Any) -> T:
+        self.thread_tasks_submitted += 1
+        if self.kind == "inline":
+            return func(*args)
+        if self._threads is None:
+            self.start()
+        return await self._run_in(self._threads, func, *args)
+
+    async def _run_in(
+        self, executor: Optional[Executor], func: Callable[..., T], *args: Any
+    ) -> T:
+        self.tasks_running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, partial(func, *args)
+            )
+        finally:
+            self.tasks_running -= 1
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "tasks_submitted": self.tasks_submitted,
+            "thread_tasks_submitted": self.thread_tasks_submitted,
+            "tasks_running": self.tasks_running,
+        }
+
+
+cpu_executor = CpuExecutor(
+    kind=settings.CPU_EXECUTOR_KIND, workers=settings.CPU_EXECUTOR_WORKERS
+)
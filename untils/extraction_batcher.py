@@ -0,0 +1,208 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Set
+
+from untils.prompts import GAME_DETAILS_BATCH_PROMPT, estimate_tokens
+
+PROMPT_OVERHEAD_TOKENS = estimate_tokens(
+    GAME_DETAILS_BATCH_PROMPT.instructions + GAME_DETAILS_BATCH_PROMPT.template
+)
+# The page header ("=== PAGE n ===", URL line) around each page's HTML.
+PAGE_OVERHEAD_TOKENS = 40
+
+
+class BatchPage:
+    def __init__(self, url: str, cleaned_html: str, tokens: int):
+        self.url = url
+        self.cleaned_html = cleaned_html
+        self.tokens = tokens
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+BatchHandler = Callable[[List[BatchPage]], Awaitable[Dict[str, dict]]]
+PageHandler = Callable[[str, str], Awaitable[dict]]
+
+
+class ExtractionBatchStats:
+    def __init__(self):
+        self.batches = 0
+        self.batched_pages = 0
+        self.batch_failures = 0
+        self.fallback_pages = 0
+        self.oversized_pages = 0
+        self.prompt_tokens = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "batches": self.batches,
+            "batched_pages": self.batched_pages,
+            "avg_batch_size": (
+                round(self.batched_pages / self.batches, 2) if self.batches else 0.0
+            ),
+            "batch_failures": self.batch_failures,
+            "fallback_pages": self.fallback_pages,
+            "oversized_pages": self.oversized_pages,
+            "estimated_prompt_tokens": self.prompt_tokens,
+        }
+
+
+extraction_batch_stats: Dict[str, ExtractionBatchStats] = {}
+
+
+class ExtractionBatcher:
+    """Packs pages submitted by concurrent extract workers into shared prompts.
+
+    A batch is sent when the next page would push it over the token budget,
+    when it holds max_pages pages, or linger_seconds after its first page
+    arrived. Pages the batch answer does not cover, and every page of a batch
+    that failed outright, are extracted one by one with the single-page call.
+
+    Extract calls registered with caller() tell the batcher how many pages
+    could still come: once every registered caller is waiting on an answer,
+    the batch is sent without lingering, so a single worker never waits.
+    """
+
+    def __init__(
+        self,
+        run_batch: BatchHandler,
+        run_single: PageHandler,
+        stats_key: str,
+        max_pages: int,
+        token_budget: int,
+        linger_seconds: float,
+    ):
+        self.run_batch = run_batch
+        self.run_single = run_single
+        self.max_pages = max_pages
+        self.token_budget = token_budget
+        self.linger_seconds = linger_seconds
+        self.stats = extraction_batch_stats.setdefault(
+            stats_key, ExtractionBatchStats()
+        )
+        self._pending: List[BatchPage] = []
+        self._pending_tokens = PROMPT_OVERHEAD_TOKENS
+        self._linger_task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self._callers = 0
+        self._waiting = 0
+
+    @contextmanager
+    def caller(self) -> Iterator[None]:
+        """Register an extract call that may submit a page."""
+        self._callers += 1
+        try:
+            yield
+        finally:
+            self._callers -= 1
+            if self._pending and self._nobody_else_can_submit():
+                self._flush()
+
+    def _nobody_else_can_submit(self) -> bool:
+        return 0 < self._callers <= self._waiting
+
+    async def submit(self, url: str, cleaned_html: str) -> dict:
+        self._waiting += 1
+        try:
+            return await self._submit(url, cleaned_html)
+        finally:
+            self._waiting -= 1
+
+    async def _submit(self, url: str, cleaned_html: str) -> dict:
+        tokens = estimate_tokens(cleaned_html) + PAGE_OVERHEAD_TOKENS
+        if PROMPT_OVERHEAD_TOKENS + tokens > self.token_budget:
+            self.stats.oversized_pages += 1
+            if self._pending and self._nobody_else_can_submit():
+                self._flush()
+            return await self.run_single(url, cleaned_html)
+
+        if self._pending_tokens + tokens > self.token_budget:
+            self._flush()
+        page = BatchPage(url, cleaned_html, tokens)
+        self._pending.append(page)
+        self._pending_tokens += tokens
+        if len(self._pending) >= self.max_pages or self._nobody_else_can_submit():
+            self._flush()
+        elif len(self._pending) == 1:
+            self._linger_task = asyncio.create_task(self._flush_after_linger())
+        return await page.future
+
+    async def _flush_after_linger(self) -> None:
+        await asyncio.sleep(self.linger_seconds)
+        self._linger_task = None
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._linger_task is not None:
+            self._linger_task.cancel()
+            self._linger_task = None
+        pages = [page for page in self._pending if not page.future.done()]
+        self._pending = []
+        self._pending_tokens = PROMPT_OVERHEAD_TOKENS
+        if not pages:
+            return
+        task = asyncio.create_task(self._run(pages))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, pages: List[BatchPage]) -> None:
+        if len(pages) == 1:
+            # A batch prompt for one page only costs more than the plain one.
+            await self._run_single(pages[0])
+            return
+
+        self.stats.batches += 1
+        self.stats.batched_pages += len(pages)
+        self.stats.prompt_tokens += PROMPT_OVERHEAD_TOKENS + sum(
+            page.tokens for page in pages
+        )
+        try:
+            results = await self.run_batch(pages)
+        except Exception as e:
+            print(f"Batch extraction of {len(pages)} pages failed: {e}")
+            self.stats.batch_failures += 1
+            results = {}
+
+        fallback = []
+        for page in pages:
+            data = results.get(page.url)
+            if data is None:
+                fallback.append(page)
+            elif not page.future.done():
+                page.future.set_result(data)
+        if fallback:
+            self.stats.fallback_pages += len(fallback)
+            print(
+                f"Batch answer covered {len(pages) - len(fallback)}/{len(pages)} "
+                "pages; extracting the rest one by one."
+            )
+            await asyncio.gather(*(self._run_single(page) for page in fallback))
+
+    async def _run_single(self, page: BatchPage) -> None:
+        try:
+            data = await self.run_single(page.url, page.cleaned_html)
+        except Exception as e:
+            if not page.future.done():
+                page.future.set_exception(e)
+            return
+        if not page.future.done():
+            page.future.set_result(data)
+
+
+extraction_batchers: Dict[str, ExtractionBatcher] = {}
+
+
+def get_extraction_batcher(
+    key: str,
+    run_batch: BatchHandler,
+    run_single: PageHandler,
+    max_pages: int,
+    token_budget: int,
+    linger_seconds: float,
+) -> ExtractionBatcher:
+    batcher = extraction_batchers.get(key)
+    if batcher is None:
+        batcher = ExtractionBatcher(
+            run_batch, run_single, key, max_pages, token_budget, linger_seconds
+        )
+        extraction_batchers[key] = batcher
+    return batcher
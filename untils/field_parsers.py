@@ -0,0 +1,173 @@
+import re
+from typing import Optional
+
+from enums import GameStatusEnum
+
+# Dollar signs with a country prefix. A bare "$" is shared by a dozen
+# currencies, so it is left to the platform default or the LLM.
+DOLLAR_PREFIXES = {
+    "Mex": "MXN",
+    "CDN": "CAD",
+    "CA": "CAD",
+    "C": "CAD",
+    "AU": "AUD",
+    "A": "AUD",
+    "HK": "HKD",
+    "NZ": "NZD",
+    "NT": "TWD",
+    "US": "USD",
+    "S": "SGD",
+    "R": "BRL",
+}
+PREFIXED_DOLLAR = re.compile(
+    r"(?<![A-Za-z])("
+    + "|".join(sorted(DOLLAR_PREFIXES, key=len, reverse=True))
+    + r")\s?\$"
+)
+CURRENCY_SYMBOLS = [
+    ("zł", "PLN"),
+    ("€", "EUR"),
+    ("£", "GBP"),
+    ("₴", "UAH"),
+    ("¥", "JPY"),
+    ("₽", "RUB"),
+    ("₹", "INR"),
+    ("₩", "KRW"),
+]
+# Active ISO 4217 codes, without ALL, CUP and TOP, which are far more often
+# shouted words than Albanian, Cuban or Tongan prices.
+ISO_4217_CODES = frozenset(
+    """
+    AED AFN AMD ANG AOA ARS AUD AWG AZN BAM BBD BDT BGN BHD BIF BMD BND BOB
+    BRL BSD BTN BWP BYN BZD CAD CDF CHF CLP CNY COP CRC CVE CZK DJF DKK DOP
+    DZD EGP ERN ETB EUR FJD FKP GBP GEL GHS GIP GMD GNF GTQ GYD HKD HNL HTG
+    HUF IDR ILS INR IQD IRR ISK JMD JOD JPY KES KGS KHR KMF KPW KRW KWD KYD
+    KZT LAK LBP LKR LRD LSL LYD MAD MDL MGA MKD MMK MNT MOP MRU MUR MVR MWK
+    MXN MYR MZN NAD NGN NIO NOK NPR NZD OMR PAB PEN PGK PHP PKR PLN PYG QAR
+    RON RSD RUB RWF SAR SBD SCR SDG SEK SGD SHP SLE SOS SRD SSP STN SVC SYP
+    SZL THB TJS TMT TND TRY TTD TWD TZS UAH UGX USD UYU UZS VES VND VUV WST
+    XAF XCD XOF XPF YER ZAR ZMW ZWL
+    """.split()
+)
+CURRENCY_CODE = re.compile(r"\b([A-Z]{3})\b")
+FREE_PRICE = re.compile(r"^\s*(free|free to play|безкоштовно)\s*$", re.IGNORECASE)
+NUMBER = re.compile(r"\d[\d\s.,  ']*")
+COUNT = re.compile(r"(\d[\d\s.,  ']*)\s*([kKmM])?")
+GROUPED_COUNT = re.compile(r"^\d{1,3}(?:([.,\s  '])\d{3})(?:\1\d{3})*$")
+RATING = re.compile(r"(\d+(?:[.,]\d+)?)\s*(%|/\s*(\d+(?:[.,]\d+)?))?")
+
+AVAILABILITY_KEYWORDS = [
+    (re.compile(r"not available in your (region|country)", re.I), "region_locked"),
+    (re.compile(r"pre-?order", re.I), "preorder"),
+    (re.compile(r"coming soon|release date tba|wishlist now", re.I), "coming_soon"),
+    (re.compile(r"early access", re.I), "early_access"),
+    (re.compile(r"out of stock|sold out", re.I), "out_of_stock"),
+    (re.compile(r"\bbeta\b", re.I), "beta"),
+    (re.compile(r"unavailable|not available|no longer available", re.I), "unavailable"),
+    (re.compile(r"free to play|play for free|^\s*free\s*$", re.I), "free"),
+    (
+        re.compile(r"add to (cart|basket)|buy now|in stock|available|purchase", re.I),
+        "available",
+    ),
+]
+AVAILABILITY_VALUES = {status.value for status in GameStatusEnum}
+SCHEMA_ORG_AVAILABILITY = {
+    "instock": "available",
+    "onlineonly": "available",
+    "limitedavailability": "available",
+    "instoreonly": "unavailable",
+    "outofstock": "out_of_stock",
+    "soldout": "out_of_stock",
+    "preorder": "preorder",
+    "presale": "preorder",
+    "backorder": "preorder",
+    "discontinued": "unavailable",
+}
+
+
+def parse_number(text: str) -> Optional[float]:
+    match = NUMBER.search(text)
+    if not match:
+        return None
+    number = re.sub(r"[\s  ']", "", match.group(0)).rstrip(".,")
+    if "," in number and "." in number:
+        # Whichever separator comes last is the decimal one.
+        if number.rfind(",") > number.rfind("."):
+            number = number.replace(".", "").replace(",", ".")
+        else:
+            number = number.replace(",", "")
+    elif "," in number:
+        head, _, tail = number.rpartition(",")
+        number = (
+            number.replace(",", "")
+            if len(tail) == 3
+            else f"{head.replace(',', '')}.{tail}"
+        )
+    elif number.count(".") > 1:
+        number = number.replace(".", "")
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+def parse_price(text: str) -> Optional[float]:
+    if FREE_PRICE.match(text):
+        return 0.0
+    price = parse_number(text)
+    return price if price is not None and price >= 0 else None
+
+
+def parse_currency(text: str) -> Optional[str]:
+    for match in CURRENCY_CODE.finditer(text):
+        if match.group(1) in ISO_4217_CODES:
+            return match.group(1)
+    match = PREFIXED_DOLLAR.search(text)
+    if match:
+        return DOLLAR_PREFIXES[match.group(1)]
+    for symbol, code in CURRENCY_SYMBOLS:
+        if symbol in text:
+            return code
+    return None
+
+
+def parse_count(text: str) -> Optional[int]:
+    match = COUNT.search(text)
+    if not match:
+        return None
+    digits = match.group(1).strip()
+    if not match.group(2) and GROUPED_COUNT.match(digits):
+        # Counts are whole, so "12.345" and "12 345" are thousands groups.
+        return int(re.sub(r"\D", "", digits))
+    number = parse_number(digits)
+    if number is None:
+        return None
+    multiplier = {"k": 1_000, "m": 1_000_000}.get((match.group(2) or "").lower(), 1)
+    return int(round(number * multiplier))
+
+
+def parse_rating(text: str, scale: float) -> Optional[float]:
+    match = RATING.search(text)
+    if not match:
+        return None
+    value = float(match.group(1).replace(",", "."))
+    if match.group(2) == "%":
+        scale = 100.0
+    elif match.group(3):
+        scale = float(match.group(3).replace(",", "."))
+    if scale <= 0 or value > scale:
+        return None
+    return round(value / scale * 5.0, 2)
+
+
+def parse_availability(text: str) -> Optional[str]:
+    normalized = text.strip().lower().replace(" ", "_")
+    if normalized in AVAILABILITY_VALUES:
+        return normalized
+    schema_value = normalized.rstrip("/").rsplit("/", 1)[-1].replace("_", "")
+    if schema_value in SCHEMA_ORG_AVAILABILITY:
+        return SCHEMA_ORG_AVAILABILITY[schema_value]
+    for pattern, status in AVAILABILITY_KEYWORDS:
+        if pattern.search(text):
+            return status
+    return None
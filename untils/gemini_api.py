@@ -1,12 +1,17 @@
 from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types as genai_types
 from common.app_settings import settings
-from typing import Annotated
+from enums import ModelTier
+from typing import Annotated, Optional
 from fastapi import Depends
+import httpx
 from tenacity import (
+    RetryCallState,
     retry,
     stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
+    wait_random_exponential,
+    retry_if_exception,
 )
 from google.api_core.exceptions import (
     ServiceUnavailable,
@@ -15,50 +20,219 @@ from google.api_core.exceptions import (
     ResourceExhausted,
     DeadlineExceeded,
 )
+from untils.prompts import estimate_tokens
+from untils.adaptive_limiter import get_adaptive_limiter
+from untils.context_cache import context_cache
+from untils.model_router import model_router
+from untils.rate_limiter import RateLimiter
 import re
+import time
+
+RETRYABLE_ERRORS = (
+    ServiceUnavailable,
+    InternalServerError,
+    Aborted,
+    ResourceExhausted,
+    DeadlineExceeded,
+    httpx.TimeoutException,
+    httpx.NetworkError,
+)
+
+OVERLOAD_ERRORS = (
+    ResourceExhausted,
+    ServiceUnavailable,
+    DeadlineExceeded,
+    httpx.TimeoutException,
+)
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    # google-genai raises its own APIError rather than the api_core exceptions.
+    if isinstance(error, genai_errors.APIError):
+        return error.code == 429 or (error.code or 0) >= 500
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+def retry_reason(error: BaseException) -> str:
+    if isinstance(error, genai_errors.APIError):
+        return f"HTTP {error.code}"
+    return type(error).__name__
+
+
+def overload_reason(error: BaseException) -> Optional[str]:
+    """Errors that mean Gemini wants fewer concurrent calls from us."""
+    if isinstance(error, genai_errors.APIError):
+        return f"HTTP {error.code}" if error.code in (429, 503) else None
+    if isinstance(error, OVERLOAD_ERRORS):
+        return type(error).__name__
+    return None
+
+
+STALE_CACHE_MESSAGE = re.compile(r"not found|expired|permission denied", re.IGNORECASE)
+
+
+def is_stale_cache_error(error: BaseException, cache_name: str) -> bool:
+    """A 400/403/404 saying the context cache expired or was deleted.
+
+    Other client errors, e.g. a bad prompt or schema, must surface as they are.
+    """
+    if not isinstance(error, genai_errors.APIError) or error.code not in (
+        400,
+        403,
+        404,
+    ):
+        return False
+    message = error.message or ""
+    about_cache = "cache" in message.lower() or cache_name in message
+    return about_cache and STALE_CACHE_MESSAGE.search(message) is not None
+
+
+def _record_retry(retry_state: RetryCallState) -> None:
+    gemini_api: "GeminiApi" = retry_state.args[0]
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    reason = retry_reason(error) if error else "unknown"
+    gemini_api.limiter.stats.record_retry(reason)
+    print(f"A retriable error occurred ({reason}); retrying Gemini call.")
 
 
 class GeminiApi:
+    """Process-wide Gemini client.
+
+    Every call goes through one RateLimiter, so concurrent scrapes, analyses
+    and summaries share the same requests/min, tokens/min and concurrency
+    limits. The concurrency limit halves on 429s and timeouts and climbs back
+    towards GEMINI_MAX_CONCURRENCY while calls are healthy. Retries back off
+    with full jitter and give their slot back while they wait, so a burst of
+    429s does not turn into a synchronized storm.
+    """
+
     def __init__(self):
-        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
-        self.model = settings.GEMINI_API_MODEL
+        self.model = model_router.model_for(ModelTier.STRONG)
+        self._client: Optional[genai.Client] = None
+        self.limiter = RateLimiter(
+            requests_per_minute=settings.GEMINI_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.GEMINI_TOKENS_PER_MINUTE,
+            concurrency=get_adaptive_limiter(
+                "gemini", settings.GEMINI_MAX_CONCURRENCY, overload_reason
+            ),
+        )
 
-    @retry(
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=1, min=4, max=20),
-        retry=retry_if_exception_type(
-            (
-                ServiceUnavailable,
-                InternalServerError,
-                Aborted,
-                ResourceExhausted,
-                DeadlineExceeded,
+    @property
+    def client(self) -> genai.Client:
+        if self._client is None:
+            self._client = genai.Client(
+                api_key=settings.GEMINI_API_KEY,
+                http_options=(
+                    genai_types.HttpOptions(base_url=settings.GEMINI_API_BASE_URL)
+                    if settings.GEMINI_API_BASE_URL
+                    else None
+                ),
             )
-        ),
-    )
-    async def generate_response(self, prompt: str) -> str | None:
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await context_cache.close(self._client)
+            await self._client.aio.aclose()
+            self._client = None
+
+    async def generate_response(
+        self,
+        prompt: str,
+        response_schema: Optional[dict] = None,
+        instructions: Optional[str] = None,
+        tier: ModelTier = ModelTier.STRONG,
+    ) -> str | None:
+        """Generate text, or JSON constrained to response_schema when given.
+
+        instructions is a static prompt prefix; it is served from Gemini's
+        context cache when possible and otherwise sent ahead of the prompt.
+        tier picks the model through the model router.
+        """
         try:
-            print("Attempting to generate response with async client...")
-            response = await self.client.aio.models.generate_content(
-                model=self.model, contents=prompt
+            return await self._generate_with_retries(
+                prompt, response_schema, instructions, tier
             )
-            print("Response generated successfully.")
-            return response.text
-        except (
-            ServiceUnavailable,
-            InternalServerError,
-            Aborted,
-            ResourceExhausted,
-            DeadlineExceeded,
-        ) as e:
-            print(f"A retriable error occurred: {e}. Tenacity will handle the retry.")
-            raise
         except Exception as e:
-            print(
-                f"FATAL: Could not get response from Gemini after multiple retries: {e}"
-            )
+            self.limiter.stats.failures += 1
+            if is_retryable_error(e):
+                raise
+            print(f"FATAL: Could not get response from Gemini: {e}")
             return None
 
+    @retry(
+        stop=stop_after_attempt(settings.GEMINI_MAX_ATTEMPTS),
+        wait=wait_random_exponential(multiplier=1, max=30),
+        retry=retry_if_exception(is_retryable_error),
+        before_sleep=_record_retry,
+        reraise=True,
+    )
+    async def _generate_with_retries(
+        self,
+        prompt: str,
+        response_schema: Optional[dict] = None,
+        instructions: Optional[str] = None,
+        tier: ModelTier = ModelTier.STRONG,
+    ) -> str | None:
+        model = model_router.model_for(tier)
+        cache_name = (
+            await context_cache.get_name(self.client, model, instructions)
+            if instructions
+            else None
+        )
+        async with self.limiter.slot(
+            estimate_tokens((instructions or "") + prompt)
+        ) as slot:
+            started = time.monotonic()
+            try:
+                try:
+                    response = await self._generate_content(
+                        model,
+                        prompt if cache_name else (instructions or "") + prompt,
+                        response_schema,
+                        cache_name,
+                    )
+                except genai_errors.APIError as e:
+                    if cache_name is None or not is_stale_cache_error(e, cache_name):
+                        raise
+                    # The cached content expired or was deleted behind our back.
+                    context_cache.invalidate(cache_name)
+                    response = await self._generate_content(
+                        model, (instructions or "") + prompt, response_schema, None
+                    )
+            except Exception:
+                model_router.record_call(tier, time.monotonic() - started, failed=True)
+                raise
+            usage = response.usage_metadata
+            model_router.record_call(
+                tier,
+                time.monotonic() - started,
+                prompt_tokens=(usage.prompt_token_count or 0) if usage else 0,
+                output_tokens=(usage.candidates_token_count or 0) if usage else 0,
+            )
+            context_cache.record_usage(usage)
+            if usage is not None and usage.total_token_count:
+                slot.record_usage(usage.total_token_count)
+        return response.text
+
+    async def _generate_content(
+        self,
+        model: str,
+        contents: str,
+        response_schema: Optional[dict],
+        cache_name: Optional[str],
+    ) -> genai_types.GenerateContentResponse:
+        config = None
+        if response_schema or cache_name:
+            config = genai_types.GenerateContentConfig(
+                response_mime_type="application/json" if response_schema else None,
+                response_json_schema=response_schema,
+                cached_content=cache_name,
+            )
+        return await self.client.aio.models.generate_content(
+            model=model, contents=contents, config=config
+        )
+
     def clean_json_markdown(self, text: str) -> str:
         pattern = r"```(?:json)?(.*?)```"
         match = re.search(pattern, text, re.DOTALL)
@@ -66,5 +240,26 @@ class GeminiApi:
             return match.group(1).strip()
         return text.strip()
 
+    def model_for_task(self, task: str) -> str:
+        return model_router.model_for_task(task)
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model,
+            "max_concurrency": settings.GEMINI_MAX_CONCURRENCY,
+            "concurrency_limit": int(self.limiter.concurrency.limit),
+            "requests_per_minute": settings.GEMINI_REQUESTS_PER_MINUTE,
+            "tokens_per_minute": settings.GEMINI_TOKENS_PER_MINUTE,
+            **self.limiter.stats.to_dict(),
+            "context_cache": context_cache.to_dict(),
+        }
+
+
+gemini_api = GeminiApi()
+
+
+def get_gemini_api() -> GeminiApi:
+    return gemini_api
+
 
-GeminiApiDependency = Annotated[GeminiApi, Depends(GeminiApi)]
+GeminiApiDependency = Annotated[GeminiApi, Depends(get_gemini_api)]
@@ -0,0 +1,265 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from common.app_settings import settings
+
+TRACKING_QUERY_PARAMS = {"gclid", "fbclid", "msclkid", "yclid", "ref", "ref_"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key not in TRACKING_QUERY_PARAMS and not key.startswith("utm_")
+        )
+    )
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+class CachedPage:
+    def __init__(self, url: str, raw_html: str, fetched_at: float, raw_hash: str):
+        self.url = url
+        self.raw_html = raw_html
+        self.fetched_at = fetched_at
+        self.raw_hash = raw_hash
+
+
+class HtmlCache:
+    """Compressed on-disk store of raw and cleaned page HTML.
+
+    Raw pages are stored once per content hash under objects/, cleaned
+    variants under the raw hash plus the cleaning engine, and index/ maps each
+    canonical URL to the raw hash it last resolved to. An index file's mtime
+    doubles as its last access time for LRU eviction.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: int, max_bytes: int, enabled: bool):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._objects_dir = self.directory / "objects"
+        self._index_dir = self.directory / "index"
+        self._total_bytes: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+        self.raw_hits = 0
+        self.raw_misses = 0
+        self.cleaned_hits = 0
+        self.cleaned_misses = 0
+        self.evictions = 0
+
+    async def get_page(self, url: str) -> Optional[CachedPage]:
+        if not self.enabled:
+            return None
+        page = await asyncio.to_thread(self._read_page, url, True)
+        if page is None:
+            self.raw_misses += 1
+        else:
+            self.raw_hits += 1
+        return page
+
+    async def put_page(self, url: str, raw_html: str) -> None:
+        if not self.enabled:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._write_page, url, raw_html)
+
+    async def get_cleaned(self, raw_html: str, engine: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        cleaned = await asyncio.to_thread(
+            self._read_object, self._cleaned_path(content_hash(raw_html), engine)
+        )
+        if cleaned is None:
+            self.cleaned_misses += 1
+        else:
+            self.cleaned_hits += 1
+        return cleaned
+
+    async def put_cleaned(self, raw_html: str, engine: str, cleaned_html: str) -> None:
+        if not self.enabled:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._write_cleaned, raw_html, engine, cleaned_html)
+
+    def iter_pages(self, include_expired: bool = True) -> Iterator[CachedPage]:
+        if not self._index_dir.exists():
+            return
+        for index_path in sorted(self._index_dir.glob("*.json")):
+            page = self._load_index_entry(index_path, include_expired)
+            if page is not None:
+                yield page
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "directory": str(self.directory),
+            "total_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "raw_hits": self.raw_hits,
+            "raw_misses": self.raw_misses,
+            "cleaned_hits": self.cleaned_hits,
+            "cleaned_misses": self.cleaned_misses,
+            "evictions": self.evictions,
+        }
+
+    def _index_path(self, url: str) -> Path:
+        return self._index_dir / f"{content_hash(canonical_url(url))}.json"
+
+    def _raw_path(self, raw_hash: str) -> Path:
+        return self._objects_dir / raw_hash[:2] / f"{raw_hash}.html.gz"
+
+    def _cleaned_path(self, raw_hash: str, engine: str) -> Path:
+        return self._objects_dir / raw_hash[:2] / f"{raw_hash}.{engine}.html.gz"
+
+    def _read_page(self, url: str, touch: bool) -> Optional[CachedPage]:
+        index_path = self._index_path(url)
+        page = self._load_index_entry(index_path, include_expired=False)
+        if page is not None and touch:
+            os.utime(index_path)
+        return page
+
+    def _load_index_entry(
+        self, index_path: Path, include_expired: bool
+    ) -> Optional[CachedPage]:
+        try:
+            entry = json.loads(index_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if not include_expired and time.time() - entry["fetched_at"] > self.ttl_seconds:
+            return None
+        raw_html = self._read_object(self._raw_path(entry["raw_hash"]))
+        if raw_html is None:
+            return None
+        return CachedPage(
+            entry["url"], raw_html, entry["fetched_at"], entry["raw_hash"]
+        )
+
+    def _write_page(self, url: str, raw_html: str) -> None:
+        raw_hash = content_hash(raw_html)
+        self._write_object(self._raw_path(raw_hash), raw_html)
+        index_path = self._index_path(url)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "url": canonical_url(url),
+                    "raw_hash": raw_hash,
+                    "fetched_at": time.time(),
+                }
+            )
+        )
+        os.replace(tmp_path, index_path)
+        self._enforce_budget()
+
+    def _write_cleaned(self, raw_html: str, engine: str, cleaned_html: str) -> None:
+        self._write_object(
+            self._cleaned_path(content_hash(raw_html), engine), cleaned_html
+        )
+        self._enforce_budget()
+
+    def _read_object(self, path: Path) -> Optional[str]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8", errors="surrogatepass") as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None
+
+    def _write_object(self, path: Path, text: str) -> None:
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        data = gzip.compress(text.encode("utf-8", errors="surrogatepass"), 6)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        if self._total_bytes is not None:
+            self._total_bytes += len(data)
+
+    def _enforce_budget(self) -> None:
+        if self._total_bytes is None:
+            self._total_bytes = self._scan_total_bytes()
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _scan_total_bytes(self) -> int:
+        return sum(size for _, size in self._iter_objects())
+
+    def _iter_objects(self) -> Iterator[Tuple[Path, int]]:
+        if not self._objects_dir.exists():
+            return
+        for path in self._objects_dir.rglob("*.gz"):
+            try:
+                yield path, path.stat().st_size
+            except OSError:
+                continue
+
+    def _evict(self) -> None:
+        now = time.time()
+        entries = []
+        for index_path in self._index_dir.glob("*.json"):
+            try:
+                entry = json.loads(index_path.read_text())
+                entries.append((index_path.stat().st_mtime, index_path, entry))
+            except (OSError, ValueError):
+                index_path.unlink(missing_ok=True)
+
+        objects: Dict[str, List[Tuple[Path, int]]] = {}
+        for path, size in self._iter_objects():
+            objects.setdefault(path.name.split(".", 1)[0], []).append((path, size))
+        references = Counter(entry["raw_hash"] for _, _, entry in entries)
+
+        for raw_hash in set(objects) - set(references):
+            self._remove_objects(objects.pop(raw_hash))
+        total = sum(size for files in objects.values() for _, size in files)
+
+        # Expired entries go first, then the least recently used ones, until the
+        # store is back under 80% of its budget.
+        entries.sort(key=lambda e: (now - e[2]["fetched_at"] <= self.ttl_seconds, e[0]))
+        target = int(self.max_bytes * 0.8)
+        for _, index_path, entry in entries:
+            if total <= target:
+                break
+            index_path.unlink(missing_ok=True)
+            self.evictions += 1
+            raw_hash = entry["raw_hash"]
+            references[raw_hash] -= 1
+            if references[raw_hash] <= 0 and raw_hash in objects:
+                total -= self._remove_objects(objects.pop(raw_hash))
+
+        self._total_bytes = total
+
+    def _remove_objects(self, files: List[Tuple[Path, int]]) -> int:
+        for path, _ in files:
+            path.unlink(missing_ok=True)
+        return sum(size for _, size in files)
+
+
+html_cache = HtmlCache(
+    directory=settings.HTML_CACHE_DIR,
+    ttl_seconds=settings.HTML_CACHE_TTL_SECONDS,
+    max_bytes=settings.HTML_CACHE_MAX_BYTES,
+    enabled=settings.HTML_CACHE_ENABLED,
+)
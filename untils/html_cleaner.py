@@ -0,0 +1,136 @@
+from typing import Callable, Dict, Iterable, Tuple
+
+from bs4 import BeautifulSoup, Tag
+from lxml import etree, html as lxml_html
+
+TRASH_TAGS = ["script", "style", "header", "footer", "aside", "form"]
+PAGINATION_NAV_KEYWORDS = ["pagination", "pager"]
+PAGINATION_LINK_KEYWORDS = [
+    "next",
+    "previous",
+    "back",
+    "last",
+    "first",
+    ">",
+    "»",
+    "<",
+    "«",
+]
+PAGINATION_ARIA_KEYWORDS = ["next page", "previous page"]
+
+
+def is_script_link(href: str) -> bool:
+    # Store buttons such as Steam's "Add to Cart" link to javascript: calls,
+    # which lead nowhere without the page's scripts.
+    return href.strip().lower().startswith("javascript:")
+
+
+def is_pagination_nav(nav_attributes: str, links: Iterable[Tuple[str, str]]) -> bool:
+    if any(keyword in nav_attributes.lower() for keyword in PAGINATION_NAV_KEYWORDS):
+        return True
+
+    links = list(links)
+    if not 0 < len(links) < 20:
+        return False
+    for link_text, link_aria_label in links:
+        link_text = link_text.lower()
+        link_aria_label = link_aria_label.lower()
+        if (
+            any(keyword in link_text for keyword in PAGINATION_LINK_KEYWORDS)
+            or any(keyword in link_aria_label for keyword in PAGINATION_ARIA_KEYWORDS)
+            or link_text.isdigit()
+        ):
+            return True
+    return False
+
+
+def clean_html_bs4(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+
+    for tag in soup.find_all(TRASH_TAGS):
+        tag.decompose()
+
+    for nav in soup.find_all("nav"):
+        if not isinstance(nav, Tag):
+            continue
+
+        nav_attributes = f"{nav.get('class', '')} {nav.get('id', '')} {nav.get('aria-label', '')} {nav.get('role', '')}"
+        links = []
+        for link in nav.find_all("a"):
+            if not isinstance(link, Tag):
+                continue
+            aria_label_value = link.get("aria-label", "")
+            links.append(
+                (
+                    link.get_text(strip=True),
+                    " ".join(aria_label_value)
+                    if isinstance(aria_label_value, list)
+                    else str(aria_label_value),
+                )
+            )
+        if not is_pagination_nav(nav_attributes, links):
+            nav.decompose()
+
+    for link in soup.find_all("a", href=True):
+        if isinstance(link, Tag) and is_script_link(str(link["href"])):
+            del link["href"]
+
+    return str(soup)
+
+
+def clean_html_lxml(html: str) -> str:
+    if not html.strip():
+        return ""
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        # Empty documents and unicode input with an XML encoding declaration
+        # are rejected by lxml; the pure-Python parser copes with both.
+        return clean_html_bs4(html)
+
+    for element in root.xpath(" | ".join(f"//{tag}" for tag in TRASH_TAGS)):
+        element.drop_tree()
+
+    for nav in root.iter("nav"):
+        nav_attributes = " ".join(
+            nav.get(attribute, "")
+            for attribute in ("class", "id", "aria-label", "role")
+        )
+        links = [
+            (
+                "".join(text.strip() for text in link.itertext()),
+                link.get("aria-label", ""),
+            )
+            for link in nav.iter("a")
+        ]
+        if not is_pagination_nav(nav_attributes, links):
+            # Mark rather than drop while iterating; dropped below.
+            nav.set("data-gpa-drop", "1")
+
+    for nav in root.xpath("//nav[@data-gpa-drop]"):
+        nav.drop_tree()
+
+    for link in root.xpath("//a[@href]"):
+        if is_script_link(link.get("href")):
+            del link.attrib["href"]
+
+    return lxml_html.tostring(root, encoding="unicode")
+
+
+CLEANING_ENGINES: Dict[str, Callable[[str], str]] = {
+    "bs4": clean_html_bs4,
+    "lxml": clean_html_lxml,
+}
+
+
+def clean_html(html: str, engine: str) -> str:
+    # Runs in CPU pool workers, so the engine comes from the caller rather
+    # than from app settings.
+    try:
+        cleaner = CLEANING_ENGINES[engine]
+    except KeyError:
+        raise ValueError(
+            f"Unknown HTML cleaning engine '{engine}'. "
+            f"Available engines: {', '.join(CLEANING_ENGINES)}"
+        )
+    return cleaner(html)
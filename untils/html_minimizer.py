@@ -0,0 +1,219 @@
+import re
+from typing import List, Optional, Tuple
+
+from lxml import etree, html as lxml_html
+
+from untils.prompts import estimate_tokens
+
+SKIPPED_TAGS = {
+    "head",
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "canvas",
+    "video",
+    "audio",
+}
+BLOCK_TAGS = {
+    "address",
+    "article",
+    "blockquote",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "figcaption",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "li",
+    "main",
+    "nav",
+    "ol",
+    "p",
+    "section",
+    "table",
+    "tbody",
+    "thead",
+    "tr",
+    "ul",
+}
+CELL_TAGS = {"td", "th"}
+# Attributes whose values carry the facts we extract even when the text does not,
+# e.g. <span data-price="19.99"> or <meta itemprop="ratingValue" content="4.5">.
+VALUE_ATTRIBUTE = re.compile(
+    r"price|currency|rating|score|review|availability|release", re.IGNORECASE
+)
+IMPORTANT_LINE = re.compile(
+    r"[$€£¥₴₽]|\b(?:USD|EUR|GBP|UAH|PLN|JPY)\b|\d+(?:[.,]\d+)?\s*(?:/\s*(?:5|10|100)\b|%)"
+    r"|price|rating|review|score|free|discount|sale|available|pre-?order|coming soon"
+    r"|release|developer|publisher|genre|price:|^#",
+    re.IGNORECASE,
+)
+
+
+def minimize_html(html: str, token_budget: Optional[int] = None) -> str:
+    """Render cleaned HTML as compact text for LLM prompts.
+
+    The document title is the first line, blocks become lines, headings keep
+    a markdown "#" prefix, list items "- ", table cells are joined with " | "
+    and links are written as [text](href); a link that wraps blocks gets a
+    line of its own with all of its text.
+    Attributes are dropped except for short values of price, rating and
+    availability attributes. Repeated lines are emitted once. With a token
+    budget, lines that look like prices, ratings or other game facts are kept
+    first and the remaining lines fill what is left in document order.
+    """
+    if not html.strip():
+        return ""
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return html
+
+    lines = _render_lines(root)
+    if token_budget is not None:
+        lines = fit_lines_to_budget(lines, token_budget)
+    return "\n".join(lines)
+
+
+def _render_lines(root) -> List[str]:
+    lines: List[str] = []
+    seen = set()
+    current: List[str] = []
+    prefix = [""]
+    link_starts: List[Tuple[int, etree._Element]] = []
+
+    def flush() -> None:
+        line = " ".join(" ".join(current).split())
+        current.clear()
+        if line and line not in seen:
+            seen.add(line)
+            lines.append(f"{prefix[0]}{line}")
+        prefix[0] = ""
+
+    walker = etree.iterwalk(root, events=("start", "end"))
+    for event, element in walker:
+        tag = element.tag if isinstance(element.tag, str) else None
+        if event == "start":
+            if tag == "head":
+                current.append(element.findtext("title") or "")
+                flush()
+            if tag is None or tag in SKIPPED_TAGS:
+                walker.skip_subtree()
+                continue
+            if tag in BLOCK_TAGS:
+                flush()
+                if tag[0] == "h" and tag[1:].isdigit():
+                    prefix[0] = "#" * int(tag[1:]) + " "
+                elif tag == "li":
+                    prefix[0] = "- "
+            elif tag in CELL_TAGS and current:
+                current.append("|")
+            elif tag == "a" and _has_block(element):
+                # A card link wrapping blocks goes on a line of its own, with
+                # all of its text, instead of one line per block.
+                if "".join(current).strip():
+                    flush()
+                current.append(_link(_inline_text(element), element))
+                flush()
+                walker.skip_subtree()
+                continue
+            elif tag == "a":
+                link_starts.append((len(current), element))
+            elif tag == "img" and element.get("alt"):
+                current.append(f"[image: {element.get('alt').strip()}]")
+
+            current.extend(_value_attributes(element))
+            if element.text:
+                current.append(element.text)
+            continue
+
+        if tag == "a" and link_starts and link_starts[-1][1] is element:
+            start = link_starts.pop()[0]
+            current[start:] = [
+                _link(" ".join(" ".join(current[start:]).split()), element)
+            ]
+        elif tag in BLOCK_TAGS:
+            flush()
+        if element.tail:
+            current.append(element.tail)
+    flush()
+    return lines
+
+
+def _has_block(element) -> bool:
+    return any(
+        child.tag in BLOCK_TAGS
+        for child in element.iterdescendants()
+        if isinstance(child.tag, str)
+    )
+
+
+def _link(text: str, element) -> str:
+    href = (element.get("href") or "").strip()
+    if href and not href.startswith(("#", "javascript:")):
+        return f"[{text}]({href})"
+    return text
+
+
+def _value_attributes(element) -> List[str]:
+    values = [
+        f"({name}: {value.strip()})"
+        for name, value in element.attrib.items()
+        if name not in ("itemprop", "content")
+        and VALUE_ATTRIBUTE.search(name)
+        and 0 < len(value) <= 40
+    ]
+    if element.get("itemprop") and element.get("content"):
+        values.append(f"({element.get('itemprop')}: {element.get('content').strip()})")
+    return values
+
+
+def _inline_text(root) -> str:
+    parts: List[str] = []
+    walker = etree.iterwalk(root, events=("start", "end"))
+    for event, element in walker:
+        tag = element.tag if isinstance(element.tag, str) else None
+        if event == "start":
+            if tag is None or tag in SKIPPED_TAGS:
+                walker.skip_subtree()
+                continue
+            if tag == "img" and element.get("alt"):
+                parts.append(f"[image: {element.get('alt').strip()}]")
+            parts.extend(_value_attributes(element))
+            if element.text:
+                parts.append(element.text)
+        elif element is not root and element.tail:
+            parts.append(element.tail)
+    return " ".join(" ".join(parts).split())
+
+
+def fit_lines_to_budget(lines: List[str], token_budget: int) -> List[str]:
+    costs = [estimate_tokens(line) for line in lines]
+    if sum(costs) <= token_budget:
+        return lines
+
+    keep = [False] * len(lines)
+    remaining = token_budget
+    for important in (True, False):
+        for index, line in enumerate(lines):
+            if keep[index] or bool(IMPORTANT_LINE.search(line)) != important:
+                continue
+            if costs[index] <= remaining:
+                keep[index] = True
+                remaining -= costs[index]
+    kept = [line for index, line in enumerate(lines) if keep[index]]
+    omitted = len(lines) - len(kept)
+    if omitted:
+        kept.append(f"[{omitted} lines omitted to fit the token budget]")
+    return kept
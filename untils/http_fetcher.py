@@ -0,0 +1,170 @@
+import re
+from typing import Dict, Optional
+
+import httpx
+from lxml import etree, html as lxml_html
+
+from common.app_settings import settings
+from enums import FetchTier
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+BLOCKED_STATUS_CODES = {401, 403, 407, 429, 503}
+THROTTLED_STATUS_CODES = (429, 503)
+BLOCK_PAGE_MARKERS = re.compile(
+    r"captcha|cf-challenge|just a moment\.\.\.|access denied|are you a robot"
+    r"|unusual traffic|request blocked|attention required",
+    re.IGNORECASE,
+)
+AGE_GATE_MARKERS = re.compile(
+    r"age-gate|age_gate|agegate|agecheck|age-verification|enter your (date of )?birth",
+    re.IGNORECASE,
+)
+JS_SHELL_MARKERS = re.compile(
+    r"enable javascript|javascript is required|requires javascript", re.IGNORECASE
+)
+MIN_VISIBLE_TEXT_LENGTH = 500
+
+
+class FetchThrottledError(Exception):
+    """The site answered 429 or 503: back off and retry on the same tier."""
+
+    def __init__(self, url: str, status_code: int):
+        super().__init__(f"HTTP {status_code} from {url}")
+        self.url = url
+        self.status_code = status_code
+
+
+def detect_browser_requirement(status_code: int, html: str) -> Optional[str]:
+    if status_code in BLOCKED_STATUS_CODES:
+        return f"blocked (HTTP {status_code})"
+    if status_code >= 400:
+        return f"HTTP {status_code}"
+    if BLOCK_PAGE_MARKERS.search(html[:20000]):
+        return "block page"
+    if AGE_GATE_MARKERS.search(html):
+        return "age gate"
+
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return "unparseable document"
+    for element in root.xpath("//script | //style | //noscript | //template"):
+        if element.tag == "noscript" and JS_SHELL_MARKERS.search(
+            element.text_content()
+        ):
+            return "javascript shell"
+        element.drop_tree()
+    visible_text = " ".join(root.text_content().split())
+    if len(visible_text) < MIN_VISIBLE_TEXT_LENGTH:
+        return "javascript shell"
+    return None
+
+
+class HttpFetcher:
+    def __init__(self, timeout: float, max_connections: int):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                follow_redirects=True,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+
+    async def stop(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, url: str) -> httpx.Response:
+        if self._client is None:
+            self.start()
+        assert self._client is not None
+        return await self._client.get(url)
+
+    def stream(self, url: str):
+        if self._client is None:
+            self.start()
+        assert self._client is not None
+        return self._client.stream("GET", url)
+
+
+class PlatformFetchTier:
+    def __init__(self, tier: Optional[FetchTier]):
+        self.tier = tier
+        self.http_successes = 0
+        self.http_escalations = 0
+        self.consecutive_escalations = 0
+        self.browser_fetches = 0
+        self.browser_fetches_since_probe = 0
+        self.escalation_reasons: Dict[str, int] = {}
+
+    def should_try_http(self) -> bool:
+        if not settings.HTTP_FETCH_ENABLED:
+            return False
+        if self.tier != FetchTier.BROWSER:
+            return True
+        # Re-probe now and then in case the site started rendering server-side.
+        return self.browser_fetches_since_probe >= settings.FETCH_TIER_REPROBE_EVERY
+
+    def record_http_success(self) -> None:
+        self.browser_fetches_since_probe = 0
+        self.http_successes += 1
+        self.consecutive_escalations = 0
+        self.tier = FetchTier.HTTP
+
+    def record_escalation(self, reason: str) -> None:
+        self.browser_fetches_since_probe = 0
+        self.http_escalations += 1
+        self.consecutive_escalations += 1
+        self.escalation_reasons[reason] = self.escalation_reasons.get(reason, 0) + 1
+        if self.consecutive_escalations >= settings.FETCH_TIER_ESCALATIONS_TO_PIN:
+            self.tier = FetchTier.BROWSER
+
+    def record_browser_fetch(self) -> None:
+        self.browser_fetches += 1
+        if self.tier == FetchTier.BROWSER:
+            self.browser_fetches_since_probe += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "tier": self.tier.value if self.tier else None,
+            "http_successes": self.http_successes,
+            "http_escalations": self.http_escalations,
+            "browser_fetches": self.browser_fetches,
+            "escalation_reasons": dict(self.escalation_reasons),
+        }
+
+
+fetch_tiers: Dict[str, PlatformFetchTier] = {}
+
+
+def get_platform_fetch_tier(
+    platform_key: str, stored_tier: Optional[str] = None
+) -> PlatformFetchTier:
+    state = fetch_tiers.get(platform_key)
+    if state is None:
+        state = PlatformFetchTier(FetchTier(stored_tier) if stored_tier else None)
+        fetch_tiers[platform_key] = state
+    return state
+
+
+http_fetcher = HttpFetcher(
+    timeout=settings.HTTP_FETCH_TIMEOUT_SECONDS,
+    max_connections=settings.HTTP_FETCH_MAX_CONNECTIONS,
+)
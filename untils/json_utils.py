@@ -0,0 +1,106 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import from_json
+
+M = TypeVar("M", bound=BaseModel)
+
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+llm_parse_stats: Dict[str, Dict[str, int]] = {}
+
+
+def strip_json_markdown(text: str) -> str:
+    pattern = r"```(?:json)?(.*?)```"
+    match = re.search(pattern, text, re.DOTALL)
+    if match:
+        return match.group(1).strip()
+    return text.strip()
+
+
+def clean_json_value(obj):
+    if isinstance(obj, dict):
+        return {k: clean_json_value(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [clean_json_value(v) for v in obj]
+    elif isinstance(obj, datetime):
+        return obj.isoformat()
+    return obj
+
+
+def repair_json(text: str) -> Any:
+    """Parse near-valid JSON: fenced, wrapped in prose, with trailing commas or
+    cut off by the output token limit."""
+    text = strip_json_markdown(text)
+    starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+    if not starts:
+        raise ValueError("No JSON value in the response.")
+    text = TRAILING_COMMA.sub(r"\1", text[min(starts) :])
+    end = max(text.rfind("}"), text.rfind("]"))
+    candidates = [text[: end + 1], text] if end >= 0 else [text]
+    for candidate in candidates:
+        try:
+            # allow_partial closes strings, arrays and objects left open.
+            return from_json(candidate, allow_partial="trailing-strings")
+        except ValueError:
+            continue
+    raise ValueError("The response is not repairable JSON.")
+
+
+def validate_leniently(model: Type[M], data: Any) -> M:
+    """Validate, resetting the top-level fields that fail to their defaults."""
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object, got {type(data).__name__}.")
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        invalid = {error["loc"][0] for error in e.errors() if error["loc"]}
+        return model.model_validate(
+            {key: value for key, value in data.items() if key not in invalid}
+        )
+
+
+def parse_model_json(text: str, model: Type[M]) -> Tuple[dict, bool]:
+    """Parse and validate an LLM answer in one pass, repairing it if that fails.
+
+    Returns the validated data and whether it needed the repair pass.
+    """
+    try:
+        return model.model_validate_json(text).model_dump(mode="json"), False
+    except ValidationError:
+        pass
+    return validate_leniently(model, repair_json(text)).model_dump(mode="json"), True
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[M]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def parse_model_list_json(text: str, model: Type[M]) -> Tuple[List[dict], bool]:
+    """Like parse_model_json for a JSON array; one bad item does not sink the rest."""
+    try:
+        items = _list_adapter(model).validate_json(text)
+        return [item.model_dump(mode="json") for item in items], False
+    except ValidationError:
+        pass
+    data = repair_json(text)
+    if not isinstance(data, list):
+        raise ValueError(f"Expected a JSON array, got {type(data).__name__}.")
+    items = []
+    for item in data:
+        try:
+            items.append(validate_leniently(model, item).model_dump(mode="json"))
+        except ValueError:
+            continue
+    return items, True
+
+
+def record_llm_parse(prompt_name: str, outcome: str) -> None:
+    stats = llm_parse_stats.setdefault(
+        prompt_name, {"parsed": 0, "repaired": 0, "failed": 0}
+    )
+    stats[outcome] += 1
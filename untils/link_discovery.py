@@ -0,0 +1,139 @@
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from lxml import etree, html as lxml_html
+
+MIN_URLS_TO_LEARN = 3
+MIN_PATTERN_COVERAGE = 0.7
+NUMERIC_SEGMENT = re.compile(r"^\d+$")
+
+
+def _path_segments(url: str) -> List[str]:
+    return [segment for segment in urlsplit(url).path.split("/") if segment]
+
+
+def learn_url_pattern(game_urls: Sequence[str], listing_url: str) -> Optional[str]:
+    """Generalize game detail URLs into a regex over host and path.
+
+    URLs are grouped by host and number of path segments. In the largest group,
+    segments that never change stay literal and the others become \\d+ or a
+    single-segment wildcard. A pattern is only returned when it covers most of
+    the input and does not match the listing page itself.
+    """
+    absolute = [urljoin(listing_url, url) for url in game_urls if url]
+    if len(absolute) < MIN_URLS_TO_LEARN:
+        return None
+
+    groups = Counter(
+        (urlsplit(url).hostname or "", len(_path_segments(url))) for url in absolute
+    )
+    (host, length), _ = groups.most_common(1)[0]
+    if length == 0:
+        return None
+    members = [
+        _path_segments(url)
+        for url in absolute
+        if (urlsplit(url).hostname or "", len(_path_segments(url))) == (host, length)
+    ]
+
+    parts = []
+    for position in range(length):
+        value, count = Counter(segments[position] for segments in members).most_common(
+            1
+        )[0]
+        if count / len(members) >= MIN_PATTERN_COVERAGE:
+            # A dominant value is a section prefix like /app or /p; the LLM
+            # answer may still contain a few outliers such as /bundle links.
+            parts.append(re.escape(value))
+            members = [segments for segments in members if segments[position] == value]
+        elif all(NUMERIC_SEGMENT.match(segments[position]) for segments in members):
+            parts.append(r"\d+")
+        else:
+            parts.append(r"[^/]+")
+    if not any(part in (r"\d+", r"[^/]+") for part in parts):
+        return None
+
+    pattern = rf"^https?://{re.escape(host)}/{'/'.join(parts)}/?$"
+    compiled = re.compile(pattern)
+    coverage = sum(1 for url in absolute if compiled.match(strip_query(url)))
+    if coverage / len(absolute) < MIN_PATTERN_COVERAGE:
+        return None
+    if compiled.match(strip_query(listing_url)):
+        return None
+    return pattern
+
+
+def strip_query(url: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def match_game_links(html: str, base_url: str, pattern: str) -> List[str]:
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return []
+    compiled = re.compile(pattern)
+    links: List[str] = []
+    seen = set()
+    for href in root.xpath("//a/@href"):
+        url = urljoin(base_url, href.strip())
+        if compiled.match(strip_query(url)):
+            # Tracking parameters differ per anchor; the query is not part of
+            # the game's identity on the stores we scrape.
+            url = strip_query(url)
+            if url not in seen:
+                seen.add(url)
+                links.append(url)
+    return links
+
+
+class PlatformLinkPattern:
+    def __init__(self, pattern: Optional[str]):
+        self.pattern = pattern
+        self.heuristic_pages = 0
+        self.llm_pages = 0
+        self.pattern_misses = 0
+        self.patterns_learned = 0
+        self.links_matched = 0
+
+    def learn(self, game_urls: Sequence[str], listing_url: str) -> None:
+        self.llm_pages += 1
+        pattern = learn_url_pattern(game_urls, listing_url)
+        if pattern and pattern != self.pattern:
+            self.pattern = pattern
+            self.patterns_learned += 1
+
+    def record_match(self, link_count: int) -> None:
+        self.heuristic_pages += 1
+        self.links_matched += link_count
+
+    def record_miss(self) -> None:
+        self.pattern_misses += 1
+
+    def to_dict(self) -> dict:
+        pages = self.heuristic_pages + self.llm_pages
+        return {
+            "pattern": self.pattern,
+            "heuristic_pages": self.heuristic_pages,
+            "llm_pages": self.llm_pages,
+            "heuristic_rate": round(self.heuristic_pages / pages, 3) if pages else 0.0,
+            "pattern_misses": self.pattern_misses,
+            "patterns_learned": self.patterns_learned,
+            "links_matched": self.links_matched,
+        }
+
+
+link_patterns: Dict[str, PlatformLinkPattern] = {}
+
+
+def get_platform_link_pattern(
+    platform_key: str, stored_pattern: Optional[str] = None
+) -> PlatformLinkPattern:
+    state = link_patterns.get(platform_key)
+    if state is None:
+        state = PlatformLinkPattern(stored_pattern)
+        link_patterns[platform_key] = state
+    return state
@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from common.app_settings import settings
+from untils.prompts import PROMPTS, PromptTemplate
+
+
+class PromptCacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def to_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class LlmCache:
+    """Persistent cache of parsed LLM responses.
+
+    Entries are keyed by the hash of the page content sent to the model, the
+    prompt fingerprint (name, version and template hash), the model name and
+    any prompt parameters that change the answer. Editing a prompt therefore
+    never serves answers produced by the old one; rows left behind by old
+    prompt versions are purged on start.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, enabled: bool):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self.prompt_stats: Dict[str, PromptCacheStats] = {}
+
+    def start(self) -> None:
+        if not self.enabled or self._connection is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                cache_key TEXT PRIMARY KEY,
+                prompt_name TEXT NOT NULL,
+                prompt_fingerprint TEXT NOT NULL,
+                model TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                response_json TEXT NOT NULL
+            )
+            """
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_responses_prompt "
+            "ON llm_responses (prompt_name, prompt_fingerprint)"
+        )
+        self._connection = connection
+        purged = self.purge_stale_prompts()
+        if purged:
+            print(f"LLM cache: purged {purged} entries from outdated prompt versions.")
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def make_key(
+        self, prompt: PromptTemplate, model: str, content: str, *params: Any
+    ) -> str:
+        digest = hashlib.sha256()
+        for part in (prompt.fingerprint, model, json.dumps(params), content):
+            digest.update(part.encode("utf-8", errors="surrogatepass"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def get(self, prompt: PromptTemplate, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = await asyncio.to_thread(self._get, key)
+        stats = self.prompt_stats.setdefault(prompt.name, PromptCacheStats())
+        if value is None:
+            stats.misses += 1
+        else:
+            stats.hits += 1
+        return value
+
+    async def put(
+        self, prompt: PromptTemplate, model: str, key: str, value: Any
+    ) -> None:
+        if not self.enabled:
+            return
+        await asyncio.to_thread(self._put, prompt, model, key, json.dumps(value))
+        self.prompt_stats.setdefault(prompt.name, PromptCacheStats()).stores += 1
+
+    def invalidate(self, prompt_name: Optional[str] = None) -> int:
+        connection = self._get_connection()
+        if connection is None:
+            return 0
+        with self._lock, connection:
+            if prompt_name is None:
+                cursor = connection.execute("DELETE FROM llm_responses")
+            else:
+                cursor = connection.execute(
+                    "DELETE FROM llm_responses WHERE prompt_name = ?", (prompt_name,)
+                )
+        return cursor.rowcount
+
+    def purge_stale_prompts(self) -> int:
+        connection = self._get_connection()
+        if connection is None:
+            return 0
+        deleted = 0
+        with self._lock, connection:
+            for prompt in PROMPTS.values():
+                deleted += connection.execute(
+                    "DELETE FROM llm_responses "
+                    "WHERE prompt_name = ? AND prompt_fingerprint != ?",
+                    (prompt.name, prompt.fingerprint),
+                ).rowcount
+        return deleted
+
+    def stats(self) -> dict:
+        entries: Dict[str, int] = {}
+        connection = self._get_connection()
+        if connection is not None:
+            with self._lock:
+                entries = dict(
+                    connection.execute(
+                        "SELECT prompt_name, COUNT(*) FROM llm_responses "
+                        "GROUP BY prompt_name"
+                    ).fetchall()
+                )
+        return {
+            "enabled": self.enabled,
+            "path": str(self.path),
+            "ttl_seconds": self.ttl_seconds,
+            "prompts": {
+                name: {
+                    "fingerprint": prompt.fingerprint,
+                    "entries": entries.get(name, 0),
+                    **self.prompt_stats.get(name, PromptCacheStats()).to_dict(),
+                }
+                for name, prompt in PROMPTS.items()
+            },
+        }
+
+    def _get_connection(self) -> Optional[sqlite3.Connection]:
+        if self._connection is None:
+            with self._start_lock:
+                self.start()
+        return self._connection
+
+    def _get(self, key: str) -> Optional[Any]:
+        connection = self._get_connection()
+        if connection is None:
+            return None
+        with self._lock:
+            row = connection.execute(
+                "SELECT created_at, response_json FROM llm_responses "
+                "WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+        if row is None or time.time() - row[0] > self.ttl_seconds:
+            return None
+        return json.loads(row[1])
+
+    def _put(
+        self, prompt: PromptTemplate, model: str, key: str, response_json: str
+    ) -> None:
+        connection = self._get_connection()
+        if connection is None:
+            return
+        with self._lock, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(cache_key, prompt_name, prompt_fingerprint, model, created_at, "
+                "response_json) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    prompt.name,
+                    prompt.fingerprint,
+                    model,
+                    time.time(),
+                    response_json,
+                ),
+            )
+
+
+llm_cache = LlmCache(
+    path=settings.LLM_CACHE_PATH,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    enabled=settings.LLM_CACHE_ENABLED,
+)
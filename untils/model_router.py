@@ -0,0 +1,114 @@
+from typing import Dict, Optional
+
+from common.app_settings import settings
+from enums import ModelTier
+
+# Prompts not listed here, such as summaries and analyses, use the strong tier.
+TASK_TIERS: Dict[str, ModelTier] = {
+    "game_links": ModelTier.FAST,
+    "game_details": ModelTier.FAST,
+    "game_details_batch": ModelTier.FAST,
+}
+
+
+class TierStats:
+    def __init__(self, model: str):
+        self.model = model
+        self.calls = 0
+        self.failures = 0
+        self.latency_seconds = 0.0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.escalations = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "model": self.model,
+            "calls": self.calls,
+            "failures": self.failures,
+            "avg_latency_ms": (
+                round(self.latency_seconds / self.calls * 1000, 1)
+                if self.calls
+                else 0.0
+            ),
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "escalations": self.escalations,
+            "escalation_rate": (
+                round(self.escalations / self.calls, 3) if self.calls else 0.0
+            ),
+        }
+
+
+class ModelRouter:
+    """Picks the Gemini model for each prompt by tier.
+
+    Link harvesting and detail extraction start on the fast model. When its
+    answer fails validation the caller escalates to the strong model, which is
+    also used for everything without a route. With no GEMINI_FAST_MODEL set
+    both tiers are the same model and nothing is escalated.
+    """
+
+    def __init__(self, fast_model: str, strong_model: str):
+        self.models = {ModelTier.FAST: fast_model, ModelTier.STRONG: strong_model}
+        self.stats = {tier: TierStats(model) for tier, model in self.models.items()}
+        self.escalations_by_task: Dict[str, Dict[str, int]] = {}
+
+    def tier_for(self, task: str) -> ModelTier:
+        return TASK_TIERS.get(task, ModelTier.STRONG)
+
+    def model_for(self, tier: ModelTier) -> str:
+        return self.models[tier]
+
+    def model_for_task(self, task: str) -> str:
+        return self.model_for(self.tier_for(task))
+
+    def escalation_for(self, tier: ModelTier) -> Optional[ModelTier]:
+        if (
+            tier == ModelTier.FAST
+            and self.models[ModelTier.FAST] != self.models[ModelTier.STRONG]
+        ):
+            return ModelTier.STRONG
+        return None
+
+    def record_call(
+        self,
+        tier: ModelTier,
+        latency: float,
+        prompt_tokens: int = 0,
+        output_tokens: int = 0,
+        failed: bool = False,
+    ) -> None:
+        stats = self.stats[tier]
+        stats.calls += 1
+        stats.latency_seconds += latency
+        stats.prompt_tokens += prompt_tokens
+        stats.output_tokens += output_tokens
+        if failed:
+            stats.failures += 1
+
+    def record_escalation(self, task: str, tier: ModelTier, reason: str) -> None:
+        self.stats[tier].escalations += 1
+        reasons = self.escalations_by_task.setdefault(task, {})
+        reasons[reason] = reasons.get(reason, 0) + 1
+        print(f"Escalating {task} from the {tier.value} model: {reason}")
+
+    def to_dict(self) -> dict:
+        return {
+            "routes": {task: tier.value for task, tier in TASK_TIERS.items()},
+            "tiers": {
+                tier.value: stats.to_dict() for tier, stats in self.stats.items()
+            },
+            "escalations_by_task": {
+                task: dict(reasons)
+                for task, reasons in self.escalations_by_task.items()
+            },
+        }
+
+
+model_router = ModelRouter(
+    fast_model=settings.GEMINI_FAST_MODEL
+    or settings.GEMINI_STRONG_MODEL
+    or settings.GEMINI_API_MODEL,
+    strong_model=settings.GEMINI_STRONG_MODEL or settings.GEMINI_API_MODEL,
+)
@@ -0,0 +1,133 @@
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from schemas import PaginationStrategy
+
+
+def infer_pagination_strategy(
+    selector: str, current_url: str, next_url: Optional[str], on_first_page: bool
+) -> PaginationStrategy:
+    """Work out how a platform pages from one step through its listing.
+
+    When the next page differs from the current one only in a numeric query
+    parameter, the listing is addressable by URL and later pages can be opened
+    directly. A changed non-numeric parameter is a cursor, so its href has to
+    be followed page by page. Anything else keeps clicking the selector.
+    """
+    if not next_url:
+        return PaginationStrategy(kind="click", selector=selector)
+    current, following = urlsplit(current_url), urlsplit(next_url)
+    if (current.netloc, current.path.rstrip("/")) != (
+        following.netloc,
+        following.path.rstrip("/"),
+    ):
+        return PaginationStrategy(kind="click", selector=selector)
+
+    current_params = dict(parse_qsl(current.query, keep_blank_values=True))
+    next_params = dict(parse_qsl(following.query, keep_blank_values=True))
+    changed = [
+        key
+        for key in set(current_params) | set(next_params)
+        if current_params.get(key) != next_params.get(key)
+    ]
+    if len(changed) != 1 or changed[0] not in next_params:
+        return PaginationStrategy(kind="click", selector=selector)
+
+    param = changed[0]
+    next_value = next_params[param]
+    current_value = current_params.get(param)
+    if not next_value.isdigit():
+        return PaginationStrategy(kind="next_link", selector=selector)
+
+    if current_value is not None and current_value.isdigit():
+        step = int(next_value) - int(current_value)
+        if step <= 0:
+            return PaginationStrategy(kind="click", selector=selector)
+        start = int(current_value) if on_first_page else (1 if step == 1 else 0)
+    elif int(next_value) <= 2:
+        # ?page=2 (or a zero-based ?page=1) from an unparameterized first page.
+        start, step = int(next_value) - 1, 1
+    else:
+        # ?offset=24 from an unparameterized first page.
+        start, step = 0, int(next_value)
+    return PaginationStrategy(kind="url_param", param=param, start=start, step=step)
+
+
+def page_url(url: str, strategy: PaginationStrategy, value: int) -> str:
+    parts = urlsplit(url)
+    params = [
+        (key, item)
+        for key, item in parse_qsl(parts.query, keep_blank_values=True)
+        if key != strategy.param
+    ]
+    params.append((strategy.param, str(value)))
+    return urlunsplit(
+        (parts.scheme, parts.netloc, parts.path, urlencode(params), parts.fragment)
+    )
+
+
+def current_param_value(url: str, strategy: PaginationStrategy) -> int:
+    value = dict(parse_qsl(urlsplit(url).query)).get(strategy.param or "")
+    return int(value) if value and value.isdigit() else strategy.start
+
+
+class PlatformPagination:
+    def __init__(self, strategy: Optional[PaginationStrategy]):
+        self.strategy = strategy
+        self.pages_by_url = 0
+        self.pages_by_click = 0
+        self.pages_by_link = 0
+        self.strategies_learned = 0
+
+    @property
+    def next_page_selector(self) -> Optional[str]:
+        if self.strategy is None or self.strategy.kind == "url_param":
+            return None
+        return self.strategy.selector
+
+    def learn(self, strategy: PaginationStrategy) -> None:
+        if strategy != self.strategy:
+            print(
+                f"Learned pagination strategy: {strategy.model_dump(exclude_none=True)}"
+            )
+            self.strategy = strategy
+            self.strategies_learned += 1
+
+    def forget(self) -> None:
+        self.strategy = None
+
+    def record_page(self, kind: str) -> None:
+        if kind == "url_param":
+            self.pages_by_url += 1
+        elif kind == "next_link":
+            self.pages_by_link += 1
+        else:
+            self.pages_by_click += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "strategy": (
+                self.strategy.model_dump(exclude_none=True) if self.strategy else None
+            ),
+            "pages_by_url": self.pages_by_url,
+            "pages_by_link": self.pages_by_link,
+            "pages_by_click": self.pages_by_click,
+            "strategies_learned": self.strategies_learned,
+        }
+
+
+pagination_states: Dict[str, PlatformPagination] = {}
+
+
+def get_platform_pagination(
+    platform_key: str, stored_strategy: Optional[dict] = None
+) -> PlatformPagination:
+    state = pagination_states.get(platform_key)
+    if state is None:
+        state = PlatformPagination(
+            PaginationStrategy.model_validate(stored_strategy)
+            if stored_strategy
+            else None
+        )
+        pagination_states[platform_key] = state
+    return state
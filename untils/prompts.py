@@ -0,0 +1,177 @@
+import hashlib
+
+# Gemini averages about four characters per token on HTML; close enough to
+# size batches without a round trip to the token counting endpoint.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+# Detail pages reach the model either as cleaned HTML or in the compact form of
+# untils.html_minimizer; the prompts describe the compact notation.
+COMPACT_CONTENT_NOTE = (
+    "Page content is compact text rather than HTML: one block per line, '#' marks "
+    "headings, '- ' list items, ' | ' separates table cells, links are written as "
+    "[text](url) and (name: value) pairs come from element attributes such as "
+    "prices or ratings."
+)
+
+
+class PromptTemplate:
+    """A prompt split into static instructions and a per-request template.
+
+    The instructions contain no placeholders, so they are the same for every
+    call and can be registered once as Gemini cached context; only the rendered
+    request is sent with each call.
+    """
+
+    def __init__(self, name: str, version: int, instructions: str, template: str):
+        self.name = name
+        self.version = version
+        self.instructions = instructions
+        self.template = template
+
+    @property
+    def fingerprint(self) -> str:
+        # The template hash catches edits that forgot to bump the version.
+        digest = hashlib.sha256(
+            (self.instructions + self.template).encode("utf-8")
+        ).hexdigest()[:12]
+        return f"{self.name}:v{self.version}:{digest}"
+
+    def render_request(self, **values) -> str:
+        return self.template.format(**values)
+
+    def render(self, **values) -> str:
+        return self.instructions + self.render_request(**values)
+
+
+GAME_LINKS_PROMPT = PromptTemplate(
+    name="game_links",
+    version=2,
+    instructions="""
+You are a highly intelligent web scraping assistant. Your task is to analyze the provided HTML of a game store's category page and extract two things: all direct links to individual game detail pages and a way to navigate to the next page of results.
+
+Instructions:
+1.  Identify and return a list of **ALL** game detail URLs found on the page. A game URL typically leads to a page dedicated to a single game.
+    -   Do not include links to news, DLCs without a base game, or developer pages.
+    -   Return as many game URLs as you can find on the page, up to the maximum number given with the page.
+    -   IMPORTANT: If an extracted URL is a relative path (e.g., starts with '/'), you MUST combine it with the base URL of the current page to form an absolute URL. The current page URL is given with the page.
+2.  Find the pagination element to go to the NEXT page or 'Load More'. Provide a unique and reliable CSS selector for it.
+    -   Prioritize elements with text like 'Next', '>', '>>', `aria-label="Next page"`, or especially 'Load More'.
+    -   If there's no 'Next' button but there are numbered pages, provide the selector for the next available page number.
+    -   If you cannot find a way to get to the next page, return null.
+
+Return a single, valid JSON object with the following keys:
+-   "game_urls": (list[str]) A list of all game URLs found.
+-   "next_page_selector": (str or null) The CSS selector for the next page/load more element, or null if not found.
+""",
+    template="""
+Current page URL: {current_url}
+Maximum number of game URLs: {target_count}
+
+Cleaned HTML:
+{clean_html}
+""",
+)
+
+GAME_DETAILS_PROMPT = PromptTemplate(
+    name="game_details",
+    version=3,
+    instructions="""
+Analyze the content of a game detail page and extract the information into a single, valid JSON object.
+If a piece of information is not found or applicable, use null for its value.
+**Do not omit any fields. Always include all fields, even if the value is null.**
+
+JSON Output Structure and Instructions:
+{
+  "name": "(string) The full name of the game as displayed on the platform. Required.",
+  "description": "(string or null) A detailed description of the game, usually a few paragraphs long. Extract the main descriptive text.",
+  "price": "(float) The current price. For free games, use 0.0. If the price is unknown or cannot be determined, use -1.0. This field is required and must never be null.",
+  "currency": "(string or null) The currency code, such as 'USD', 'EUR', 'UAH'. Extract the currency **as shown on the page**. If not found, use null. Do not guess or convert.",
+  "price_in_usd": "(float) The price converted to USD. If 'currency' is not USD, convert 'price' to USD. If 'currency' is already USD, use the same value as 'price'. If 'price' is -1.0 or null, this field should also be -1.0 or null respectively. This field is required and must never be null.",
+  "availability_status": "(string) Must be one of: 'available', 'out_of_stock', 'coming_soon', 'preorder', 'free', 'unavailable', 'early_access', 'beta', 'region_locked', 'unknown'. Required.",
+  "url_on_platform": "(string) The full URL of the page being analyzed, as given with the page.",
+  "rating": "(float or null) The game's average score. Normalize all ratings to a 5-point scale. Example: '9/10' or '90%' becomes 4.5.",
+  "reviews_count": "(integer or null) Total number of user reviews. Convert text like '1.2K' to 1200.",
+  "special_content_json": "(JSON object or null) Info about DLCs, bundles. Example: {\"dlcs\": [\"DLC Name 1\"], \"season_pass_available\": true}. If nothing found, use null.",
+  "discount_info_json": "(JSON object or null) Info about discounts. Example: {\"original_price\": 29.99, \"discounted_price\": 26.99, \"sale_end_date\": \"2025-06-13T23:59:59Z\"}. Use null if not on sale.",
+  "metadata_json": "(JSON object or null) Other game metadata like genres, tags, developer, publisher, release date, system requirements. If metadata is not available, use null."
+}
+
+Important Notes:
+- Always return a complete JSON object with all fields present.
+- If a value is not found, return null for that field.
+- Strictly follow the requested data types and formats.
+- If the sale end date is given as a relative phrase (e.g., "ends in 14 days"), you **must** compute and return the exact absolute date in ISO 8601 format using the current date given with the page. Never leave `sale_end_date` null if any time reference is available.
+- For `metadata_json`, include as many details as possible. If a subfield like `developer` or `tags` is missing, include it with null or omit inside the nested object — but the field `metadata_json` itself must be present.
+- **For 'price_in_usd' conversion:**
+    - If 'currency' is 'USD', 'price_in_usd' should be the same as 'price'.
+    - If 'currency' is not 'USD', you **must** use an **up-to-date exchange rate** (which Gemini will obtain independently) to convert 'price' to USD.
+    - If 'price' is -1.0 or null, 'price_in_usd' should also be -1.0 or null respectively.
+    - If the currency is unknown or conversion is impossible due to missing 'price' or 'currency', use -1.0 for 'price_in_usd'.
+""",
+    template="""
+Page URL: {game_url}
+Current Date: {current_date}
+{content_note}
+
+Page Content:
+{cleaned_html}
+
+JSON Response:
+""",
+)
+
+GAME_DETAILS_BATCH_PROMPT = PromptTemplate(
+    name="game_details_batch",
+    version=3,
+    instructions="""
+Analyze the content of several game detail pages. Each page starts with a "=== PAGE n ===" header followed by its URL and content.
+Return a single, valid JSON array with exactly one object per page, in the same order as the pages.
+If a piece of information is not found or applicable, use null for its value.
+**Do not omit any fields. Always include all fields, even if the value is null.**
+Never mix information between pages: every object must only use the HTML of its own page.
+
+JSON Object Structure and Instructions (one per page):
+{
+  "url_on_platform": "(string) The URL from the page header, copied exactly. Required; it is used to match the object to its page.",
+  "name": "(string) The full name of the game as displayed on the platform. Required.",
+  "description": "(string or null) A detailed description of the game, usually a few paragraphs long. Extract the main descriptive text.",
+  "price": "(float) The current price. For free games, use 0.0. If the price is unknown or cannot be determined, use -1.0. This field is required and must never be null.",
+  "currency": "(string or null) The currency code, such as 'USD', 'EUR', 'UAH'. Extract the currency **as shown on the page**. If not found, use null. Do not guess or convert.",
+  "price_in_usd": "(float) The price converted to USD. If 'currency' is not USD, convert 'price' to USD. If 'currency' is already USD, use the same value as 'price'. If 'price' is -1.0 or null, this field should also be -1.0 or null respectively. This field is required and must never be null.",
+  "availability_status": "(string) Must be one of: 'available', 'out_of_stock', 'coming_soon', 'preorder', 'free', 'unavailable', 'early_access', 'beta', 'region_locked', 'unknown'. Required.",
+  "rating": "(float or null) The game's average score. Normalize all ratings to a 5-point scale. Example: '9/10' or '90%' becomes 4.5.",
+  "reviews_count": "(integer or null) Total number of user reviews. Convert text like '1.2K' to 1200.",
+  "special_content_json": "(JSON object or null) Info about DLCs, bundles. Example: {\"dlcs\": [\"DLC Name 1\"], \"season_pass_available\": true}. If nothing found, use null.",
+  "discount_info_json": "(JSON object or null) Info about discounts. Example: {\"original_price\": 29.99, \"discounted_price\": 26.99, \"sale_end_date\": \"2025-06-13T23:59:59Z\"}. Use null if not on sale.",
+  "metadata_json": "(JSON object or null) Other game metadata like genres, tags, developer, publisher, release date, system requirements. If metadata is not available, use null."
+}
+
+Important Notes:
+- Always return a complete JSON object with all fields present for every page.
+- Strictly follow the requested data types and formats.
+- If the sale end date is given as a relative phrase (e.g., "ends in 14 days"), you **must** compute and return the exact absolute date in ISO 8601 format using the current date given with the pages.
+- **For 'price_in_usd' conversion:**
+    - If 'currency' is 'USD', 'price_in_usd' should be the same as 'price'.
+    - If 'currency' is not 'USD', you **must** use an **up-to-date exchange rate** to convert 'price' to USD.
+    - If the currency is unknown or conversion is impossible due to missing 'price' or 'currency', use -1.0 for 'price_in_usd'.
+""",
+    template="""
+Current Date: {current_date}
+{content_note}
+
+Pages:
+{pages}
+
+JSON Response:
+""",
+)
+
+PROMPTS = {
+    prompt.name: prompt
+    for prompt in (GAME_LINKS_PROMPT, GAME_DETAILS_PROMPT, GAME_DETAILS_BATCH_PROMPT)
+}
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+from untils.adaptive_limiter import AdaptiveLimiter
+
+
+class TokenBucket:
+    """Refills continuously up to one minute's allowance."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        # Waiters are served in arrival order, so large requests do not starve.
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def debit(self, amount: float) -> None:
+        """Charge usage discovered after the fact; the balance may go negative."""
+        self._refill()
+        self.tokens -= amount
+
+
+class RateLimiterStats:
+    def __init__(self):
+        self.calls = 0
+        self.waiting = 0
+        self.in_flight = 0
+        self.queue_wait_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+        self.estimated_tokens = 0
+        self.used_tokens = 0
+        self.retries = 0
+        self.retry_reasons: Dict[str, int] = {}
+        self.failures = 0
+
+    def record_retry(self, reason: str) -> None:
+        self.retries += 1
+        self.retry_reasons[reason] = self.retry_reasons.get(reason, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "queue_wait_seconds": round(self.queue_wait_seconds, 3),
+            "avg_queue_wait_seconds": (
+                round(self.queue_wait_seconds / self.calls, 3) if self.calls else 0.0
+            ),
+            "max_queue_wait_seconds": round(self.max_queue_wait_seconds, 3),
+            "estimated_tokens": self.estimated_tokens,
+            "used_tokens": self.used_tokens,
+            "retries": self.retries,
+            "retry_reasons": dict(self.retry_reasons),
+            "failures": self.failures,
+        }
+
+
+class CallSlot:
+    def __init__(self, token_bucket: TokenBucket, estimated: int):
+        self._token_bucket = token_bucket
+        self.estimated_tokens = estimated
+        self.used_tokens = 0
+
+    def record_usage(self, used_tokens: int) -> None:
+        self.used_tokens = used_tokens
+        if used_tokens > self.estimated_tokens:
+            self._token_bucket.debit(used_tokens - self.estimated_tokens)
+
+
+class RateLimiter:
+    """Bounds calls to an API by concurrency, requests/min and tokens/min.
+
+    A call first waits for a slot under the adaptive concurrency limit, then
+    for its share of both buckets. Prompts are charged by estimate up front; calls that report their
+    real usage are charged the difference afterwards.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        concurrency: AdaptiveLimiter,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = concurrency
+        self.stats = RateLimiterStats()
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[CallSlot]:
+        queued_at = time.monotonic()
+        self.stats.waiting += 1
+        waiting = True
+        try:
+            async with self.concurrency.acquire() as call:
+                await self.requests.acquire(1)
+                await self.tokens.acquire(estimated_tokens)
+                self.stats.waiting -= 1
+                waiting = False
+                call.restart_clock()
+
+                waited = time.monotonic() - queued_at
+                self.stats.calls += 1
+                self.stats.queue_wait_seconds += waited
+                self.stats.max_queue_wait_seconds = max(
+                    self.stats.max_queue_wait_seconds, waited
+                )
+                self.stats.estimated_tokens += estimated_tokens
+                self.stats.in_flight += 1
+                slot = CallSlot(self.tokens, estimated_tokens)
+                try:
+                    yield slot
+                finally:
+                    self.stats.in_flight -= 1
+                    self.stats.used_tokens += slot.used_tokens or estimated_tokens
+        finally:
+            if waiting:
+                self.stats.waiting -= 1
@@ -0,0 +1,118 @@
+import re
+from typing import Dict, List, Optional
+
+from playwright.async_api import BrowserContext, Route
+
+from common.app_settings import settings
+from schemas import ResourceBlockRules
+
+DEFAULT_TRACKER_PATTERNS = [
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"googlesyndication\.com",
+    r"doubleclick\.net",
+    r"connect\.facebook\.net",
+    r"hotjar\.com",
+    r"segment\.(io|com)",
+    r"newrelic\.com",
+    r"nr-data\.net",
+    r"sentry\.io",
+    r"clarity\.ms",
+    r"criteo\.(com|net)",
+    r"scorecardresearch\.com",
+    r"adservice\.google\.",
+]
+
+# Blocked requests never download, so their size is estimated per resource type.
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 45_000,
+    "media": 750_000,
+    "font": 35_000,
+    "stylesheet": 30_000,
+    "script": 40_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "other": 10_000,
+}
+
+DEFAULT_BLOCK_RULES = ResourceBlockRules(
+    enabled=settings.BROWSER_BLOCK_RESOURCES,
+    block_resource_types=["image", "media", "font"],
+    block_url_patterns=DEFAULT_TRACKER_PATTERNS,
+)
+
+
+class ResourceBlockStats:
+    def __init__(self):
+        self.requests_allowed = 0
+        self.requests_blocked = 0
+        self.estimated_bytes_saved = 0
+        self.blocked_by_type: Dict[str, int] = {}
+
+    def record_blocked(self, resource_type: str) -> None:
+        self.requests_blocked += 1
+        self.blocked_by_type[resource_type] = (
+            self.blocked_by_type.get(resource_type, 0) + 1
+        )
+        self.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(
+            resource_type, ESTIMATED_RESOURCE_BYTES["other"]
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "requests_allowed": self.requests_allowed,
+            "requests_blocked": self.requests_blocked,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
+
+
+resource_block_stats: Dict[str, ResourceBlockStats] = {}
+
+
+class ResourceBlocker:
+    def __init__(self, rules: ResourceBlockRules, stats_key: str):
+        self.rules = rules
+        self.block_types = set(rules.block_resource_types)
+        self.allow_patterns = self._compile(rules.allow_url_patterns)
+        self.block_patterns = self._compile(rules.block_url_patterns)
+        self.stats = resource_block_stats.setdefault(stats_key, ResourceBlockStats())
+
+    @classmethod
+    def for_platform(
+        cls, rules_json: Optional[dict], platform_name: Optional[str]
+    ) -> "ResourceBlocker":
+        rules = DEFAULT_BLOCK_RULES
+        if rules_json:
+            rules = DEFAULT_BLOCK_RULES.model_copy(
+                update=ResourceBlockRules.model_validate(rules_json).model_dump(
+                    exclude_unset=True
+                )
+            )
+        return cls(rules, platform_name or "default")
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if not self.rules.enabled:
+            return False
+        if any(pattern.search(url) for pattern in self.allow_patterns):
+            return False
+        return resource_type in self.block_types or any(
+            pattern.search(url) for pattern in self.block_patterns
+        )
+
+    async def attach(self, context: BrowserContext) -> None:
+        if self.rules.enabled:
+            await context.route("**/*", self._handle_route)
+
+    async def _handle_route(self, route: Route) -> None:
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.stats.record_blocked(request.resource_type)
+            await route.abort("blockedbyclient")
+        else:
+            self.stats.requests_allowed += 1
+            await route.continue_()
+
+    @staticmethod
+    def _compile(patterns: List[str]) -> List[re.Pattern]:
+        return [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
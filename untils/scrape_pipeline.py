@@ -0,0 +1,207 @@
+import asyncio
+import math
+import time
+from typing import (
+    Any,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+
+
+class PipelineItem:
+    def __init__(self, url: str):
+        self.url = url
+        self.html: Optional[str] = None
+        self.cleaned_html: Optional[str] = None
+        self.data: Optional[dict] = None
+        self.error: Optional[Exception] = None
+        self.stage_latencies: Dict[str, float] = {}
+
+
+StageHandler = Callable[[PipelineItem], Awaitable[None]]
+
+
+def latency_percentile(latencies: List[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile of latencies in milliseconds."""
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return round(ordered[rank - 1] * 1000, 2)
+
+
+class PipelineStage:
+    def __init__(
+        self,
+        name: str,
+        handler: StageHandler,
+        workers: int = 1,
+        queue_size: int = 10,
+        always_run: bool = False,
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        # Sink stages run for failed items too so they can record the failure,
+        # and an exception raised from them aborts the whole pipeline.
+        self.always_run = always_run
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.processed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.busy_workers = 0
+        self.busy_seconds = 0.0
+        self.latencies: List[float] = []
+
+    def stats(self, elapsed: float) -> dict:
+        completed = self.processed + self.failed
+        return {
+            "workers": self.workers,
+            "busy_workers": self.busy_workers,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "queue_size": self.queue_size,
+            "processed": self.processed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "avg_latency_ms": (
+                round(sum(self.latencies) / len(self.latencies) * 1000, 2)
+                if self.latencies
+                else None
+            ),
+            "p50_latency_ms": latency_percentile(self.latencies, 50),
+            "p95_latency_ms": latency_percentile(self.latencies, 95),
+            "p99_latency_ms": latency_percentile(self.latencies, 99),
+            "throughput_per_sec": (
+                round(completed / elapsed, 3) if elapsed > 0 else None
+            ),
+            "utilization": (
+                round(self.busy_seconds / (elapsed * self.workers), 3)
+                if elapsed > 0
+                else None
+            ),
+        }
+
+
+_SENTINEL = object()
+
+
+class ScrapePipeline:
+    def __init__(self, stages: List[PipelineStage]):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self.stages = stages
+        self.items_in = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    async def run(self, urls: Union[Iterable[str], AsyncIterable[str]]) -> None:
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+        self.started_at = time.perf_counter()
+
+        tasks: List[asyncio.Task] = []
+        try:
+            for index, stage in enumerate(self.stages):
+                next_stage = (
+                    self.stages[index + 1] if index + 1 < len(self.stages) else None
+                )
+                workers = [
+                    asyncio.create_task(self._worker(stage, next_stage))
+                    for _ in range(stage.workers)
+                ]
+                tasks.extend(workers)
+                tasks.append(
+                    asyncio.create_task(self._close_after(workers, next_stage))
+                )
+            tasks.append(asyncio.create_task(self._feed(urls)))
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            self.finished_at = time.perf_counter()
+
+    def stats(self) -> dict:
+        if self.started_at is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        sink = self.stages[-1]
+        return {
+            "running": self.started_at is not None and self.finished_at is None,
+            "elapsed_seconds": round(elapsed, 3),
+            "items_in": self.items_in,
+            "items_out": sink.processed + sink.failed,
+            "stages": {stage.name: stage.stats(elapsed) for stage in self.stages},
+        }
+
+    async def _feed(self, urls: Union[Iterable[str], AsyncIterable[str]]) -> None:
+        first = self.stages[0]
+        assert first.queue is not None
+        if isinstance(urls, AsyncIterable):
+            async for url in urls:
+                self.items_in += 1
+                await first.queue.put(PipelineItem(url))
+        else:
+            for url in urls:
+                self.items_in += 1
+                await first.queue.put(PipelineItem(url))
+        for _ in range(first.workers):
+            await first.queue.put(_SENTINEL)
+
+    async def _close_after(
+        self, workers: List[asyncio.Task], next_stage: Optional[PipelineStage]
+    ) -> None:
+        await asyncio.gather(*workers)
+        if next_stage is not None:
+            assert next_stage.queue is not None
+            for _ in range(next_stage.workers):
+                await next_stage.queue.put(_SENTINEL)
+
+    async def _worker(
+        self, stage: PipelineStage, next_stage: Optional[PipelineStage]
+    ) -> None:
+        assert stage.queue is not None
+        while True:
+            item: Any = await stage.queue.get()
+            if item is _SENTINEL:
+                return
+
+            if item.error is None or stage.always_run:
+                stage.busy_workers += 1
+                started = time.perf_counter()
+                try:
+                    await stage.handler(item)
+                    stage.processed += 1
+                except Exception as e:
+                    stage.failed += 1
+                    if stage.always_run:
+                        raise
+                    item.error = e
+                finally:
+                    latency = time.perf_counter() - started
+                    stage.busy_workers -= 1
+                    stage.busy_seconds += latency
+                    stage.latencies.append(latency)
+                    item.stage_latencies[stage.name] = latency
+            else:
+                stage.skipped += 1
+
+            if next_stage is not None:
+                assert next_stage.queue is not None
+                await next_stage.queue.put(item)
+
+
+active_pipelines: Dict[str, ScrapePipeline] = {}
+# Stats of the last finished run per platform, tagged with its request id.
+last_pipeline_stats: Dict[str, dict] = {}
@@ -0,0 +1,165 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+from playwright.async_api import Page, Request
+
+from common.app_settings import settings
+
+# Long-lived streams never finish, so they would keep the page from idling.
+IGNORED_RESOURCE_TYPES = {"websocket", "eventsource", "manifest"}
+POLL_INTERVAL_SECONDS = 0.1
+
+PAGE_STATE_JS = """
+(pattern) => {
+    if (!window.__scrollWaiter) {
+        const state = {mutations: 0, lastMutation: performance.now()};
+        new MutationObserver((records) => {
+            for (const record of records) {
+                state.mutations += record.addedNodes.length;
+            }
+            state.lastMutation = performance.now();
+        }).observe(document.documentElement, {childList: true, subtree: true});
+        window.__scrollWaiter = state;
+    }
+    let matcher = null;
+    try {
+        matcher = pattern ? new RegExp(pattern) : null;
+    } catch (e) {}
+    let items = 0;
+    for (const link of document.querySelectorAll("a[href]")) {
+        if (!matcher || matcher.test(link.href.split(/[?#]/)[0])) {
+            items++;
+        }
+    }
+    const state = window.__scrollWaiter;
+    return {
+        mutations: state.mutations,
+        quiet_ms: performance.now() - state.lastMutation,
+        items: items,
+    };
+}
+"""
+
+
+class ScrollWaitStats:
+    def __init__(self):
+        self.pages = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_page_wait_seconds = 0.0
+        self.outcomes: Dict[str, int] = {}
+
+    def record_wait(self, outcome: str, seconds: float) -> None:
+        self.waits += 1
+        self.wait_seconds += seconds
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def record_page(self, seconds: float) -> None:
+        self.pages += 1
+        self.max_page_wait_seconds = max(self.max_page_wait_seconds, seconds)
+
+    def to_dict(self) -> dict:
+        return {
+            "pages": self.pages,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "avg_page_wait_seconds": (
+                round(self.wait_seconds / self.pages, 3) if self.pages else 0.0
+            ),
+            "max_page_wait_seconds": round(self.max_page_wait_seconds, 3),
+            "outcomes": dict(self.outcomes),
+        }
+
+
+scroll_wait_stats: Dict[str, ScrollWaitStats] = {}
+
+
+class ScrollWaiter:
+    """Waits for a listing page to react to a scroll or click.
+
+    Used as a context manager around one listing page, which also records how
+    long that page spent waiting.
+
+    A wait ends as soon as more game links are on the page and the DOM has
+    settled ("items"), when neither the DOM nor the network has done anything
+    for an idle window ("idle"), or at the platform's timeout ("timeout").
+    Game links are counted with the learned URL pattern when there is one and
+    as all links otherwise.
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        stats_key: str,
+        timeout: Optional[float] = None,
+        link_pattern: Optional[str] = None,
+    ):
+        self.page = page
+        self.timeout = timeout or settings.SCROLL_WAIT_TIMEOUT_SECONDS
+        self.idle_seconds = settings.SCROLL_WAIT_IDLE_SECONDS
+        self.settle_seconds = settings.SCROLL_WAIT_SETTLE_SECONDS
+        self.link_pattern = link_pattern
+        self.stats = scroll_wait_stats.setdefault(stats_key, ScrollWaitStats())
+        self.in_flight = 0
+        self.last_network_activity = time.monotonic()
+        self.page_wait_seconds = 0.0
+
+    def __enter__(self) -> "ScrollWaiter":
+        self.page.on("request", self._on_request_started)
+        self.page.on("requestfinished", self._on_request_done)
+        self.page.on("requestfailed", self._on_request_done)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.page.remove_listener("request", self._on_request_started)
+        self.page.remove_listener("requestfinished", self._on_request_done)
+        self.page.remove_listener("requestfailed", self._on_request_done)
+        self.stats.record_page(self.page_wait_seconds)
+
+    def _on_request_started(self, request: Request) -> None:
+        if request.resource_type not in IGNORED_RESOURCE_TYPES:
+            self.in_flight += 1
+            self.last_network_activity = time.monotonic()
+
+    def _on_request_done(self, request: Request) -> None:
+        if request.resource_type not in IGNORED_RESOURCE_TYPES:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.last_network_activity = time.monotonic()
+
+    async def item_count(self) -> int:
+        try:
+            state = await self.page.evaluate(PAGE_STATE_JS, self.link_pattern)
+        except Exception:
+            return 0
+        return state["items"]
+
+    async def wait_for_new_items(self, baseline_items: int) -> str:
+        started = time.monotonic()
+        outcome = "timeout"
+        while True:
+            try:
+                state = await self.page.evaluate(PAGE_STATE_JS, self.link_pattern)
+            except Exception:
+                # The document is being replaced after a click; poll the new one.
+                state = {"items": 0, "quiet_ms": 0}
+            now = time.monotonic()
+            dom_quiet = state["quiet_ms"] / 1000
+            network_quiet = (
+                now - self.last_network_activity if not self.in_flight else 0.0
+            )
+            if state["items"] > baseline_items and dom_quiet >= self.settle_seconds:
+                outcome = "items"
+                break
+            # Quiet time before the wait began does not count: the page may not
+            # have reacted to the scroll yet.
+            if min(dom_quiet, network_quiet, now - started) >= self.idle_seconds:
+                outcome = "idle"
+                break
+            if now - started >= self.timeout:
+                break
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        elapsed = time.monotonic() - started
+        self.page_wait_seconds += elapsed
+        self.stats.record_wait(outcome, elapsed)
+        return outcome
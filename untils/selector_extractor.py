@@ -0,0 +1,201 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from cssselect import SelectorError
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from untils.field_parsers import (
+    parse_availability,
+    parse_count,
+    parse_currency,
+    parse_price,
+    parse_rating,
+)
+from untils.structured_data import extract_structured_data
+
+FAST_PATH_FIELDS = (
+    "name",
+    "price",
+    "currency",
+    "rating",
+    "reviews_count",
+    "availability_status",
+)
+
+
+class ExtractionPathStats:
+    def __init__(self):
+        self.pages = 0
+        self.llm_skipped = 0
+        self.llm_fallback = 0
+        self.llm_only = 0
+        self.field_hits: Dict[str, Dict[str, int]] = {}
+        self.field_misses: Dict[str, int] = {}
+        self.fallback_reasons: Dict[str, int] = {}
+
+    def record_fields(
+        self, source: str, data: Dict[str, Any], missing: Iterable[str] = ()
+    ) -> None:
+        hits = self.field_hits.setdefault(source, {})
+        for field in data:
+            hits[field] = hits.get(field, 0) + 1
+        for field in missing:
+            self.field_misses[field] = self.field_misses.get(field, 0) + 1
+
+    def record_path(self, path: str, reason: Optional[str] = None) -> None:
+        self.pages += 1
+        if path == "deterministic":
+            self.llm_skipped += 1
+        elif path == "fallback":
+            self.llm_fallback += 1
+        else:
+            self.llm_only += 1
+        if reason:
+            self.fallback_reasons[reason] = self.fallback_reasons.get(reason, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "pages": self.pages,
+            "llm_skipped": self.llm_skipped,
+            "llm_fallback": self.llm_fallback,
+            "llm_only": self.llm_only,
+            "llm_skip_rate": (
+                round(self.llm_skipped / self.pages, 3) if self.pages else 0.0
+            ),
+            "field_hits": {
+                source: dict(hits) for source, hits in self.field_hits.items()
+            },
+            "selector_field_misses": dict(self.field_misses),
+            "fallback_reasons": dict(self.fallback_reasons),
+        }
+
+
+extraction_stats: Dict[str, ExtractionPathStats] = {}
+
+
+class CompiledProfile:
+    def __init__(self, profile: Dict[str, Any], container_selector: Optional[str]):
+        self.rating_scale = float(profile.get("rating_scale") or 5.0)
+        self.default_currency = profile.get("default_currency")
+        self.container = self._compile_container(container_selector)
+        self.fields = {
+            field: self._compile(profile[field])
+            for field in (*FAST_PATH_FIELDS, "description")
+            if profile.get(field)
+        }
+        self.metadata = {
+            key: self._compile(selector)
+            for key, selector in (profile.get("metadata") or {}).items()
+        }
+
+    @staticmethod
+    def _compile(selector: Dict[str, Any]) -> Tuple[Callable, Optional[str]]:
+        if selector.get("css"):
+            return CSSSelector(selector["css"]), selector.get("attribute")
+        return etree.XPath(selector["xpath"]), selector.get("attribute")
+
+    @staticmethod
+    def _compile_container(selector: Optional[str]) -> Optional[Callable]:
+        # game_data_selector predates the extraction profile and is free text, so
+        # it only scopes the lookups when it is a usable CSS selector.
+        if not selector or not selector.strip() or selector.strip() == "*":
+            return None
+        try:
+            return CSSSelector(selector)
+        except SelectorError:
+            return None
+
+
+@lru_cache(maxsize=64)
+def compile_profile(
+    profile_json: str, container_selector: Optional[str]
+) -> CompiledProfile:
+    return CompiledProfile(json.loads(profile_json), container_selector)
+
+
+def select_text(root, compiled: Tuple[Callable, Optional[str]]) -> Optional[str]:
+    selector, attribute = compiled
+    for result in selector(root):
+        if isinstance(result, str):
+            text = result
+        elif attribute:
+            text = result.get(attribute) or ""
+        else:
+            text = result.text_content()
+        text = " ".join(text.split())
+        if text:
+            return text
+    return None
+
+
+def extract_page_fields(
+    html: str, profile_json: Optional[str], container_selector: Optional[str] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any], List[str]]:
+    """Run every deterministic extractor over one parse of the raw page.
+
+    Returns the structured data fields, the selector profile fields and the
+    profile fields that could not be filled.
+    """
+    profile = (
+        compile_profile(profile_json, container_selector) if profile_json else None
+    )
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return {}, {}, list(profile.fields) if profile else []
+
+    structured = extract_structured_data(root)
+    if profile is None:
+        return structured, {}, []
+    selected, missing = _extract_with_profile(root, profile)
+    return structured, selected, missing
+
+
+def _extract_with_profile(
+    root, profile: CompiledProfile
+) -> Tuple[Dict[str, Any], List[str]]:
+    if profile.container is not None:
+        containers = profile.container(root)
+        if containers:
+            root = containers[0]
+
+    texts = {
+        field: select_text(root, compiled) for field, compiled in profile.fields.items()
+    }
+    parsers: Dict[str, Callable[[str], Any]] = {
+        "name": lambda text: text,
+        "description": lambda text: text,
+        "price": parse_price,
+        "currency": parse_currency,
+        "rating": lambda text: parse_rating(text, profile.rating_scale),
+        "reviews_count": parse_count,
+        "availability_status": parse_availability,
+    }
+
+    data: Dict[str, Any] = {}
+    missing: List[str] = []
+    for field, text in texts.items():
+        value = parsers[field](text) if text is not None else None
+        if value is None:
+            if field != "description":
+                missing.append(field)
+        else:
+            data[field] = value
+
+    if "currency" not in data:
+        currency = parse_currency(texts.get("price") or "") or profile.default_currency
+        if currency:
+            data["currency"] = currency
+            if "currency" in missing:
+                missing.remove("currency")
+
+    metadata = {
+        key: text
+        for key, compiled in profile.metadata.items()
+        if (text := select_text(root, compiled)) is not None
+    }
+    if metadata:
+        data["metadata_json"] = metadata
+    return data, missing
@@ -0,0 +1,177 @@
+import re
+import zlib
+from collections import deque
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import httpx
+from lxml import etree
+
+from common.app_settings import settings
+from untils.http_fetcher import http_fetcher
+from untils.link_discovery import strip_query
+
+GZIP_MAGIC = b"\x1f\x8b"
+ENTRY_TAGS = ("sitemap", "url")
+
+
+class SitemapStats:
+    def __init__(self):
+        self.runs = 0
+        self.fallbacks = 0
+        self.sitemaps_read = 0
+        self.sitemap_errors = 0
+        self.bytes_read = 0
+        self.urls_seen = 0
+        self.urls_matched = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "fallbacks": self.fallbacks,
+            "sitemaps_read": self.sitemaps_read,
+            "sitemap_errors": self.sitemap_errors,
+            "bytes_read": self.bytes_read,
+            "urls_seen": self.urls_seen,
+            "urls_matched": self.urls_matched,
+        }
+
+
+sitemap_stats: Dict[str, SitemapStats] = {}
+
+
+def get_sitemap_stats(platform_key: str) -> SitemapStats:
+    stats = sitemap_stats.get(platform_key)
+    if stats is None:
+        stats = SitemapStats()
+        sitemap_stats[platform_key] = stats
+    return stats
+
+
+async def find_sitemaps(base_url: str) -> List[str]:
+    """Sitemaps announced in robots.txt, or the conventional /sitemap.xml."""
+    try:
+        response = await http_fetcher.get(urljoin(base_url, "/robots.txt"))
+        if response.status_code == 200:
+            announced = [
+                line.split(":", 1)[1].strip()
+                for line in response.text.splitlines()
+                if line.lower().startswith("sitemap:")
+            ]
+            if announced:
+                return announced
+    except httpx.HTTPError as e:
+        print(f"Could not read robots.txt of {base_url}: {e}")
+    return [urljoin(base_url, "/sitemap.xml")]
+
+
+async def iter_sitemap_entries(
+    sitemap_url: str, stats: Optional[SitemapStats] = None
+) -> AsyncIterator[Tuple[str, str]]:
+    """Yield ("sitemap" | "url", loc) pairs while the document downloads.
+
+    Gzip'd sitemaps are inflated chunk by chunk and fed to a pull parser, and
+    every entry is dropped from the tree once read, so memory stays flat no
+    matter how large the file is.
+    """
+    parser = etree.XMLPullParser(
+        events=("end",), resolve_entities=False, no_network=True, huge_tree=True
+    )
+    decompressor = None
+    head = b""
+    loc: Optional[str] = None
+
+    async with http_fetcher.stream(sitemap_url) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            if stats is not None:
+                stats.bytes_read += len(chunk)
+            if decompressor is None:
+                # Servers send .xml.gz either raw or with Content-Encoding, which
+                # httpx already undoes, so sniff the payload instead of the URL.
+                head += chunk
+                if len(head) < len(GZIP_MAGIC):
+                    continue
+                decompressor = (
+                    zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    if head.startswith(GZIP_MAGIC)
+                    else False
+                )
+                chunk, head = head, b""
+            parser.feed(decompressor.decompress(chunk) if decompressor else chunk)
+
+            for _, element in parser.read_events():
+                name = etree.QName(element).localname
+                if name == "loc":
+                    if _is_entry_loc(element):
+                        loc = (element.text or "").strip()
+                elif name in ENTRY_TAGS:
+                    if loc:
+                        yield name, loc
+                    loc = None
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+
+        if head:
+            parser.feed(head)
+        elif decompressor:
+            parser.feed(decompressor.flush())
+        parser.close()
+
+
+def _is_entry_loc(element) -> bool:
+    # Extensions nest their own loc elements inside an entry, e.g. the CDN
+    # address in <image:image><image:loc>, which must not replace the page.
+    parent = element.getparent()
+    if parent is None:
+        return False
+    entry = etree.QName(parent)
+    return (
+        entry.localname in ENTRY_TAGS
+        and etree.QName(element).namespace == entry.namespace
+    )
+
+
+async def iter_sitemap_game_urls(
+    sitemap_urls: List[str],
+    pattern: str,
+    limit: int,
+    stats: Optional[SitemapStats] = None,
+) -> AsyncIterator[str]:
+    """Walk sitemaps and nested indexes, yielding game URLs as they are parsed."""
+    compiled = re.compile(pattern)
+    pending = deque(sitemap_urls)
+    visited = set()
+    seen = set()
+
+    while pending and len(seen) < limit and len(visited) < settings.SITEMAP_MAX_FILES:
+        sitemap_url = pending.popleft()
+        if sitemap_url in visited:
+            continue
+        visited.add(sitemap_url)
+        if stats is not None:
+            stats.sitemaps_read += 1
+
+        try:
+            async with aclosing(iter_sitemap_entries(sitemap_url, stats)) as entries:
+                async for kind, loc in entries:
+                    if kind == "sitemap":
+                        pending.append(urljoin(sitemap_url, loc))
+                        continue
+                    if stats is not None:
+                        stats.urls_seen += 1
+                    url = strip_query(urljoin(sitemap_url, loc))
+                    if url in seen or not compiled.match(url):
+                        continue
+                    seen.add(url)
+                    if stats is not None:
+                        stats.urls_matched += 1
+                    yield url
+                    if len(seen) >= limit:
+                        return
+        except (httpx.HTTPError, etree.XMLSyntaxError, zlib.error) as e:
+            if stats is not None:
+                stats.sitemap_errors += 1
+            print(f"Failed to read sitemap {sitemap_url}: {e}")
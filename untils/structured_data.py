@@ -0,0 +1,216 @@
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+from lxml import etree
+
+from untils.field_parsers import (
+    parse_availability,
+    parse_count,
+    parse_currency,
+    parse_price,
+    parse_rating,
+)
+
+GAME_TYPES = {
+    "videogame",
+    "product",
+    "softwareapplication",
+    "game",
+    "mobileapplication",
+}
+METADATA_KEYS = {
+    "genre": "genres",
+    "publisher": "publisher",
+    "author": "developer",
+    "creator": "developer",
+    "developer": "developer",
+    "datePublished": "release_date",
+    "gamePlatform": "platforms",
+    "operatingSystem": "operating_system",
+    "contentRating": "content_rating",
+}
+
+
+def extract_structured_data(root) -> Dict[str, Any]:
+    """Read game fields from JSON-LD, microdata and OpenGraph on a raw page.
+
+    Sources are tried in that order and each only fills fields the previous
+    ones left empty. Values are normalized like selector output: prices as
+    floats, currency codes, ratings on a 5-point scale and availability as a
+    GameStatusEnum value.
+    """
+    data: Dict[str, Any] = {}
+    for source in (_from_json_ld(root), _from_microdata(root), _from_open_graph(root)):
+        for field, value in source.items():
+            if field == "metadata_json":
+                data["metadata_json"] = {**value, **data.get("metadata_json", {})}
+            elif value is not None and field not in data:
+                data[field] = value
+    return data
+
+
+def _from_json_ld(root) -> Dict[str, Any]:
+    for script in root.xpath("//script[@type='application/ld+json']"):
+        try:
+            document = json.loads(script.text or "", strict=False)
+        except ValueError:
+            continue
+        for node in _iter_nodes(document):
+            if _type_names(node) & GAME_TYPES:
+                return _fields_from_node(node)
+    return {}
+
+
+def _iter_nodes(document: Any) -> Iterator[dict]:
+    if isinstance(document, list):
+        for item in document:
+            yield from _iter_nodes(item)
+    elif isinstance(document, dict):
+        yield document
+        if "@graph" in document:
+            yield from _iter_nodes(document["@graph"])
+
+
+def _type_names(node: dict) -> set:
+    types = node.get("@type") or []
+    if isinstance(types, str):
+        types = [types]
+    return {str(t).rsplit("/", 1)[-1].lower() for t in types}
+
+
+def _fields_from_node(node: dict) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {
+        "name": _text(node.get("name")),
+        "description": _text(node.get("description")),
+    }
+
+    offer = _first(node.get("offers"))
+    if isinstance(offer, dict):
+        price_spec = _first(offer.get("priceSpecification"))
+        price = offer.get("price", offer.get("lowPrice"))
+        if price is None and isinstance(price_spec, dict):
+            price = price_spec.get("price")
+        currency = offer.get("priceCurrency")
+        if currency is None and isinstance(price_spec, dict):
+            currency = price_spec.get("priceCurrency")
+        fields["price"] = parse_price(str(price)) if price is not None else None
+        fields["currency"] = _text(currency)
+        fields["availability_status"] = (
+            parse_availability(str(offer["availability"]))
+            if offer.get("availability")
+            else None
+        )
+
+    rating = node.get("aggregateRating")
+    if isinstance(rating, dict) and rating.get("ratingValue") is not None:
+        best = rating.get("bestRating") or 5
+        fields["rating"] = parse_rating(f"{rating['ratingValue']}/{best}", 5.0)
+        count = rating.get("ratingCount", rating.get("reviewCount"))
+        fields["reviews_count"] = parse_count(str(count)) if count is not None else None
+
+    metadata: Dict[str, Any] = {}
+    for key, metadata_key in METADATA_KEYS.items():
+        value = _names(node.get(key))
+        if value and metadata_key not in metadata:
+            metadata[metadata_key] = value
+    if metadata:
+        fields["metadata_json"] = metadata
+    return fields
+
+
+def _from_microdata(root) -> Dict[str, Any]:
+    for scope in root.xpath("//*[@itemscope][@itemtype]"):
+        if not _type_names({"@type": scope.get("itemtype").split()}) & GAME_TYPES:
+            continue
+        props: Dict[str, str] = {}
+        for element in scope.xpath(".//*[@itemprop]"):
+            value = _microdata_value(element)
+            for prop in element.get("itemprop").split():
+                if value and prop not in props:
+                    props[prop] = value
+        best = props.get("bestRating") or "5"
+        count = props.get("ratingCount") or props.get("reviewCount")
+        return {
+            "name": props.get("name"),
+            "description": props.get("description"),
+            "price": parse_price(props["price"]) if "price" in props else None,
+            "currency": (
+                parse_currency(props["priceCurrency"])
+                if "priceCurrency" in props
+                else parse_currency(props.get("price", ""))
+            ),
+            "availability_status": (
+                parse_availability(props["availability"])
+                if "availability" in props
+                else None
+            ),
+            "rating": (
+                parse_rating(f"{props['ratingValue']}/{best}", 5.0)
+                if "ratingValue" in props
+                else None
+            ),
+            "reviews_count": parse_count(count) if count else None,
+        }
+    return {}
+
+
+def _microdata_value(element) -> Optional[str]:
+    for attribute in ("content", "href", "src", "datetime", "value"):
+        if element.get(attribute):
+            return element.get(attribute).strip()
+    if element.get("itemscope") is not None:
+        return None
+    text = " ".join(etree.tostring(element, method="text", encoding="unicode").split())
+    return text or None
+
+
+def _from_open_graph(root) -> Dict[str, Any]:
+    meta: Dict[str, str] = {}
+    for element in root.xpath("//meta[@property or @name][@content]"):
+        key = (element.get("property") or element.get("name")).lower()
+        meta.setdefault(key, element.get("content").strip())
+
+    price = meta.get("product:price:amount") or meta.get("og:price:amount")
+    currency = meta.get("product:price:currency") or meta.get("og:price:currency")
+    availability = meta.get("product:availability") or meta.get("og:availability")
+    return {
+        "name": _strip_site_name(meta.get("og:title"), meta.get("og:site_name")),
+        "description": meta.get("og:description"),
+        "price": parse_price(price) if price else None,
+        "currency": parse_currency(currency) if currency else None,
+        "availability_status": parse_availability(availability)
+        if availability
+        else None,
+    }
+
+
+def _strip_site_name(title: Optional[str], site_name: Optional[str]) -> Optional[str]:
+    if not title or not site_name:
+        return title
+    for separator in (" | ", " - ", " — ", " on "):
+        suffix = f"{separator}{site_name}"
+        if title.endswith(suffix):
+            return title[: -len(suffix)].strip()
+    return title
+
+
+def _first(value: Any) -> Any:
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    text = " ".join(str(value).split())
+    return text or None
+
+
+def _names(value: Any) -> Optional[Any]:
+    if isinstance(value, list):
+        names: List[str] = [name for item in value if (name := _names(item))]
+        return names or None
+    if isinstance(value, dict):
+        return _text(value.get("name"))
+    return _text(value)
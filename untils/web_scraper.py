@@ -1,23 +1,223 @@
-import re
 import asyncio
+from contextlib import AsyncExitStack, aclosing, asynccontextmanager
 from datetime import datetime, timezone
-from typing import Annotated, Set, List
+from typing import (
+    Annotated,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+from urllib.parse import urljoin
+import httpx
 from fastapi import Depends
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup, Tag
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+from enums import DiscoveryMode
+from model import Platform
+from pydantic import TypeAdapter
+from schemas import ExtractedGameDataDTO
+from untils.adaptive_limiter import AdaptiveCall, AdaptiveLimiter, get_adaptive_limiter
+from untils.browser_pool import browser_pool
 from untils.gemini_api import GeminiApiDependency
+from untils.html_cleaner import clean_html
+from untils.html_minimizer import minimize_html
+from untils.chunking import (
+    chunking_stats,
+    merge_game_data,
+    merge_link_results,
+    split_compact_text,
+    split_html,
+)
+from untils.cpu_executor import cpu_executor
+from untils.model_router import model_router
+from untils.html_cache import html_cache
+from untils.llm_cache import llm_cache
+from untils.prompts import (
+    COMPACT_CONTENT_NOTE,
+    GAME_DETAILS_BATCH_PROMPT,
+    GAME_DETAILS_PROMPT,
+    GAME_LINKS_PROMPT,
+    PromptTemplate,
+)
+from untils.extraction_batcher import (
+    BatchPage,
+    ExtractionBatcher,
+    get_extraction_batcher,
+)
+from untils.link_discovery import (
+    PlatformLinkPattern,
+    get_platform_link_pattern,
+    match_game_links,
+)
+from untils.pagination import (
+    PlatformPagination,
+    current_param_value,
+    get_platform_pagination,
+    infer_pagination_strategy,
+    page_url,
+)
+from untils.sitemap import find_sitemaps, get_sitemap_stats, iter_sitemap_game_urls
+from untils.selector_extractor import (
+    ExtractionPathStats,
+    extract_page_fields,
+    extraction_stats,
+)
+from common.app_settings import settings
+from untils.json_utils import (
+    clean_json_value,
+    parse_model_json,
+    parse_model_list_json,
+    record_llm_parse,
+    strip_json_markdown,
+)
+from untils.resource_blocker import ResourceBlocker
+from untils.scroll_waiter import ScrollWaiter
+from untils.http_fetcher import (
+    THROTTLED_STATUS_CODES,
+    FetchThrottledError,
+    detect_browser_requirement,
+    get_platform_fetch_tier,
+    http_fetcher,
+)
 import json
 
+T = TypeVar("T")
+
+REQUIRED_GAME_FIELDS = ("name", "price", "price_in_usd", "availability_status")
+GAME_DATA_SCHEMA = ExtractedGameDataDTO.model_json_schema()
+GAME_DATA_LIST_SCHEMA = TypeAdapter(List[ExtractedGameDataDTO]).json_schema()
+
+
+def fetch_overload_reason(error: BaseException) -> Optional[str]:
+    if isinstance(error, FetchThrottledError):
+        return f"HTTP {error.status_code}"
+    if isinstance(error, (PlaywrightTimeoutError, httpx.TimeoutException)):
+        return type(error).__name__
+    return None
+
+
+def extraction_day() -> str:
+    # Relative sale text ("ends in 3 days") is resolved against the current
+    # date, so detail answers are only reused within the same UTC day.
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def _log_fetch_retry(retry_state: RetryCallState) -> None:
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    print(f"{error}; backing off before retrying.")
+
 
 class WebScraper:
     def __init__(self, gemini_api: GeminiApiDependency):
         self.gemini_api = gemini_api
 
-    async def get_page_html(self, url: str) -> str:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto(url, timeout=90000)
+    @asynccontextmanager
+    async def _open_page(self, platform: Optional[Platform] = None):
+        blocker = ResourceBlocker.for_platform(
+            platform.resource_block_rules if platform else None,
+            platform.name if platform else None,
+        )
+        async with browser_pool.lease() as context:
+            await blocker.attach(context)
+            yield await context.new_page()
+
+    @asynccontextmanager
+    async def _open_loaded_page(self, url: str, platform: Optional[Platform] = None):
+        """Lease a tab and load url in it under the platform's fetch limiter.
+
+        The limiter slot is taken before the browser lease, in the same order
+        as get_page_html, and given back once the page has loaded; the tab
+        stays leased until the block exits.
+        """
+        async with AsyncExitStack() as stack:
+            async with self._fetch_limiter(platform).acquire() as call:
+                page = await stack.enter_async_context(self._open_page(platform))
+                await self._navigate(page, url, call)
+            yield page
+
+    @staticmethod
+    async def _navigate(page, url: str, call: AdaptiveCall) -> None:
+        # Only the navigation is the site's latency, not the wait for a browser.
+        call.restart_clock()
+        await page.goto(url, timeout=90000)
+        call.stop_clock()
+
+    async def get_page_html(self, url: str, platform: Optional[Platform] = None) -> str:
+        cached_page = await html_cache.get_page(url)
+        if cached_page is not None:
+            return cached_page.raw_html
+
+        html = await self._fetch_with_backoff(url, platform)
+        await html_cache.put_page(url, html)
+        return html
+
+    @retry(
+        stop=stop_after_attempt(settings.FETCH_THROTTLE_MAX_ATTEMPTS),
+        wait=wait_random_exponential(multiplier=1, max=30),
+        retry=retry_if_exception_type(FetchThrottledError),
+        before_sleep=_log_fetch_retry,
+        reraise=True,
+    )
+    async def _fetch_with_backoff(self, url: str, platform: Optional[Platform]) -> str:
+        # The wait between attempts happens outside the limiter, so a throttled
+        # page neither holds a slot nor counts the backoff as latency.
+        async with self._fetch_limiter(platform).acquire() as call:
+            return await self._fetch_page_html(url, platform, call)
+
+    @staticmethod
+    def _fetch_limiter(platform: Optional[Platform]) -> AdaptiveLimiter:
+        return get_adaptive_limiter(
+            f"fetch:{platform.name if platform else 'default'}",
+            settings.FETCH_MAX_CONCURRENCY,
+            fetch_overload_reason,
+        )
+
+    async def _fetch_page_html(
+        self, url: str, platform: Optional[Platform], call: AdaptiveCall
+    ) -> str:
+        tier_state = get_platform_fetch_tier(
+            platform.name if platform else "default",
+            platform.fetch_tier if platform else None,
+        )
+        if tier_state.should_try_http():
+            try:
+                response = await http_fetcher.get(url)
+                if response.status_code in THROTTLED_STATUS_CODES:
+                    # The site is asking us to slow down, which says nothing
+                    # about whether the page needs a browser.
+                    raise FetchThrottledError(url, response.status_code)
+                reason = await cpu_executor.run_in_thread(
+                    detect_browser_requirement, response.status_code, response.text
+                )
+                if reason is None:
+                    tier_state.record_http_success()
+                    return response.text
+            except httpx.HTTPError as e:
+                reason = f"HTTP error: {type(e).__name__}"
+            print(f"Escalating {url} to the browser: {reason}")
+            tier_state.record_escalation(reason)
+
+        tier_state.record_browser_fetch()
+        return await self.get_page_html_with_browser(url, platform, call)
+
+    async def get_page_html_with_browser(
+        self, url: str, platform: Optional[Platform], call: AdaptiveCall
+    ) -> str:
+        # The caller holds the fetch limiter slot that call belongs to.
+        async with self._open_page(platform) as page:
+            await self._navigate(page, url, call)
 
             try:
                 await page.wait_for_selector(
@@ -29,80 +229,39 @@ class WebScraper:
                 print(f"Age gate button not found or error clicking: {e}")
 
             html = await page.content()
-            await browser.close()
             return html
 
     def delete_trash_data_from_html(self, html: str) -> str:
-        soup = BeautifulSoup(html, "html.parser")
-
-        for tag in soup.find_all(
-            ["script", "style", "header", "footer", "aside", "form"]
-        ):
-            tag.decompose()
-
-        for nav in soup.find_all("nav"):
-            if not isinstance(nav, Tag):
-                continue
-
-            is_pagination = False
-            nav_attributes = f"{nav.get('class', '')} {nav.get('id', '')} {nav.get('aria-label', '')} {nav.get('role', '')}".lower()
-            if any(keyword in nav_attributes for keyword in ["pagination", "pager"]):
-                is_pagination = True
-            if not is_pagination:
-                links = nav.find_all("a")
-                if 0 < len(links) < 20:
-                    for link in links:
-                        if not isinstance(link, Tag):
-                            continue
-                        link_text = link.get_text(strip=True).lower()
-                        aria_label_value = link.get("aria-label", "")
-                        link_aria_label = (
-                            " ".join(aria_label_value)
-                            if isinstance(aria_label_value, list)
-                            else str(aria_label_value)
-                        ).lower()
-
-                        pagination_keywords = [
-                            "next",
-                            "previous",
-                            "back",
-                            "last",
-                            "first",
-                            ">",
-                            "»",
-                            "<",
-                            "«",
-                        ]
-                        if (
-                            any(keyword in link_text for keyword in pagination_keywords)
-                            or any(
-                                keyword in link_aria_label
-                                for keyword in ["next page", "previous page"]
-                            )
-                            or link_text.isdigit()
-                        ):
-                            is_pagination = True
-                            break
-            if not is_pagination:
-                nav.decompose()
-
-        return str(soup)
-
-    def __clean_json_markdown(self, text: str) -> str:
-        pattern = r"```(?:json)?(.*?)```"
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            return match.group(1).strip()
-        return text.strip()
+        return clean_html(html, settings.HTML_CLEANER_ENGINE)
+
+    async def clean_page_html(self, html: str, compact: bool = False) -> str:
+        """Clean a page for an LLM prompt.
+
+        Listing pages stay HTML because the model has to return a CSS selector
+        for them. Detail pages are minimized to compact text when compact is set
+        and LLM_INPUT_FORMAT is "compact", within the budget of LLM_MAX_CHUNKS
+        chunks of LLM_PAGE_TOKEN_BUDGET tokens.
+        """
+        engine = settings.HTML_CLEANER_ENGINE
+        cleaned_html = await html_cache.get_cleaned(html, engine)
+        if cleaned_html is None:
+            cleaned_html = await cpu_executor.run(clean_html, html, engine)
+            await html_cache.put_cleaned(html, engine, cleaned_html)
+        if not compact or settings.LLM_INPUT_FORMAT != "compact":
+            return cleaned_html
+
+        token_budget = settings.LLM_PAGE_TOKEN_BUDGET * settings.LLM_MAX_CHUNKS
+        compact_engine = f"{engine}-compact-{token_budget}"
+        compact_text = await html_cache.get_cleaned(html, compact_engine)
+        if compact_text is None:
+            compact_text = await cpu_executor.run(
+                minimize_html, cleaned_html, token_budget
+            )
+            await html_cache.put_cleaned(html, compact_engine, compact_text)
+        return compact_text
 
     def clean_json(self, obj):
-        if isinstance(obj, dict):
-            return {k: self.clean_json(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self.clean_json(v) for v in obj]
-        elif isinstance(obj, datetime):
-            return obj.isoformat()
-        return obj
+        return clean_json_value(obj)
 
     async def extract_game_links_with_gemini(
         self,
@@ -110,215 +269,672 @@ class WebScraper:
         target_count: int,
         current_url: str,
     ) -> dict:
-        prompt = f"""
-You are a highly intelligent web scraping assistant. Your task is to analyze the provided HTML of a game store's category page and extract two things: all direct links to individual game detail pages and a way to navigate to the next page of results.
-
-Instructions:
-1.  Identify and return a list of **ALL** game detail URLs found on the page. A game URL typically leads to a page dedicated to a single game.
-    -   Do not include links to news, DLCs without a base game, or developer pages.
-    -   Return as many game URLs as you can find on the page, up to a maximum of {target_count}.
-    -   IMPORTANT: If an extracted URL is a relative path (e.g., starts with '/'), you MUST combine it with the base URL of the current page to form an absolute URL. The current page URL is: {current_url}
-2.  Find the pagination element to go to the NEXT page or 'Load More'. Provide a unique and reliable CSS selector for it.
-    -   Prioritize elements with text like 'Next', '>', '>>', `aria-label="Next page"`, or especially 'Load More'.
-    -   If there's no 'Next' button but there are numbered pages, provide the selector for the next available page number.
-    -   If you cannot find a way to get to the next page, return null.
-
-Return a single, valid JSON object with the following keys:
--   "game_urls": (list[str]) A list of all game URLs found.
--   "next_page_selector": (str or null) The CSS selector for the next page/load more element, or null if not found.
-
-Cleaned HTML:
-{clean_html}
-"""
-
-        response_text = await self.gemini_api.generate_response(prompt)
-        if not response_text:
-            raise ValueError("Failed to get a valid response from Gemini API.")
-        response_text = self.__clean_json_markdown(response_text)
-        try:
-            response_json = json.loads(response_text)
-            return {
-                "game_urls": response_json.get("game_urls", []),
-                "next_page_selector": response_json.get("next_page_selector"),
-            }
-        except json.JSONDecodeError:
-            print("Failed to parse Gemini response as JSON:", response_text)
+        chunks = await cpu_executor.run_in_thread(
+            split_html,
+            clean_html,
+            settings.LLM_PAGE_TOKEN_BUDGET,
+            settings.LLM_MAX_CHUNKS,
+        )
+        if len(chunks) == 1:
+            return await self._extract_game_links_once(
+                chunks[0], target_count, current_url
+            )
+
+        chunking_stats.record("links", len(chunks))
+        print(f"Extracting links from {current_url} in {len(chunks)} chunks.")
+        results = await asyncio.gather(
+            *(
+                self._extract_game_links_once(chunk, target_count, current_url)
+                for chunk in chunks
+            )
+        )
+        return merge_link_results(results, target_count)
+
+    async def _extract_game_links_once(
+        self,
+        clean_html: str,
+        target_count: int,
+        current_url: str,
+    ) -> dict:
+        # Relative links are resolved against current_url, so it is part of the key.
+        cache_key = llm_cache.make_key(
+            GAME_LINKS_PROMPT,
+            self.gemini_api.model_for_task(GAME_LINKS_PROMPT.name),
+            clean_html,
+            current_url,
+            target_count,
+        )
+        cached = await llm_cache.get(GAME_LINKS_PROMPT, cache_key)
+        if cached is not None:
+            return cached
+
+        prompt = GAME_LINKS_PROMPT.render_request(
+            target_count=target_count,
+            current_url=current_url,
+            clean_html=clean_html,
+        )
+
+        async def parse(response_text: str) -> Optional[dict]:
+            response_text = strip_json_markdown(response_text)
+            try:
+                response_json = json.loads(response_text)
+            except json.JSONDecodeError:
+                print("Failed to parse Gemini response as JSON:", response_text)
+                return None
+            return response_json if isinstance(response_json, dict) else None
+
+        response_json = await self._generate_routed(
+            GAME_LINKS_PROMPT,
+            prompt,
+            parse,
+            lambda parsed: "invalid JSON" if parsed is None else None,
+        )
+        if response_json is None:
             return {"game_urls": [], "next_page_selector": None}
+        result = {
+            "game_urls": response_json.get("game_urls", []),
+            "next_page_selector": response_json.get("next_page_selector"),
+        }
+        await llm_cache.put(
+            GAME_LINKS_PROMPT,
+            self.gemini_api.model_for_task(GAME_LINKS_PROMPT.name),
+            cache_key,
+            result,
+        )
+        return result
+
+    async def _generate_routed(
+        self,
+        template: PromptTemplate,
+        prompt: str,
+        parse: Callable[[str], Awaitable[T]],
+        check: Callable[[T], Optional[str]],
+        response_schema: Optional[dict] = None,
+    ) -> T:
+        """Run a prompt on the model tier routed for it.
+
+        check names what is wrong with a parsed answer, or returns None. A
+        failing answer, or none at all, is rerun on the strong tier when that
+        is a different model; the strong tier's answer is returned as is.
+        """
+        tier = model_router.tier_for(template.name)
+        while True:
+            stronger = model_router.escalation_for(tier)
+            response_text = await self.gemini_api.generate_response(
+                prompt, response_schema, template.instructions, tier
+            )
+            if response_text:
+                result = await parse(response_text)
+                reason = check(result)
+                if reason is None or stronger is None:
+                    return result
+            elif stronger is None:
+                raise ValueError("Failed to get a valid response from Gemini API.")
+            else:
+                reason = "no response"
+            model_router.record_escalation(template.name, tier, reason)
+            tier = stronger
+
+    async def iter_game_urls(
+        self, start_url: str, limit: int = 50, platform: Optional[Platform] = None
+    ) -> AsyncIterator[str]:
+        """Yield game URLs for the scrape pipeline as they are discovered.
+
+        Sitemap platforms stream URLs matching the learned game URL pattern
+        straight from their sitemaps. Listing pages are browsed when that mode
+        is off, no pattern has been learned yet or the sitemaps yield nothing.
+        """
+        if platform and platform.discovery_mode == DiscoveryMode.SITEMAP:
+            stats = get_sitemap_stats(platform.name)
+            stats.runs += 1
+            pattern = get_platform_link_pattern(
+                platform.name, platform.game_url_pattern
+            ).pattern
+            found = 0
+            if pattern:
+                sitemap_urls = (
+                    [platform.sitemap_url]
+                    if platform.sitemap_url
+                    else await find_sitemaps(platform.base_url)
+                )
+                async with aclosing(
+                    iter_sitemap_game_urls(sitemap_urls, pattern, limit, stats)
+                ) as sitemap_game_urls:
+                    async for url in sitemap_game_urls:
+                        found += 1
+                        yield url
+                if found:
+                    return
+                print(
+                    f"Sitemaps of {platform.name} had no game URLs; browsing listings."
+                )
+            else:
+                print(
+                    f"No game URL pattern learned for {platform.name} yet; "
+                    "browsing listings first."
+                )
+            stats.fallbacks += 1
 
-    async def collect_game_urls(self, start_url: str, limit: int = 50) -> list[str]:
+        for url in await self.collect_game_urls(start_url, limit, platform):
+            yield url
+
+    async def collect_game_urls(
+        self, start_url: str, limit: int = 50, platform: Optional[Platform] = None
+    ) -> list[str]:
         collected_urls: List[str] = []
         seen_urls: Set[str] = set()
+        platform_key = platform.name if platform else "default"
+        link_state = get_platform_link_pattern(
+            platform_key, platform.game_url_pattern if platform else None
+        )
+        pagination = get_platform_pagination(
+            platform_key, platform.pagination_strategy if platform else None
+        )
+
+        if pagination.strategy and pagination.strategy.kind == "url_param":
+            await self._collect_game_urls_by_page_url(
+                start_url, limit, platform, link_state, pagination, collected_urls, seen_urls
+            )
+            if collected_urls:
+                return collected_urls[:limit]
+            print("Stored URL pagination found nothing; relearning it by browsing.")
+            pagination.forget()
+
+        resume_url = await self._collect_game_urls_by_browsing(
+            start_url, limit, platform, link_state, pagination, collected_urls, seen_urls
+        )
+        if resume_url and len(collected_urls) < limit:
+            await self._collect_game_urls_by_page_url(
+                resume_url, limit, platform, link_state, pagination, collected_urls, seen_urls
+            )
+        return collected_urls[:limit]
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
-            page = await browser.new_page()
-            await page.goto(start_url, timeout=90000)
-            await page.evaluate("""
-                const scrollHeight = document.body.scrollHeight;
-                window.scrollTo(0, scrollHeight * 0.35);
-            """)
+    async def _collect_game_urls_by_browsing(
+        self,
+        start_url: str,
+        limit: int,
+        platform: Optional[Platform],
+        link_state: PlatformLinkPattern,
+        pagination: PlatformPagination,
+        collected_urls: List[str],
+        seen_urls: Set[str],
+    ) -> Optional[str]:
+        """Walk the listing in one tab, clicking or following the next element.
+
+        Returns the next page's URL when the walk showed that the listing is
+        addressable by URL, so the remaining pages can be opened in parallel.
+        """
+        on_first_page = True
+        # Later pages are loaded without the fetch limiter: the tab is already
+        # leased, and waiting for a slot here would invert the lock order.
+        async with self._open_loaded_page(start_url, platform) as page:
             while len(collected_urls) < limit:
-                try:
-                    await page.evaluate("""
-                        const scrollHeight = document.body.scrollHeight;
-                        window.scrollTo(0, scrollHeight * 0.35);
-                    """)
-                    await asyncio.sleep(3)
-                    await page.evaluate(
-                        "window.scrollBy(0, document.body.scrollHeight)"
-                    )
-                except Exception as e:
-                    print(
-                        f"Page did not reach network idle state, proceeding anyway: {e}"
-                    )
-
-                html = await page.content()
+                html = await self._scroll_listing_page(page, platform, link_state)
                 current_page_url = page.url
-                cleaned_html = self.delete_trash_data_from_html(html)
-
-                result = await self.extract_game_links_with_gemini(
-                    cleaned_html,
-                    limit,
-                    current_page_url,
+                result = await self._discover_game_links(
+                    page, html, current_page_url, limit, link_state, pagination
                 )
-
                 all_found_urls = result.get("game_urls", [])
+                next_page_selector = result.get("next_page_selector")
 
-                if not all_found_urls and not result.get("next_page_selector"):
+                if not all_found_urls and not next_page_selector:
                     print("LLM returned no URLs and no next page selector. Stopping.")
                     break
 
-                for url in all_found_urls:
-                    if url not in seen_urls:
-                        seen_urls.add(url)
-                        collected_urls.append(url)
-                        if len(collected_urls) >= limit:
-                            break
-
+                self._add_urls(all_found_urls, collected_urls, seen_urls, limit)
                 print(f"Collected {len(collected_urls)} URLs so far (target: {limit}).")
 
-                if not result["next_page_selector"] or len(collected_urls) >= limit:
-                    if not result["next_page_selector"]:
+                if not next_page_selector or len(collected_urls) >= limit:
+                    if not next_page_selector:
                         print("No 'next page' button found. Stopping.")
                     break
 
                 try:
-                    next_page_selector = result["next_page_selector"]
-                    await page.locator(next_page_selector).scroll_into_view_if_needed(
-                        timeout=5000
+                    next_url = await self._next_page_href(page, next_page_selector)
+                    strategy = infer_pagination_strategy(
+                        next_page_selector, current_page_url, next_url, on_first_page
                     )
-                    await page.click(next_page_selector, timeout=10000)
-                    print(f"Clicked '{next_page_selector}'. Waiting for new content.")
+                    pagination.learn(strategy)
+                    if strategy.kind == "url_param":
+                        return next_url
+                    if strategy.kind == "next_link" and next_url:
+                        await page.goto(next_url, timeout=90000)
+                    else:
+                        await page.locator(
+                            next_page_selector
+                        ).scroll_into_view_if_needed(timeout=5000)
+                        await page.click(next_page_selector, timeout=10000)
+                        print(f"Clicked '{next_page_selector}'. Waiting for new content.")
+                    pagination.record_page(strategy.kind)
+                    on_first_page = False
 
                 except Exception as e:
                     print(
-                        f"Pagination failed or element '{result.get('next_page_selector')}' not found: {e}"
+                        f"Pagination failed or element '{next_page_selector}' not found: {e}"
                     )
                     break
+        return None
 
-            await browser.close()
+    async def _collect_game_urls_by_page_url(
+        self,
+        first_url: str,
+        limit: int,
+        platform: Optional[Platform],
+        link_state: PlatformLinkPattern,
+        pagination: PlatformPagination,
+        collected_urls: List[str],
+        seen_urls: Set[str],
+    ) -> None:
+        strategy = pagination.strategy
+        value = current_param_value(first_url, strategy)
+        while len(collected_urls) < limit:
+            page_urls = [
+                page_url(first_url, strategy, value + i * strategy.step)
+                for i in range(settings.LISTING_PARALLEL_PAGES)
+            ]
+            value += len(page_urls) * strategy.step
+            results = await asyncio.gather(
+                *(
+                    self._collect_listing_page(url, limit, platform, link_state, pagination)
+                    for url in page_urls
+                ),
+                return_exceptions=True,
+            )
 
-        return collected_urls[:limit]
+            added = 0
+            for url, result in zip(page_urls, results):
+                if isinstance(result, BaseException):
+                    print(f"Failed to load listing page {url}: {result}")
+                    continue
+                pagination.record_page(strategy.kind)
+                added += self._add_urls(result, collected_urls, seen_urls, limit)
+            print(f"Collected {len(collected_urls)} URLs so far (target: {limit}).")
+            if not added:
+                # Past the last page stores either list nothing or repeat the
+                # final page, so a batch without new URLs ends the listing.
+                break
+
+    async def _collect_listing_page(
+        self,
+        url: str,
+        limit: int,
+        platform: Optional[Platform],
+        link_state: PlatformLinkPattern,
+        pagination: PlatformPagination,
+    ) -> List[str]:
+        async with self._open_loaded_page(url, platform) as page:
+            html = await self._scroll_listing_page(page, platform, link_state)
+            result = await self._discover_game_links(
+                page, html, page.url, limit, link_state, pagination
+            )
+            return result.get("game_urls", [])
 
-    async def extract_game_data_from_url(self, game_url: str) -> dict:
-        html = await self.get_page_html(game_url)
-        cleaned_html = self.delete_trash_data_from_html(html)
-
-        prompt = f"""
-Analyze the HTML from a game detail page ({game_url}) and extract the information into a single, valid JSON object.
-If a piece of information is not found or applicable, use null for its value.
-**Do not omit any fields. Always include all fields, even if the value is null.**
-
-Current Date: {datetime.now(timezone.utc).isoformat()}
-
-HTML Content:
-{cleaned_html}
-
-JSON Output Structure and Instructions:
-{{
-  "name": "(string) The full name of the game as displayed on the platform. Required.",
-  "description": "(string or null) A detailed description of the game, usually a few paragraphs long. Extract the main descriptive text.",
-  "price": "(float) The current price. For free games, use 0.0. If the price is unknown or cannot be determined, use -1.0. This field is required and must never be null.",
-  "currency": "(string or null) The currency code, such as 'USD', 'EUR', 'UAH'. Extract the currency **as shown on the page**. If not found, use null. Do not guess or convert.",
-  "price_in_usd": "(float) The price converted to USD. If 'currency' is not USD, convert 'price' to USD. If 'currency' is already USD, use the same value as 'price'. If 'price' is -1.0 or null, this field should also be -1.0 or null respectively. This field is required and must never be null.",
-  "availability_status": "(string) Must be one of: 'available', 'out_of_stock', 'coming_soon', 'preorder', 'free', 'unavailable', 'early_access', 'beta', 'region_locked', 'unknown'. Required.",
-  "url_on_platform": "(string) The full URL of the page being analyzed. Use this value: {game_url}",
-  "rating": "(float or null) The game's average score. Normalize all ratings to a 5-point scale. Example: '9/10' or '90%' becomes 4.5.",
-  "reviews_count": "(integer or null) Total number of user reviews. Convert text like '1.2K' to 1200.",
-  "special_content_json": "(JSON object or null) Info about DLCs, bundles. Example: {{\"dlcs\": [\"DLC Name 1\"], \"season_pass_available\": true}}. If nothing found, use null.",
-  "discount_info_json": "(JSON object or null) Info about discounts. Example: {{\"original_price\": 29.99, \"discounted_price\": 26.99, \"sale_end_date\": \"2025-06-13T23:59:59Z\"}}. Use null if not on sale.",
-  "metadata_json": "(JSON object or null) Other game metadata like genres, tags, developer, publisher, release date, system requirements. If metadata is not available, use null."
-}}
-
-Important Notes:
-- Always return a complete JSON object with all fields present.
-- If a value is not found, return null for that field.
-- Strictly follow the requested data types and formats.
-- If the sale end date is given as a relative phrase (e.g., "ends in 14 days"), you **must** compute and return the exact absolute date in ISO 8601 format using the current date provided. Never leave `sale_end_date` null if any time reference is available.
-- For `metadata_json`, include as many details as possible. If a subfield like `developer` or `tags` is missing, include it with null or omit inside the nested object — but the field `metadata_json` itself must be present.
-- **For 'price_in_usd' conversion:**
-    - If 'currency' is 'USD', 'price_in_usd' should be the same as 'price'.
-    - If 'currency' is not 'USD', you **must** use an **up-to-date exchange rate** (which Gemini will obtain independently) to convert 'price' to USD.
-    - If 'price' is -1.0 or null, 'price_in_usd' should also be -1.0 or null respectively.
-    - If the currency is unknown or conversion is impossible due to missing 'price' or 'currency', use -1.0 for 'price_in_usd'.
-
-JSON Response:
-"""
-        response_text = await self.gemini_api.generate_response(prompt) 
-        if not response_text:
-            raise ValueError("Failed to get a valid response from Gemini API.")
-        cleaned_response_text = self.__clean_json_markdown(response_text)
+    async def _scroll_listing_page(
+        self,
+        page,
+        platform: Optional[Platform],
+        link_state: PlatformLinkPattern,
+    ) -> str:
+        with ScrollWaiter(
+            page,
+            platform.name if platform else "default",
+            platform.scroll_wait_timeout_seconds if platform else None,
+            link_state.pattern,
+        ) as waiter:
+            try:
+                # The first wait also covers content still arriving after a click.
+                items = await waiter.item_count()
+                await page.evaluate("""
+                    const scrollHeight = document.body.scrollHeight;
+                    window.scrollTo(0, scrollHeight * 0.35);
+                """)
+                await waiter.wait_for_new_items(items)
+                items = await waiter.item_count()
+                await page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
+                await waiter.wait_for_new_items(items)
+            except Exception as e:
+                print(f"Page did not settle after scrolling, proceeding anyway: {e}")
+        return await page.content()
 
+    async def _next_page_href(self, page, next_page_selector: str) -> Optional[str]:
         try:
-            data = json.loads(cleaned_response_text)
-            required_fields = [
-                "name",
-                "price",
-                "price_in_usd", 
-                "availability_status",
-            ]
-            for field in required_fields:
-                if field not in data or data[field] is None:
-                    print(
-                        f"Warning: Required field '{field}' missing or null in LLM response for {game_url}. Raw: {cleaned_response_text}"
-                    )
-            return data
-        except json.JSONDecodeError as e:
-            print(
-                f"Failed to parse Gemini response for {game_url} as JSON: {cleaned_response_text}. Error: {e}"
+            href = await page.locator(next_page_selector).first.get_attribute(
+                "href", timeout=5000
             )
-            return {
-                "name": None,
-                "description": None,
-                "price": -1.0,
-                "currency": None,
-                "price_in_usd": -1.0,
-                "availability_status": "unknown",
-                "url_on_platform": game_url,
-                "rating": None,
-                "reviews_count": None,
-                "special_content_json": None,
-                "discount_info_json": None,
-                "metadata_json": None,
-            }
-        except Exception as e:
-            print(
-                f"An unexpected error occurred while processing game data for {game_url}: {e}. Raw: {cleaned_response_text}"
+        except Exception:
+            return None
+        if not href or href.startswith(("#", "javascript:")):
+            return None
+        return urljoin(page.url, href)
+
+    @staticmethod
+    def _add_urls(
+        urls: List[str], collected_urls: List[str], seen_urls: Set[str], limit: int
+    ) -> int:
+        added = 0
+        for url in urls:
+            if len(collected_urls) >= limit:
+                break
+            if url not in seen_urls:
+                seen_urls.add(url)
+                collected_urls.append(url)
+                added += 1
+        return added
+
+    async def _discover_game_links(
+        self,
+        page,
+        html: str,
+        current_url: str,
+        limit: int,
+        link_state: PlatformLinkPattern,
+        pagination: PlatformPagination,
+    ) -> dict:
+        result = await self._match_game_links(
+            page, html, current_url, link_state, pagination
+        )
+        if result is None:
+            cleaned_html = await self.clean_page_html(html)
+            result = await self.extract_game_links_with_gemini(
+                cleaned_html,
+                limit,
+                current_url,
             )
+            link_state.learn(result["game_urls"], current_url)
+        return result
+
+    async def _match_game_links(
+        self,
+        page,
+        html: str,
+        current_url: str,
+        link_state: PlatformLinkPattern,
+        pagination: PlatformPagination,
+    ) -> Optional[dict]:
+        if not link_state.pattern:
+            return None
+        game_urls = await cpu_executor.run_in_thread(
+            match_game_links, html, current_url, link_state.pattern
+        )
+        if not game_urls:
+            print(f"Learned game URL pattern matched nothing on {current_url}.")
+            link_state.record_miss()
+            return None
+        if pagination.strategy and pagination.strategy.kind == "url_param":
+            link_state.record_match(len(game_urls))
+            return {"game_urls": game_urls, "next_page_selector": None}
+        next_page_selector = pagination.next_page_selector
+        if not next_page_selector or not await page.locator(next_page_selector).count():
+            # Either the last page or a changed layout; the LLM can tell them apart.
+            return None
+        link_state.record_match(len(game_urls))
+        return {"game_urls": game_urls, "next_page_selector": next_page_selector}
+
+    async def extract_game_data_from_url(
+        self, game_url: str, platform: Optional[Platform] = None
+    ) -> dict:
+        html = await self.get_page_html(game_url, platform)
+        cleaned_html = await self.clean_page_html(html, compact=True)
+        return await self.extract_game_data(game_url, html, cleaned_html, platform)
+
+    async def extract_game_data(
+        self,
+        game_url: str,
+        html: str,
+        cleaned_html: str,
+        platform: Optional[Platform] = None,
+    ) -> dict:
+        if settings.LLM_BATCH_MAX_PAGES <= 1:
+            return await self._extract_game_data(game_url, html, cleaned_html, platform)
+        with self._batcher(platform).caller():
+            return await self._extract_game_data(game_url, html, cleaned_html, platform)
+
+    async def _extract_game_data(
+        self,
+        game_url: str,
+        html: str,
+        cleaned_html: str,
+        platform: Optional[Platform] = None,
+    ) -> dict:
+        stats = extraction_stats.setdefault(
+            platform.name if platform else "default", ExtractionPathStats()
+        )
+        profile = platform.extraction_selectors if platform else None
+        structured, selected, missing = await cpu_executor.run_in_thread(
+            extract_page_fields,
+            html,
+            json.dumps(profile, sort_keys=True) if profile else None,
+            platform.game_data_selector if platform else None,
+        )
+        stats.record_fields("structured_data", structured)
+        stats.record_fields("selectors", selected, missing)
+
+        # Platform selectors are configured by hand, so they win over page markup.
+        fields = {**structured, **selected}
+        metadata = {
+            **structured.get("metadata_json", {}),
+            **selected.get("metadata_json", {}),
+        }
+        if metadata:
+            fields["metadata_json"] = metadata
+        missing = [field for field in missing if field not in fields]
+        if not fields:
+            stats.record_path("llm")
+            return await self._extract_game_data_with_llm(
+                game_url, cleaned_html, platform
+            )
+
+        reason = self._fast_path_fallback_reason(fields, missing)
+        if reason is None:
+            stats.record_path("deterministic")
             return {
-                "name": None,
-                "description": None,
-                "price": -1.0,
-                "currency": None,
-                "price_in_usd": -1.0,
-                "availability_status": "unknown",
+                "name": fields["name"],
+                "description": fields.get("description"),
+                "price": fields["price"],
+                "currency": fields.get("currency"),
+                "price_in_usd": fields["price"],
+                "availability_status": fields["availability_status"],
                 "url_on_platform": game_url,
-                "rating": None,
-                "reviews_count": None,
+                "rating": fields.get("rating"),
+                "reviews_count": fields.get("reviews_count"),
                 "special_content_json": None,
                 "discount_info_json": None,
-                "metadata_json": None,
+                "metadata_json": fields.get("metadata_json"),
             }
 
+        stats.record_path("fallback", reason)
+        data = await self._extract_game_data_with_llm(game_url, cleaned_html, platform)
+        llm_price, llm_price_in_usd = data.get("price"), data.get("price_in_usd")
+        same_currency = data.get("currency") == fields.get("currency", data.get("currency"))
+        # Deterministic values win over the model's answer.
+        metadata = {**(data.get("metadata_json") or {}), **fields.pop("metadata_json", {})}
+        data.update(fields)
+        if metadata:
+            data["metadata_json"] = metadata
+        if "price" in fields:
+            if data.get("currency") == "USD" or fields["price"] == 0:
+                data["price_in_usd"] = fields["price"]
+            elif (
+                same_currency
+                and isinstance(llm_price, (int, float))
+                and isinstance(llm_price_in_usd, (int, float))
+                and llm_price > 0
+                and llm_price_in_usd >= 0
+            ):
+                # Reuse the model's exchange rate for the deterministic price.
+                data["price_in_usd"] = round(
+                    llm_price_in_usd * fields["price"] / llm_price, 2
+                )
+        return data
+
+    @staticmethod
+    def _fast_path_fallback_reason(fields: dict, missing: List[str]) -> Optional[str]:
+        if missing:
+            return f"missing {sorted(missing)[0]}"
+        for field in ("name", "price", "availability_status"):
+            if field not in fields:
+                return f"no value for {field}"
+        if fields["price"] > 0 and fields.get("currency") != "USD":
+            # price_in_usd needs an exchange rate, which only the LLM path provides.
+            return "currency conversion"
+        return None
+
+    async def _extract_game_data_with_llm(
+        self, game_url: str, cleaned_html: str, platform: Optional[Platform] = None
+    ) -> dict:
+        if settings.LLM_BATCH_MAX_PAGES <= 1:
+            return await self.extract_game_data_from_html(game_url, cleaned_html)
+
+        # Pages answered by either prompt before are not worth a batch slot.
+        for prompt in (GAME_DETAILS_PROMPT, GAME_DETAILS_BATCH_PROMPT):
+            model = self.gemini_api.model_for_task(prompt.name)
+            cached = await llm_cache.get(
+                prompt,
+                llm_cache.make_key(prompt, model, cleaned_html, extraction_day()),
+            )
+            if cached is not None:
+                cached["url_on_platform"] = game_url
+                return cached
+
+        return await self._batcher(platform).submit(game_url, cleaned_html)
+
+    def _batcher(self, platform: Optional[Platform]) -> ExtractionBatcher:
+        # Shared by every scrape of the platform. The handlers only need the
+        # process-wide Gemini client, so binding the first scraper's is fine.
+        return get_extraction_batcher(
+            platform.name if platform else "default",
+            self._extract_game_data_batch,
+            self.extract_game_data_from_html,
+            max_pages=settings.LLM_BATCH_MAX_PAGES,
+            token_budget=settings.LLM_BATCH_TOKEN_BUDGET,
+            linger_seconds=settings.LLM_BATCH_LINGER_SECONDS,
+        )
+
+    async def _extract_game_data_batch(self, pages: List[BatchPage]) -> Dict[str, dict]:
+        """Extract several pages with one prompt; returns complete answers by URL."""
+        prompt = GAME_DETAILS_BATCH_PROMPT.render_request(
+            current_date=datetime.now(timezone.utc).isoformat(),
+            content_note=self._content_note(pages[0].cleaned_html),
+            pages="\n\n".join(
+                f"=== PAGE {index} ===\nURL: {page.url}\nHTML:\n{page.cleaned_html}"
+                for index, page in enumerate(pages, start=1)
+            ),
+        )
+        # Pages of a failed batch fall back to single extraction, which
+        # escalates on its own, so the batch itself is never rerun.
+        response_text = await self.gemini_api.generate_response(
+            prompt,
+            GAME_DATA_LIST_SCHEMA,
+            GAME_DETAILS_BATCH_PROMPT.instructions,
+            model_router.tier_for(GAME_DETAILS_BATCH_PROMPT.name),
+        )
+        if not response_text:
+            raise ValueError("Failed to get a valid response from Gemini API.")
+        try:
+            items, repaired = parse_model_list_json(
+                response_text, ExtractedGameDataDTO
+            )
+        except ValueError:
+            record_llm_parse(GAME_DETAILS_BATCH_PROMPT.name, "failed")
+            raise
+        record_llm_parse(
+            GAME_DETAILS_BATCH_PROMPT.name, "repaired" if repaired else "parsed"
+        )
+
+        model = self.gemini_api.model_for_task(GAME_DETAILS_BATCH_PROMPT.name)
+        day = extraction_day()
+        pages_by_url = {page.url.rstrip("/"): page for page in pages}
+        results: Dict[str, dict] = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            page = pages_by_url.get(str(item.get("url_on_platform") or "").rstrip("/"))
+            if page is None or any(item.get(f) is None for f in REQUIRED_GAME_FIELDS):
+                continue
+            item["url_on_platform"] = page.url
+            results[page.url] = item
+            await llm_cache.put(
+                GAME_DETAILS_BATCH_PROMPT,
+                model,
+                llm_cache.make_key(
+                    GAME_DETAILS_BATCH_PROMPT, model, page.cleaned_html, day
+                ),
+                item,
+            )
+        return results
+
+    @staticmethod
+    def _content_note(content: str) -> str:
+        return "" if content.lstrip().startswith("<") else COMPACT_CONTENT_NOTE
+
+    async def extract_game_data_from_html(
+        self, game_url: str, cleaned_html: str
+    ) -> dict:
+        splitter = (
+            split_html if cleaned_html.lstrip().startswith("<") else split_compact_text
+        )
+        chunks = await cpu_executor.run_in_thread(
+            splitter,
+            cleaned_html,
+            settings.LLM_PAGE_TOKEN_BUDGET,
+            settings.LLM_MAX_CHUNKS,
+        )
+        if len(chunks) == 1:
+            return await self._extract_game_data_once(game_url, chunks[0])
+
+        chunking_stats.record("details", len(chunks))
+        print(f"Extracting {game_url} in {len(chunks)} chunks.")
+        results = await asyncio.gather(
+            *(self._extract_game_data_once(game_url, chunk) for chunk in chunks)
+        )
+        return merge_game_data(list(results), game_url)
+
+    async def _extract_game_data_once(self, game_url: str, cleaned_html: str) -> dict:
+        model = self.gemini_api.model_for_task(GAME_DETAILS_PROMPT.name)
+        cache_key = llm_cache.make_key(
+            GAME_DETAILS_PROMPT, model, cleaned_html, extraction_day()
+        )
+        cached = await llm_cache.get(GAME_DETAILS_PROMPT, cache_key)
+        if cached is not None:
+            # The same page can be reached through several URLs.
+            cached["url_on_platform"] = game_url
+            return cached
+
+        prompt = GAME_DETAILS_PROMPT.render_request(
+            game_url=game_url,
+            current_date=datetime.now(timezone.utc).isoformat(),
+            cleaned_html=cleaned_html,
+            content_note=self._content_note(cleaned_html),
+        )
+        async def parse(response_text: str) -> Optional[Tuple[dict, bool]]:
+            try:
+                return parse_model_json(response_text, ExtractedGameDataDTO)
+            except ValueError as e:
+                print(
+                    f"Failed to parse Gemini response for {game_url}: {e}. Raw: {response_text}"
+                )
+                return None
+
+        # Only an unusable answer is escalated. A missing name is a real answer
+        # for chunks without the title and for pages that are not a game.
+        def check(parsed: Optional[Tuple[dict, bool]]) -> Optional[str]:
+            return "invalid JSON" if parsed is None else None
+
+        parsed = await self._generate_routed(
+            GAME_DETAILS_PROMPT, prompt, parse, check, GAME_DATA_SCHEMA
+        )
+        if parsed is None:
+            record_llm_parse(GAME_DETAILS_PROMPT.name, "failed")
+            empty = ExtractedGameDataDTO(url_on_platform=game_url)
+            return empty.model_dump(mode="json")
+        data, repaired = parsed
+        record_llm_parse(GAME_DETAILS_PROMPT.name, "repaired" if repaired else "parsed")
+
+        data["url_on_platform"] = game_url
+        if data["name"] is None:
+            print(f"Warning: No game name in LLM response for {game_url}.")
+        await llm_cache.put(GAME_DETAILS_PROMPT, model, cache_key, data)
+        return data
+
 
 WebScraperDependency = Annotated[WebScraper, Depends(WebScraper)]